@@ -1,24 +1,52 @@
 """
 Dashboard endpoint - combines market data, predictions, and news for a symbol
 """
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 from datetime import datetime
+from typing import Literal, Optional
+from app.core.responses import FastJSONResponse
+from app.core.executor import run_upstream, run_db
 from app.core.database import get_db
 from app.schemas.prediction import StockDashboardResponse
 from app.services.market_data_service import MarketDataService
-from app.services.prediction_service import PredictionService
 from app.services.news_service import NewsService
+from app.services.history_encoding import NotAcceptableError, encode_history_response, negotiate_history_format
+from app.services.conditional import etag_matches, make_etag, market_data_etag, parse_since
+from app.services.symbol_validation import InvalidSymbolError, check_symbol
 from app.db.models import Prediction, NewsLog
 
 router = APIRouter()
 
 
+def _load_dashboard_rows(db: Session, symbol: str):
+    """Load latest predictions and stored news for a symbol"""
+    predictions = db.query(Prediction)\
+        .filter(Prediction.symbol == symbol)\
+        .order_by(Prediction.created_at.desc())\
+        .limit(5)\
+        .all()
+    
+    db_news = db.query(NewsLog)\
+        .filter(NewsLog.symbol == symbol)\
+        .order_by(NewsLog.published_date.desc())\
+        .limit(10)\
+        .all()
+    
+    return predictions, db_news
+
+
 @router.get("/{symbol}", response_model=dict)
 async def get_stock_dashboard(
     symbol: str,
     period: str = "1mo",
     interval: str = "1d",
+    layout: Literal["rows", "columns"] = "rows",
+    since: Optional[str] = None,
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
     """
@@ -32,24 +60,32 @@ async def get_stock_dashboard(
     - **symbol**: Stock or cryptocurrency symbol
     - **period**: Period to fetch (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max) - default: 1mo
     - **interval**: Data interval (1m, 2m, 5m, 15m, 30m, 60m, 1h, 1d, 5d, 1wk, 1mo, 3mo) - default: 1d
-    """
-    import logging
-    logger = logging.getLogger(__name__)
+    - **layout**: History shape - `rows` (list of bars, default) or `columns` (dict of arrays)
     
-    # 요청 제한: 같은 심볼에 대해 짧은 시간 내 재요청 방지
-    import time as time_module
-    request_tracker = getattr(get_stock_dashboard, '_request_tracker', {})
-    now = time_module.time()
+    - **since**: Only return history bars newer than this time (ISO 8601 or epoch seconds)
     
-    if symbol in request_tracker:
-        last_request_time = request_tracker[symbol]
-        time_since_last = now - last_request_time
-        if time_since_last < 2:  # 2초 내 재요청 방지
-            print(f"[BACKEND] ⚠️ Rate limit: Request for {symbol} too soon ({time_since_last:.2f}s ago), returning cached or blocking")
-            # 여기서는 단순히 로그만 남기고 진행 (실제로는 캐시된 데이터 반환 가능)
+    Send `Accept: application/vnd.apache.arrow.stream` or `application/x-msgpack`
+    for a columnar binary `market_data.history` (JSON by default). The `ETag`
+    covers the last bar, predictions and news; `If-None-Match` returns 304.
+    """
+    try:
+        # 없는 심볼은 시세/뉴스 upstream 호출 전에 바로 404
+        check_symbol(symbol)
+    except InvalidSymbolError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    try:
+        fmt = negotiate_history_format(accept)
+        since_ts = parse_since(since)
+    except NotAcceptableError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if fmt != "json":
+        # 바이너리 형식은 history 컬럼 배열을 그대로 인코딩
+        layout = "arrays"
     
-    request_tracker[symbol] = now
-    get_stock_dashboard._request_tracker = request_tracker
+    import logging
+    logger = logging.getLogger(__name__)
     
     print(f"[BACKEND] ========== DASHBOARD REQUEST START ==========")
     print(f"[BACKEND] Symbol: {symbol}")
@@ -57,29 +93,45 @@ async def get_stock_dashboard(
     print(f"[BACKEND] =============================================")
     
     try:
-        # Get market data (with error handling for rate limits)
+        # 시장 데이터와 뉴스는 서로 독립적인 upstream 호출이므로 동시에 실행
         print(f"[BACKEND] Creating MarketDataService...")
         market_service = MarketDataService()
+        news_service = NewsService()
         print(f"[BACKEND] Calling get_market_data('{symbol}', period='{period}', interval='{interval}')...")
-        try:
-            market_data = market_service.get_market_data(symbol, period=period, interval=interval)
-            print(f"[BACKEND] ✅ Market data received: {len(market_data.get('history', []))} history points")
-        except ValueError as e:
-            error_msg = str(e)
+        market_result, news_result = await asyncio.gather(
+            # 같은 (symbol, period, interval) 동시 요청은 진행 중인 fetch 하나를 공유
+            market_service.get_market_data_async(symbol, period=period, interval=interval, layout=layout, since=since_ts),
+            run_upstream(news_service.get_latest_news, symbol, limit=10, days_back=7),
+            return_exceptions=True
+        )
+        
+        # Get market data (with error handling for rate limits)
+        if isinstance(market_result, HTTPException):
+            raise market_result
+        if isinstance(market_result, ValueError):
+            error_msg = str(market_result)
             if "rate limit" in error_msg.lower() or "429" in error_msg:
                 raise HTTPException(
                     status_code=429,
                     detail=f"Yahoo Finance API rate limit exceeded. Please wait a moment and try again. ({symbol})"
                 )
             raise HTTPException(status_code=404, detail=error_msg)
+        if isinstance(market_result, BaseException):
+            raise market_result
+        market_data = market_result
+        history = market_data.get('history', [])
+        points = len(history.get('date', [])) if isinstance(history, dict) else len(history)
+        print(f"[BACKEND] ✅ Market data received: {points} history points")
+        
+        # Get latest news
+        if isinstance(news_result, BaseException):
+            print(f"[BACKEND] ⚠️ News fetch failed: {news_result}")
+            news_list = []
+        else:
+            news_list = news_result
         
-        # Get latest predictions
-        prediction_service = PredictionService(db)
-        predictions = db.query(Prediction)\
-            .filter(Prediction.symbol == symbol)\
-            .order_by(Prediction.created_at.desc())\
-            .limit(5)\
-            .all()
+        # Get latest predictions and stored news
+        predictions, db_news = await run_db(_load_dashboard_rows, db, symbol)
         
         predictions_data = [
             {
@@ -93,17 +145,6 @@ async def get_stock_dashboard(
             for p in predictions
         ]
         
-        # Get latest news
-        news_service = NewsService()
-        news_list = news_service.get_latest_news(symbol, limit=10, days_back=7)
-        
-        # Also get from database
-        db_news = db.query(NewsLog)\
-            .filter(NewsLog.symbol == symbol)\
-            .order_by(NewsLog.published_date.desc())\
-            .limit(10)\
-            .all()
-        
         # Combine and deduplicate news
         news_dict = {}
         for news in news_list:
@@ -143,7 +184,19 @@ async def get_stock_dashboard(
         print(f"[BACKEND] ✅ Preparing response...")
         print(f"[BACKEND] Response keys: {list(result.keys())}")
         print(f"[BACKEND] ========== DASHBOARD REQUEST END ==========")
-        return result
+        etag = make_etag(
+            market_data_etag(market_data, period, interval, layout, fmt, since),
+            [(p["id"], p["created_at"]) for p in predictions_data],
+            [(n["link"], n["sentiment_score"]) for n in news_data]
+        )
+        headers = {"ETag": etag, "Vary": "Accept"}
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+        if fmt != "json":
+            body, media_type = encode_history_response(result, fmt, history_path=("market_data", "history"))
+            return Response(content=body, media_type=media_type, headers=headers)
+        # jsonable_encoder를 거치지 않고 바로 직렬화
+        return FastJSONResponse(result, headers=headers)
     except HTTPException:
         # 이미 HTTPException이면 그대로 전달
         raise
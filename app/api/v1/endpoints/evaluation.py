@@ -11,6 +11,7 @@ from app.schemas.evaluation import (
     ModelAccuracyResponse
 )
 from app.services.evaluation_service import EvaluationService
+from app.core.executor import run_upstream, run_db
 
 router = APIRouter()
 
@@ -28,11 +29,15 @@ async def evaluate_prediction(
     """
     try:
         service = EvaluationService(db)
-        evaluated_log = service.evaluate_prediction(
+        # 실제 가격 조회 시 upstream 호출이 발생할 수 있음
+        evaluated_log = await run_upstream(
+            service.evaluate_prediction,
             request.prediction_log_id,
             request.actual_price
         )
         return evaluated_log
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -53,11 +58,13 @@ async def evaluate_pending_predictions(
     """
     try:
         service = EvaluationService(db)
-        evaluated = service.evaluate_pending_predictions(symbol=symbol, limit=limit)
+        evaluated = await run_upstream(service.evaluate_pending_predictions, symbol=symbol, limit=limit)
         return {
             "evaluated_count": len(evaluated),
             "evaluated_logs": evaluated
         }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error evaluating predictions: {str(e)}")
 
@@ -76,8 +83,10 @@ async def get_model_accuracy(
     """
     try:
         service = EvaluationService(db)
-        accuracy = service.calculate_model_accuracy(model_name, symbol)
+        accuracy = await run_db(service.calculate_model_accuracy, model_name, symbol)
         return accuracy
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error calculating accuracy: {str(e)}")
 
@@ -98,8 +107,10 @@ async def get_evaluation_history(
     """
     try:
         service = EvaluationService(db)
-        history = service.get_evaluation_history(symbol, model_name, limit)
+        history = await run_db(service.get_evaluation_history, symbol, model_name, limit)
         return history
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching evaluation history: {str(e)}")
 
@@ -7,10 +7,34 @@ from typing import List, Optional
 from app.core.database import get_db
 from app.schemas.prediction import PaperInsightCreate, PaperInsightResponse
 from app.db.models import PaperInsight
+from app.core.executor import run_db
 
 router = APIRouter()
 
 
+def _create_insight(db: Session, insight: PaperInsightCreate) -> PaperInsight:
+    try:
+        db_insight = PaperInsight(**insight.model_dump())
+        db.add(db_insight)
+        db.commit()
+        db.refresh(db_insight)
+        return db_insight
+    except Exception:
+        db.rollback()
+        raise
+
+
+def _mark_insight_read(db: Session, insight_id: int) -> Optional[PaperInsight]:
+    insight = db.query(PaperInsight).filter(PaperInsight.id == insight_id).first()
+    if not insight:
+        return None
+    
+    insight.is_read = True
+    db.commit()
+    db.refresh(insight)
+    return insight
+
+
 @router.post("/insights", response_model=PaperInsightResponse)
 async def create_insight(
     insight: PaperInsightCreate,
@@ -27,13 +51,10 @@ async def create_insight(
     - **key_findings**: Key findings from the paper
     """
     try:
-        db_insight = PaperInsight(**insight.model_dump())
-        db.add(db_insight)
-        db.commit()
-        db.refresh(db_insight)
-        return db_insight
+        return await run_db(_create_insight, db, insight)
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=f"Error creating insight: {str(e)}")
 
 
@@ -59,8 +80,12 @@ async def get_insights(
         if is_read is not None:
             query = query.filter(PaperInsight.is_read == is_read)
         
-        insights = query.order_by(PaperInsight.created_at.desc()).limit(limit).all()
+        insights = await run_db(
+            lambda: query.order_by(PaperInsight.created_at.desc()).limit(limit).all()
+        )
         return insights
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching insights: {str(e)}")
 
@@ -71,7 +96,9 @@ async def get_insight(
     db: Session = Depends(get_db)
 ):
     """Get a specific insight by ID"""
-    insight = db.query(PaperInsight).filter(PaperInsight.id == insight_id).first()
+    insight = await run_db(
+        lambda: db.query(PaperInsight).filter(PaperInsight.id == insight_id).first()
+    )
     if not insight:
         raise HTTPException(status_code=404, detail="Insight not found")
     return insight
@@ -83,12 +110,8 @@ async def mark_insight_read(
     db: Session = Depends(get_db)
 ):
     """Mark an insight as read"""
-    insight = db.query(PaperInsight).filter(PaperInsight.id == insight_id).first()
+    insight = await run_db(_mark_insight_read, db, insight_id)
     if not insight:
         raise HTTPException(status_code=404, detail="Insight not found")
-    
-    insight.is_read = True
-    db.commit()
-    db.refresh(insight)
     return insight
 
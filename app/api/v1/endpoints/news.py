@@ -8,10 +8,42 @@ from app.core.database import get_db
 from app.schemas.news import NewsResponse, NewsFetchRequest
 from app.services.news_service import NewsService
 from app.db.models import NewsLog
+from app.core.executor import run_upstream, run_db
 
 router = APIRouter()
 
 
+def _save_news(db: Session, news_list: List[dict], update_existing: bool = False) -> List[NewsLog]:
+    """Save news articles (deduplicated by link) and return the stored rows"""
+    saved_news = []
+    for news in news_list:
+        # Check if news already exists (by link)
+        existing = db.query(NewsLog).filter(NewsLog.link == news['link']).first()
+        
+        if not existing:
+            db_news = NewsLog(**news)
+            db.add(db_news)
+            saved_news.append(db_news)
+        else:
+            if update_existing:
+                # Update existing record
+                existing.sentiment_score = news.get('sentiment_score')
+                existing.sentiment_label = news.get('sentiment_label')
+            saved_news.append(existing)
+    
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    
+    # Refresh all items
+    for news in saved_news:
+        db.refresh(news)
+    
+    return saved_news
+
+
 @router.get("/{symbol}", response_model=List[NewsResponse])
 async def get_news(
     symbol: str,
@@ -28,30 +60,15 @@ async def get_news(
     """
     try:
         service = NewsService()
-        news_list = service.get_latest_news(symbol, limit=limit, days_back=days_back)
+        news_list = await run_upstream(service.get_latest_news, symbol, limit=limit, days_back=days_back)
         
         # Save to database
-        saved_news = []
-        for news in news_list:
-            # Check if news already exists (by link)
-            existing = db.query(NewsLog).filter(NewsLog.link == news['link']).first()
-            
-            if not existing:
-                db_news = NewsLog(**news)
-                db.add(db_news)
-                saved_news.append(db_news)
-            else:
-                saved_news.append(existing)
-        
-        db.commit()
-        
-        # Refresh all items
-        for news in saved_news:
-            db.refresh(news)
+        saved_news = await run_db(_save_news, db, news_list)
         
         return saved_news
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=f"Error fetching news: {str(e)}")
 
 
@@ -69,37 +86,21 @@ async def fetch_news(
     """
     try:
         service = NewsService()
-        news_list = service.get_latest_news(
+        news_list = await run_upstream(
+            service.get_latest_news,
             request.symbol,
             limit=request.limit,
-            days_back=request.days_back
+            days_back=request.days_back,
+            use_cache=False
         )
         
-        # Save to database
-        saved_news = []
-        for news in news_list:
-            # Check if news already exists (by link)
-            existing = db.query(NewsLog).filter(NewsLog.link == news['link']).first()
-            
-            if not existing:
-                db_news = NewsLog(**news)
-                db.add(db_news)
-                saved_news.append(db_news)
-            else:
-                # Update existing record
-                existing.sentiment_score = news.get('sentiment_score')
-                existing.sentiment_label = news.get('sentiment_label')
-                saved_news.append(existing)
-        
-        db.commit()
-        
-        # Refresh all items
-        for news in saved_news:
-            db.refresh(news)
+        # Save to database (update sentiment of existing records)
+        saved_news = await run_db(_save_news, db, news_list, update_existing=True)
         
         return saved_news
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=f"Error fetching news: {str(e)}")
 
 
@@ -116,12 +117,16 @@ async def get_news_history(
     - **limit**: Maximum number of articles to return
     """
     try:
-        news_list = db.query(NewsLog)\
-            .filter(NewsLog.symbol == symbol)\
-            .order_by(NewsLog.published_date.desc())\
-            .limit(limit)\
+        news_list = await run_db(
+            lambda: db.query(NewsLog)
+            .filter(NewsLog.symbol == symbol)
+            .order_by(NewsLog.published_date.desc())
+            .limit(limit)
             .all()
+        )
         return news_list
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching news history: {str(e)}")
 
@@ -5,8 +5,12 @@ from fastapi import APIRouter, HTTPException, Depends
 from sqlalchemy.orm import Session
 from typing import List
 from app.core.database import get_db
-from app.schemas.prediction import PredictionRequest, PredictionResponse
+from app.schemas.prediction import BatchPredictionRequest, PredictionRequest, PredictionResponse
 from app.services.prediction_service import PredictionService
+from app.core.config import settings
+from app.core.executor import run_upstream, run_db
+from app.core.rate_limiter import RateLimitTimeout
+from app.core.responses import FastJSONResponse
 
 router = APIRouter()
 
@@ -25,8 +29,46 @@ async def create_prediction(
     """
     try:
         service = PredictionService(db)
-        result = service.generate_prediction(request)
+        # 히스토리 조회 + 모델 추론은 blocking 작업
+        result = await run_upstream(service.generate_prediction, request)
         return result
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.post("/predict-batch")
+async def create_predictions_batch(
+    request: BatchPredictionRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Generate predictions for many symbols in one pass
+    
+    - **symbols**: Stock or cryptocurrency symbols (max PREDICTION_BATCH_MAX_SYMBOLS)
+    - **model_name**: Optional specific model to use
+    - **horizons**: Days ahead to predict for every symbol (default [1])
+    
+    Histories are fetched in bulk, the model scores all symbols at once and all
+    rows are saved in one transaction. Symbols without data are listed in `errors`.
+    """
+    if len(request.symbols) > settings.PREDICTION_BATCH_MAX_SYMBOLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many symbols: {len(request.symbols)} (max {settings.PREDICTION_BATCH_MAX_SYMBOLS})"
+        )
+    
+    try:
+        service = PredictionService(db)
+        result = await run_upstream(service.generate_predictions_batch, request)
+        return FastJSONResponse(result)
+    except HTTPException:
+        raise
+    except RateLimitTimeout as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -47,8 +89,10 @@ async def get_predictions(
     """
     try:
         service = PredictionService(db)
-        predictions = service.get_predictions_by_symbol(symbol, limit=limit)
+        predictions = await run_db(service.get_predictions_by_symbol, symbol, limit=limit)
         return predictions
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
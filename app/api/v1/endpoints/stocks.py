@@ -1,15 +1,29 @@
 """
 Stock data endpoints
 """
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+import json
+from fastapi import APIRouter, HTTPException, Depends, Header, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Literal, Optional
 from app.core.database import get_db
 from app.schemas.stock import StockHistoryRequest, StockQuoteResponse
 from app.services.stock_service import StockService
 from app.services.market_data_service import MarketDataService
+from app.services.quote_service import QuoteService
+from app.services.quote_stream import get_quote_stream_hub
+from app.services.history_encoding import NotAcceptableError, encode_history_response, negotiate_history_format
+from app.services.conditional import etag_matches, market_data_etag, parse_since
+from app.core.config import settings
+from app.core.responses import FastJSONResponse
+from app.core.executor import run_upstream
+from app.core.rate_limiter import RateLimitTimeout
 router = APIRouter()
 
+# 연결 유지용 SSE 주석 전송 간격 (프록시 idle timeout 방지)
+STREAM_HEARTBEAT_SEC = 15.0
+
 @router.get("/quote/{symbol}", response_model=StockQuoteResponse)
 async def get_stock_quote(
     symbol: str,
@@ -21,8 +35,8 @@ async def get_stock_quote(
     - **symbol**: Stock symbol (e.g., AAPL, TSLA, BTC-USD)
     """
     try:
-        service = StockService()
-        data = service.get_stock_data(symbol, period="1d", interval="1m")
+        # 장중 1분봉 전체 대신 최신 bar/일봉 몇 개만 사용하는 경량 경로 (짧은 TTL 캐시)
+        data = await run_upstream(QuoteService.get_quote, symbol)
         
         return StockQuoteResponse(
             symbol=data["symbol"],
@@ -30,8 +44,137 @@ async def get_stock_quote(
             change=data["change"],
             change_percent=data["change_percent"],
             volume=data["volume"],
-            timestamp=data["timestamp"]
+            timestamp=data["timestamp"],
+            stale=data["stale"]
+        )
+    except HTTPException:
+        raise
+    except RateLimitTimeout as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/validate/{symbol}")
+async def validate_stock_symbol(symbol: str):
+    """
+    Check whether a symbol exists
+    
+    - **symbol**: Stock symbol (e.g., AAPL, TSLA, BTC-USD)
+    
+    Answered from local caches when possible (malformed and recently confirmed
+    unknown symbols cost no upstream call); otherwise one 5d/1d probe.
+    """
+    try:
+        valid = await run_upstream(MarketDataService.validate_symbol, symbol)
+        return {"symbol": symbol.strip().upper(), "valid": valid}
+    except RateLimitTimeout as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+
+
+@router.get("/stream")
+async def stream_quotes(request: Request, symbols: str):
+    """
+    Stream live quotes with Server-Sent Events
+    
+    - **symbols**: Comma-separated symbols (e.g., AAPL,TSLA,BTC-USD)
+    
+    Emits `quote` events (same fields as `/quote/{symbol}`) whenever a price
+    changes and `error` events (`symbol`, `status`, `detail`) when a poll fails.
+    All clients watching a symbol share one server-side poller.
+    """
+    symbol_list = list(dict.fromkeys(s.strip().upper() for s in symbols.split(",") if s.strip()))
+    if not symbol_list:
+        raise HTTPException(status_code=400, detail="At least one symbol is required")
+    if len(symbol_list) > settings.MARKET_DATA_BATCH_MAX_SYMBOLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many symbols: {len(symbol_list)} (max {settings.MARKET_DATA_BATCH_MAX_SYMBOLS})"
+        )
+    
+    hub = get_quote_stream_hub()
+    
+    async def event_stream():
+        # 심볼별 큐를 하나의 출력 큐로 모음
+        merged: asyncio.Queue = asyncio.Queue()
+        subscriptions = []
+        forwarders = []
+        
+        async def forward(queue: asyncio.Queue):
+            while True:
+                await merged.put(await queue.get())
+        
+        try:
+            for symbol in symbol_list:
+                queue = await hub.subscribe(symbol)
+                subscriptions.append((symbol, queue))
+                forwarders.append(asyncio.create_task(forward(queue)))
+            
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(merged.get(), timeout=STREAM_HEARTBEAT_SEC)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+        finally:
+            for task in forwarders:
+                task.cancel()
+            for symbol, queue in subscriptions:
+                hub.unsubscribe(symbol, queue)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/history")
+async def get_stock_history_batch(
+    symbols: str,
+    period: str = "1mo",
+    interval: str = "1d",
+    layout: Literal["rows", "columns"] = "rows",
+    db: Session = Depends(get_db)
+):
+    """
+    Get historical data for multiple symbols in a single upstream request
+    
+    - **symbols**: Comma-separated symbols (e.g., AAPL,MSFT,BTC-USD)
+    - **period**: Period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
+    - **interval**: Interval (1m, 2m, 5m, 15m, 30m, 60m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
+    - **layout**: History shape - `rows` (list of bars, default) or `columns` (dict of arrays)
+    
+    Returns results keyed by symbol; symbols without data are listed in `errors`.
+    """
+    symbol_list = [s.strip() for s in symbols.split(",") if s.strip()]
+    if not symbol_list:
+        raise HTTPException(status_code=400, detail="At least one symbol is required")
+    if len(symbol_list) > settings.MARKET_DATA_BATCH_MAX_SYMBOLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many symbols: {len(symbol_list)} (max {settings.MARKET_DATA_BATCH_MAX_SYMBOLS})"
+        )
+    
+    try:
+        result = await run_upstream(
+            MarketDataService.get_market_data_batch,
+            symbol_list,
+            period=period,
+            interval=interval,
+            layout=layout
         )
+        return FastJSONResponse(result)
+    except HTTPException:
+        raise
+    except RateLimitTimeout as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -43,6 +186,10 @@ async def get_stock_history(
     symbol: str,
     period: str = "1mo",
     interval: str = "1d",
+    layout: Literal["rows", "columns"] = "rows",
+    since: Optional[str] = None,
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
     """
@@ -51,11 +198,41 @@ async def get_stock_history(
     - **symbol**: Stock symbol
     - **period**: Period (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
     - **interval**: Interval (1m, 2m, 5m, 15m, 30m, 60m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
+    - **layout**: History shape - `rows` (list of bars, default) or `columns` (dict of arrays)
+    
+    - **since**: Only return bars newer than this time (ISO 8601 or epoch seconds)
+    
+    Send `Accept: application/vnd.apache.arrow.stream` or `application/x-msgpack`
+    for a columnar binary response (JSON by default). Responses carry an `ETag`
+    (last bar time/values); `If-None-Match` with the same tag returns 304.
     """
+    try:
+        fmt = negotiate_history_format(accept)
+        since_ts = parse_since(since)
+    except NotAcceptableError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
         service = StockService()
-        data = service.get_stock_data(symbol, period=period, interval=interval)
-        return data
+        data = await run_upstream(
+            service.get_stock_data, symbol, period=period, interval=interval,
+            layout=layout if fmt == "json" else "arrays", since=since_ts
+        )
+        # 마지막 bar가 그대로면 304 (본문 없음)
+        headers = {"ETag": market_data_etag(data, period, interval, layout, fmt, since), "Vary": "Accept"}
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        if fmt != "json":
+            body, media_type = encode_history_response(data, fmt)
+            return Response(content=body, media_type=media_type, headers=headers)
+        # jsonable_encoder를 거치지 않고 바로 직렬화
+        return FastJSONResponse(data, headers=headers)
+    except HTTPException:
+        raise
+    except RateLimitTimeout as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -67,6 +244,10 @@ async def get_crypto_data(
     symbol: str,
     period: str = "1mo",
     interval: str = "1d",
+    layout: Literal["rows", "columns"] = "rows",
+    since: Optional[str] = None,
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
     """
@@ -75,11 +256,40 @@ async def get_crypto_data(
     - **symbol**: Crypto symbol (e.g., BTC, ETH) - will be converted to BTC-USD format
     - **period**: Period to fetch
     - **interval**: Data interval
+    - **layout**: History shape - `rows` (list of bars, default) or `columns` (dict of arrays)
+    
+    - **since**: Only return bars newer than this time (ISO 8601 or epoch seconds)
+    
+    Supports the same content negotiation, ETag / If-None-Match and `since`
+    deltas as `/history/{symbol}`.
     """
+    try:
+        fmt = negotiate_history_format(accept)
+        since_ts = parse_since(since)
+    except NotAcceptableError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     try:
         service = StockService()
-        data = service.get_crypto_data(symbol, period=period, interval=interval)
-        return data
+        data = await run_upstream(
+            service.get_crypto_data, symbol, period=period, interval=interval,
+            layout=layout if fmt == "json" else "arrays", since=since_ts
+        )
+        # 마지막 bar가 그대로면 304 (본문 없음)
+        headers = {"ETag": market_data_etag(data, period, interval, layout, fmt, since), "Vary": "Accept"}
+        if etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        if fmt != "json":
+            body, media_type = encode_history_response(data, fmt)
+            return Response(content=body, media_type=media_type, headers=headers)
+        # jsonable_encoder를 거치지 않고 바로 직렬화
+        return FastJSONResponse(data, headers=headers)
+    except HTTPException:
+        raise
+    except RateLimitTimeout as e:
+        raise HTTPException(status_code=429, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
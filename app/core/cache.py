@@ -0,0 +1,375 @@
+"""
+Two-tier response cache shared across uvicorn workers
+
+    L1  bounded in-process LRU (per worker, entries live at most CACHE_LOCAL_TTL)
+    L2  shared backend - every worker sees the same entries
+
+L2 backends (CACHE_BACKEND):
+    disk    one file per key under CACHE_DIR; the file mtime holds the expiry,
+            so expired entries are swept with stat() only (default)
+    redis   any Redis-protocol server at CACHE_REDIS_URL (`pip install redis`)
+    memory  process-local stand-in with the same semantics (tests / one worker)
+
+Values are pickled; the backend must only be reachable by this service.
+A failing L2 is treated as a miss so a cache outage never fails a request.
+
+    cache = get_cache("news")
+    news = cache.get(("AAPL", 10, 7))
+    if news is None:
+        news = load()
+        cache.set(("AAPL", 10, 7), news, ttl=300)
+"""
+import hashlib
+import os
+import pickle
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+try:
+    from app.core.config import settings
+except ImportError:
+    settings = None
+
+
+class CacheBackend(ABC):
+    """Shared (L2) byte store with per-key expiry"""
+
+    name = "base"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Value, or None if missing or expired"""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+
+class MemoryBackend(CacheBackend):
+    """Process-local stand-in for a shared backend"""
+
+    name = "memory"
+
+    def __init__(self):
+        self._entries: Dict[str, tuple[bytes, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() >= entry[1]:
+                del self._entries[key]
+                return None
+            return entry[0]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class DiskBackend(CacheBackend):
+    """
+    One file per key; shared by all worker processes on the host
+
+    Args:
+        root: Cache directory
+        sweep_every: Remove expired files after this many writes
+    """
+
+    name = "disk"
+
+    def __init__(self, root: str, sweep_every: int = 256):
+        self.root = Path(root)
+        self.sweep_every = sweep_every
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha1(key.encode()).hexdigest()
+        return self.root / digest[:2] / f"{digest}.bin"
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            if path.stat().st_mtime <= time.time():
+                # 만료 (mtime = 만료 시각)
+                path.unlink(missing_ok=True)
+                return None
+            return path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(value)
+        expires_at = time.time() + ttl
+        os.utime(tmp_path, (expires_at, expires_at))
+        # 원자적 교체 - 다른 worker가 읽는 도중에도 깨진 값을 보지 않음
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._writes += 1
+            sweep = self._writes % self.sweep_every == 0
+        if sweep:
+            self.sweep()
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def sweep(self) -> int:
+        """Remove expired entries (stat only); returns the number removed"""
+        now = time.time()
+        removed = 0
+        for path in self.root.glob("*/*.bin"):
+            try:
+                if path.stat().st_mtime <= now:
+                    path.unlink(missing_ok=True)
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+
+class RedisBackend(CacheBackend):
+    """
+    Redis-protocol server (Redis, Valkey, KeyDB, ...)
+
+    After an error the backend is skipped for `retry_after` seconds so an
+    unreachable server does not add a socket timeout to every request.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "sas:", timeout: float = 0.2, retry_after: float = 30.0):
+        if redis is None:
+            raise RuntimeError("redis package is not installed (pip install redis)")
+        self.client = redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        self.prefix = prefix
+        self.retry_after = retry_after
+        self._down_until = 0.0
+
+    def _call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        if time.monotonic() < self._down_until:
+            return None
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            print(f"[CACHE] ⚠️ Redis unavailable ({e}), skipping L2 for {self.retry_after:.0f}s")
+            self._down_until = time.monotonic() + self.retry_after
+            return None
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._call(self.client.get, self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._call(self.client.set, self.prefix + key, value, px=max(1, int(ttl * 1000)))
+
+    def delete(self, key: str) -> None:
+        self._call(self.client.delete, self.prefix + key)
+
+
+class TieredCache:
+    """
+    In-process LRU (L1) in front of a shared backend (L2) for one namespace
+
+    `None` is never cached - a None result is a miss.
+
+    Args:
+        namespace: Key prefix (e.g. 'market_data', 'news')
+        backend: Shared L2 backend (None for L1 only)
+        max_entries: L1 size bound
+        local_ttl: Longest time an entry is served from L1 before L2 is consulted
+            again (bounds cross-worker staleness after a delete)
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        backend: Optional[CacheBackend],
+        max_entries: int = 1024,
+        local_ttl: float = 10.0
+    ):
+        self.namespace = namespace
+        self.backend = backend
+        self.max_entries = max_entries
+        self.local_ttl = local_ttl
+        self._local: "OrderedDict[str, tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._l1_hits = 0
+        self._l2_hits = 0
+        self._misses = 0
+        self._sets = 0
+        self._errors = 0
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.namespace}:{key!r}"
+
+    def _remember(self, key: str, value: Any, ttl: float) -> None:
+        """Store in L1 (lock held)"""
+        self._local[key] = (value, time.monotonic() + min(ttl, self.local_ttl))
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    def get(self, key: Hashable) -> Any:
+        """Cached value, or None on a miss in both tiers"""
+        key = self._key(key)
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                if time.monotonic() < entry[1]:
+                    self._local.move_to_end(key)
+                    self._l1_hits += 1
+                    return entry[0]
+                del self._local[key]
+
+        value = None
+        if self.backend is not None:
+            try:
+                data = self.backend.get(key)
+                value = pickle.loads(data) if data is not None else None
+            except Exception as e:
+                print(f"[CACHE] ⚠️ L2 read failed for {key}: {e}")
+                with self._lock:
+                    self._errors += 1
+
+        with self._lock:
+            if value is None:
+                self._misses += 1
+                return None
+            self._l2_hits += 1
+            # L2 항목의 남은 TTL은 알 수 없으므로 L1에는 local_ttl 동안만 보관
+            self._remember(key, value, self.local_ttl)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        if value is None or ttl <= 0:
+            return
+        key = self._key(key)
+        with self._lock:
+            self._remember(key, value, ttl)
+            self._sets += 1
+        if self.backend is None:
+            return
+        try:
+            self.backend.set(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ttl)
+        except Exception as e:
+            print(f"[CACHE] ⚠️ L2 write failed for {key}: {e}")
+            with self._lock:
+                self._errors += 1
+
+    def delete(self, key: Hashable) -> None:
+        key = self._key(key)
+        with self._lock:
+            self._local.pop(key, None)
+        if self.backend is not None:
+            try:
+                self.backend.delete(key)
+            except Exception as e:
+                print(f"[CACHE] ⚠️ L2 delete failed for {key}: {e}")
+
+    def get_or_load(self, key: Hashable, ttl: float, loader: Callable[[], Any]) -> Any:
+        """Cached value, or loader() stored for `ttl` seconds"""
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            self.set(key, value, ttl)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._l1_hits + self._l2_hits + self._misses
+            l2_lookups = self._l2_hits + self._misses
+            return {
+                "backend": self.backend.name if self.backend is not None else None,
+                "l1_entries": len(self._local),
+                "l1_hits": self._l1_hits,
+                "l2_hits": self._l2_hits,
+                "misses": self._misses,
+                "sets": self._sets,
+                "errors": self._errors,
+                # L1: 전체 조회 대비, L2: L1 miss 대비
+                "l1_hit_rate": round(self._l1_hits / lookups, 4) if lookups else 0.0,
+                "l2_hit_rate": round(self._l2_hits / l2_lookups, 4) if l2_lookups else 0.0,
+                "hit_rate": round((self._l1_hits + self._l2_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+
+def create_cache_backend(name: str) -> Optional[CacheBackend]:
+    """Build the L2 backend for CACHE_BACKEND ('disk', 'redis', 'memory' or 'none')"""
+    name = name.strip().lower()
+    if name == "disk":
+        return DiskBackend(settings.CACHE_DIR if settings else "./data/cache")
+    if name == "redis":
+        return RedisBackend(settings.CACHE_REDIS_URL if settings else "redis://localhost:6379/0")
+    if name == "memory":
+        return MemoryBackend()
+    if name == "none":
+        return None
+    raise ValueError(f"Unknown cache backend: {name} (expected disk, redis, memory or none)")
+
+
+_backend: Optional[CacheBackend] = None
+_backend_ready = False
+_caches: Dict[str, TieredCache] = {}
+_caches_guard = threading.Lock()
+
+
+def _shared_backend() -> Optional[CacheBackend]:
+    """Process-wide L2 backend (lock held); falls back to L1 only if it cannot be created"""
+    global _backend, _backend_ready
+    if not _backend_ready:
+        _backend_ready = True
+        try:
+            _backend = create_cache_backend(settings.CACHE_BACKEND if settings else "disk")
+        except Exception as e:
+            print(f"[CACHE] ⚠️ Shared cache backend unavailable ({e}), using in-process cache only")
+            _backend = None
+    return _backend
+
+
+def get_cache(namespace: str) -> TieredCache:
+    """Return the process-wide two-tier cache for a namespace"""
+    with _caches_guard:
+        cache = _caches.get(namespace)
+        if cache is None:
+            cache = TieredCache(
+                namespace,
+                _shared_backend(),
+                max_entries=settings.CACHE_LOCAL_MAX_ENTRIES if settings else 1024,
+                local_ttl=settings.CACHE_LOCAL_TTL if settings else 10.0,
+            )
+            _caches[namespace] = cache
+        return cache
+
+
+def cache_enabled() -> bool:
+    return bool(settings is None or settings.CACHE_ENABLED)
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-namespace, per-tier cache stats"""
+    with _caches_guard:
+        caches = list(_caches.values())
+    return {cache.namespace: cache.stats() for cache in caches}
@@ -0,0 +1,171 @@
+"""
+Circuit breaker for the Yahoo Finance upstream
+
+After `failure_threshold` consecutive failures (429s or errors) the circuit
+opens and upstream calls fail immediately with CircuitOpenError instead of
+retrying. Once `recovery_timeout` has passed a single probe call is let
+through (half-open); its result closes the circuit or opens it again.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from app.core.rate_limiter import RateLimitTimeout, is_rate_limit_error
+
+try:
+    from app.core.config import settings
+except ImportError:
+    settings = None
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RateLimitTimeout):
+    """Raised when the upstream circuit is open (handled like a rate-limit timeout: no retries)"""
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """
+    Errors that indicate an upstream incident (429s, timeouts, connection errors)
+
+    "No data"/invalid symbol errors do not count, so bad user input cannot open the circuit.
+    """
+    name = type(error).__name__
+    return (
+        is_rate_limit_error(error)
+        or isinstance(error, (ConnectionError, TimeoutError))
+        or "Timeout" in name
+        or "Connection" in name
+    )
+
+
+class CircuitBreaker:
+    """
+    Thread-safe consecutive-failure circuit breaker
+
+    Args:
+        name: Name used in stats and errors
+        failure_threshold: Consecutive failures that open the circuit
+        recovery_timeout: Seconds to stay open before a probe is allowed
+        is_failure: Decides which exceptions count as failures (default: all)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        recovery_timeout: float = 30.0,
+        is_failure: Optional[Callable[[BaseException], bool]] = None
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.is_failure = is_failure or (lambda error: True)
+
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        self._trips = 0
+        self._rejected = 0
+        self._probes = 0
+
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed (0 when closed or probing is due)"""
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(self._opened_at + self.recovery_timeout - time.monotonic(), 0.0)
+
+    def before_call(self) -> None:
+        """
+        Admit or reject an upstream call
+
+        Raises:
+            CircuitOpenError: while open, or while another caller's probe is in flight
+        """
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            now = time.monotonic()
+            if self._state == OPEN and now >= self._opened_at + self.recovery_timeout:
+                self._state = HALF_OPEN
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self._probes += 1
+                return
+            self._rejected += 1
+            wait = max(self._opened_at + self.recovery_timeout - now, 0.0)
+        raise CircuitOpenError(
+            f"Yahoo Finance API rate limit exceeded or upstream unavailable "
+            f"({self.name} circuit open, retry in {wait:.0f}s)"
+        )
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                print(f"[CIRCUIT] ✅ {self.name}: probe succeeded, closing circuit")
+            self._state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    self._trips += 1
+                    print(f"[CIRCUIT] ⚠️ {self.name}: opening circuit for {self.recovery_timeout:.0f}s "
+                          f"after {self._failures} consecutive failures")
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+            self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Give up a probe slot without a verdict (e.g. the call never reached upstream)"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run func under the breaker; exceptions matching `is_failure` count as failures"""
+        self.before_call()
+        try:
+            result = func(*args, **kwargs)
+        except RateLimitTimeout:
+            # 로컬 예산 초과는 upstream 장애가 아님
+            self.release_probe()
+            raise
+        except Exception as e:
+            if self.is_failure(e):
+                self.record_failure()
+            else:
+                # upstream은 응답했음 (e.g. 잘못된 심볼) - 정상 동작으로 간주
+                self.record_success()
+            raise
+        self.record_success()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "retry_in_sec": round(max(self._opened_at + self.recovery_timeout - now, 0.0), 2)
+                if self._state == OPEN else 0.0,
+                "trips": self._trips,
+                "rejected": self._rejected,
+                "probes": self._probes,
+            }
+
+
+upstream_breaker = CircuitBreaker(
+    "yfinance",
+    failure_threshold=settings.UPSTREAM_BREAKER_FAILURES if settings else 3,
+    recovery_timeout=settings.UPSTREAM_BREAKER_RECOVERY if settings else 30.0,
+    is_failure=is_upstream_failure,
+)
@@ -0,0 +1,176 @@
+"""
+Negotiated response compression (brotli / gzip)
+
+Complete responses larger than COMPRESSION_MIN_SIZE are compressed with the
+best encoding the client accepts: brotli when the optional `brotli` package
+is installed and `br` is accepted, otherwise gzip. Small bodies, responses
+that already carry a Content-Encoding, non-compressible media types and
+streamed bodies (SSE) are passed through untouched.
+
+Usage (app/main.py):
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+"""
+import gzip
+import threading
+from typing import Any, Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# 압축 대상 media type (이미 압축된 이미지/아카이브 등은 제외)
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/x-msgpack",
+    "application/vnd.apache.arrow.stream",
+    "text/html",
+    "text/plain",
+    "text/css",
+    "text/csv",
+)
+
+# 프로세스 전체 압축 통계 (/metrics)
+_stats_lock = threading.Lock()
+_responses: Dict[str, int] = {"br": 0, "gzip": 0, "identity": 0}
+_bytes = {"in": 0, "out": 0}
+
+
+def _parse_accept_encoding(value: str) -> Dict[str, float]:
+    encodings = {}
+    for part in value.split(","):
+        fields = [field.strip() for field in part.split(";")]
+        if not fields[0]:
+            continue
+        quality = 1.0
+        for param in fields[1:]:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        encodings[fields[0].lower()] = quality
+    return encodings
+
+
+def available_encodings() -> List[str]:
+    """Encodings this server can produce (preferred first)"""
+    return (["br"] if brotli is not None else []) + ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Pick a content coding for an Accept-Encoding header
+
+    Returns:
+        'br', 'gzip' or None (identity)
+    """
+    if not accept_encoding:
+        return None
+    accepted = _parse_accept_encoding(accept_encoding)
+    best, best_quality = None, 0.0
+    for encoding in available_encodings():
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        # 같은 q면 br 우선 (available_encodings 순서)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 4) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing complete response bodies above a size threshold
+
+    Args:
+        app: Wrapped ASGI app
+        minimum_size: Bodies smaller than this (bytes) are sent as-is
+        gzip_level: gzip compresslevel (1-9)
+        brotli_quality: brotli quality (0-11; 4 is close to gzip -6 in speed with a smaller output)
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+            if message["type"] == "http.response.start":
+                # 본문을 보기 전까지 헤더 전송 보류
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            if start_message is None:
+                await send(message)
+                return
+            body = message.get("body", b"")
+            headers = MutableHeaders(raw=start_message["headers"])
+            if message.get("more_body", False) or not self._should_compress(headers, body):
+                # 스트리밍 응답(SSE 등)이나 작은 본문은 그대로
+                passthrough = True
+                _count("identity", len(body), len(body))
+                await send(start_message)
+                await send(message)
+                return
+
+            compressed = compress(body, encoding, self.gzip_level, self.brotli_quality)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            headers.add_vary_header("Accept-Encoding")
+            _count(encoding, len(body), len(compressed))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _should_compress(self, headers: MutableHeaders, body: bytes) -> bool:
+        if len(body) < self.minimum_size or "content-encoding" in headers:
+            return False
+        media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return media_type in COMPRESSIBLE_TYPES
+
+
+def _count(encoding: str, size_in: int, size_out: int) -> None:
+    with _stats_lock:
+        _responses[encoding] += 1
+        _bytes["in"] += size_in
+        _bytes["out"] += size_out
+
+
+def get_compression_stats() -> Dict[str, Any]:
+    """Responses per content coding and overall compressed/uncompressed bytes"""
+    with _stats_lock:
+        return {
+            "encodings": available_encodings(),
+            "responses": dict(_responses),
+            "bytes_in": _bytes["in"],
+            "bytes_out": _bytes["out"],
+            "ratio": round(_bytes["out"] / _bytes["in"], 3) if _bytes["in"] else None,
+        }
@@ -24,8 +24,74 @@ class Settings(BaseSettings):
     # External APIs
     YFINANCE_ENABLED: bool = True
     
+    # Market data provider: yfinance (live) | record (live + 응답 저장) | replay (저장된 응답만, 오프라인)
+    MARKET_DATA_PROVIDER: str = "yfinance"
+    MARKET_DATA_RECORDINGS_PATH: str = "./data/recordings"
+    MARKET_DATA_REPLAY_LATENCY: bool = False  # replay 시 녹화된 upstream 지연 시간 재현
+    
+    # Ticker metadata cache (.info - 이름/섹터/시가총액, 가격 조회와 분리)
+    METADATA_CACHE_PATH: str = "./data/metadata.json"
+    METADATA_TTL: int = 86400  # 갱신 주기 (초), 만료된 값도 갱신 전까지는 그대로 응답
+    METADATA_RETRY_AFTER: int = 300  # 갱신 실패 후 재시도까지 대기 (초)
+    
+    # Market data bar store (로컬 OHLCV 저장소)
+    BAR_STORE_ENABLED: bool = True
+    BAR_STORE_PATH: str = "./data/bars"
+    BAR_STORE_TAIL_TTL: int = 60  # 마지막 바 갱신 주기 (초)
+    BAR_STORE_HOT_MB: int = 256  # 메모리에 유지할 최근 사용 파일 크기 상한 (MB)
+    STOCK_DATA_PERSIST: bool = True  # 가져온 bar를 StockData 테이블에도 저장 (재시작/새 bar store에서 재사용)
+    MARKET_DATA_BATCH_MAX_SYMBOLS: int = 50  # 배치 조회 최대 심볼 수
+    PREDICTION_BATCH_MAX_SYMBOLS: int = 500  # 배치 예측 최대 심볼 수 (다운로드는 MARKET_DATA_BATCH_MAX_SYMBOLS씩)
+    QUOTE_CACHE_TTL: float = 5.0  # 현재가(quote) 캐시 유지 시간 (초)
+    QUOTE_STREAM_INTERVAL: float = 5.0  # 스트리밍 시 심볼별 polling 간격 (초)
+    
+    # Market data prefetch (watchlist + 최근 요청 키를 미리 갱신)
+    PREFETCH_ENABLED: bool = False
+    PREFETCH_WATCHLIST: list[str] = []  # "SYMBOL[:period[:interval]]" (기본 1mo, 1d)
+    PREFETCH_INTERVAL: float = 45.0  # 같은 키 갱신 주기 (초) - BAR_STORE_TAIL_TTL보다 짧게
+    PREFETCH_RECENT_LIMIT: int = 20  # 함께 갱신할 최근 요청 키 수
+    PREFETCH_RECENT_TTL: float = 1800.0  # 이 시간 동안 요청이 없으면 최근 키에서 제외 (초)
+    PREFETCH_MIN_TOKENS: float = 2.0  # 사용자 요청용으로 남겨둘 upstream 토큰 수
+    
+    # Upstream rate limit (모든 yfinance 호출이 공유하는 token bucket)
+    UPSTREAM_RATE_PER_SEC: float = 2.0
+    UPSTREAM_BURST: int = 5
+    UPSTREAM_MAX_WAIT: float = 30.0  # 이보다 오래 기다려야 하면 429로 응답
+    UPSTREAM_BACKOFF_BASE: float = 2.0  # 429 발생 시 첫 대기 시간 (초, 지수 증가)
+    UPSTREAM_BACKOFF_MAX: float = 60.0
+    UPSTREAM_BREAKER_FAILURES: int = 3  # 연속 실패(429/timeout) 횟수 → circuit open
+    UPSTREAM_BREAKER_RECOVERY: float = 30.0  # open 유지 시간 (초), 이후 probe 한 번 허용
+    MARKET_DATA_STALE_ENTRIES: int = 512  # 장애 시 응답할 마지막 정상 결과 보관 수
+    NEGATIVE_CACHE_TTL: float = 900.0  # 없는 것으로 확인된 심볼을 upstream 호출 없이 거절하는 시간 (초)
+    NEGATIVE_CACHE_MAX_ENTRIES: int = 4096
+    
+    # Blocking work executors (비동기 엔드포인트에서 사용하는 스레드 풀)
+    EXECUTOR_UPSTREAM_WORKERS: int = 16
+    EXECUTOR_UPSTREAM_QUEUE: int = 64
+    EXECUTOR_DB_WORKERS: int = 8
+    EXECUTOR_DB_QUEUE: int = 64
+    
+    # Shared response cache (in-process LRU + worker 간 공유 backend)
+    CACHE_ENABLED: bool = True
+    CACHE_BACKEND: str = "disk"  # disk | redis | memory (프로세스 로컬) | none (L1만)
+    CACHE_DIR: str = "./data/cache"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_LOCAL_MAX_ENTRIES: int = 1024  # worker별 L1 항목 수 상한
+    CACHE_LOCAL_TTL: float = 10.0  # L1 최대 보관 시간 (초) - worker 간 불일치 허용 범위
+    CACHE_MARKET_DATA_TTL: float = 15.0  # 시세/history 응답 (초)
+    CACHE_NEWS_TTL: float = 300.0  # 뉴스 + 감성 분석 결과 (초)
+    PREDICTION_CACHE_TTL: float = 86400.0  # 예측 결과 (초) - 새 바/모델 변경 시 키가 바뀌므로 길게 (0이면 끔)
+    
+    # Response encoding (orjson 직렬화 + gzip/brotli 압축)
+    COMPRESSION_MIN_SIZE: int = 1024  # 이보다 작은 응답은 압축하지 않음 (bytes)
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # brotli 패키지 설치 시 사용 (0-11)
+    
     # ML Models
     ML_MODEL_PATH: str = "./models"
+    ML_MODEL_WARMUP: bool = True  # 시작 시 ML_MODEL_PATH의 모든 모델 미리 로드
+    ML_MODEL_RELOAD_CHECK_SEC: float = 2.0  # 모델 파일 변경 확인 간격 (초) - 바뀌면 다시 로드
+    ML_MODEL_CACHE_MB: int = 1024  # worker당 pickle 모델 메모리 한도 (초과 시 LRU 제거, mmap 가중치는 제외)
     
     # CORS
     BACKEND_CORS_ORIGINS: list[str] = [
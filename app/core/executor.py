@@ -0,0 +1,154 @@
+"""
+Bounded thread pools for blocking work (yfinance/feedparser/SQLAlchemy) called from async endpoints
+
+Async endpoints must never call blocking services directly - a slow Yahoo call
+would freeze every other request on the same uvicorn worker. Use:
+
+    data = await run_upstream(MarketDataService.get_market_data, symbol, period=period)
+    rows = await run_db(lambda: db.query(Prediction).all())
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+from fastapi import HTTPException
+from app.core.config import settings
+
+
+class ExecutorBusyError(HTTPException):
+    """Raised when an executor's queue is full (mapped to HTTP 503)"""
+
+    def __init__(self, name: str):
+        super().__init__(
+            status_code=503,
+            detail=f"Server is busy ({name} queue full). Please try again shortly."
+        )
+
+
+class BoundedExecutor:
+    """ThreadPoolExecutor with a bounded queue and queue-depth metrics"""
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-worker")
+        self._lock = threading.Lock()
+        self._pending = 0  # 대기 중 + 실행 중
+        self._active = 0
+        self._max_pending = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._run_total = 0.0
+
+    def _reserve(self) -> None:
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise ExecutorBusyError(self.name)
+            self._pending += 1
+            self._submitted += 1
+            self._max_pending = max(self._max_pending, self._pending)
+
+    def _wrap(self, func: Callable[..., Any], *args, **kwargs) -> Callable[[], Any]:
+        submitted_at = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            with self._lock:
+                self._active += 1
+                self._wait_total += started - submitted_at
+            try:
+                return func(*args, **kwargs)
+            except BaseException:
+                with self._lock:
+                    self._failed += 1
+                raise
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._pending -= 1
+                    self._completed += 1
+                    self._run_total += time.perf_counter() - started
+
+        return task
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking callable in the pool and await its result"""
+        self._reserve()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, self._wrap(func, *args, **kwargs))
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool size, queue depth and timing metrics"""
+        with self._lock:
+            finished = max(self._completed, 1)
+            started = max(self._completed + self._active, 1)
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "active": self._active,
+                "queued": self._pending - self._active,
+                "max_queued": max(self._max_pending - self.max_workers, 0),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._wait_total / started * 1000, 2),
+                "avg_run_ms": round(self._run_total / finished * 1000, 2),
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_executors: Dict[str, BoundedExecutor] = {}
+_executors_guard = threading.Lock()
+
+_POOL_SETTINGS = {
+    "upstream": ("EXECUTOR_UPSTREAM_WORKERS", "EXECUTOR_UPSTREAM_QUEUE"),
+    "db": ("EXECUTOR_DB_WORKERS", "EXECUTOR_DB_QUEUE"),
+}
+
+
+def get_executor(name: str) -> BoundedExecutor:
+    """Return (and lazily create) the named executor: 'upstream' or 'db'"""
+    with _executors_guard:
+        if name not in _executors:
+            workers_key, queue_key = _POOL_SETTINGS[name]
+            _executors[name] = BoundedExecutor(
+                name,
+                max_workers=getattr(settings, workers_key),
+                max_queue=getattr(settings, queue_key),
+            )
+        return _executors[name]
+
+
+async def run_upstream(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run blocking upstream I/O (yfinance, RSS feeds, model inference) off the event loop"""
+    return await get_executor("upstream").run(func, *args, **kwargs)
+
+
+async def run_db(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run blocking SQLAlchemy work off the event loop"""
+    return await get_executor("db").run(func, *args, **kwargs)
+
+
+def get_executor_stats() -> Dict[str, Dict[str, Any]]:
+    """Return metrics for every executor created so far"""
+    with _executors_guard:
+        executors = list(_executors.values())
+    return {executor.name: executor.stats() for executor in executors}
+
+
+def shutdown_executors() -> None:
+    """Shut down all executors (called on application shutdown)"""
+    with _executors_guard:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown()
@@ -0,0 +1,209 @@
+"""
+Process-wide token-bucket rate limiter for upstream (Yahoo Finance) calls
+
+Every yfinance call goes through `upstream_limiter.call(...)` instead of fixed
+`time.sleep()` pauses. Callers only wait when the shared budget is exhausted,
+and a 429 from Yahoo pauses *all* callers with exponential backoff.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+try:
+    from app.core.config import settings
+except ImportError:
+    settings = None
+
+
+class RateLimitTimeout(ValueError):
+    """Raised when a caller would have to wait longer than the configured maximum"""
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Detect Yahoo Finance rate-limit errors (429 / YFRateLimitError)"""
+    message = str(error)
+    return (
+        "rate limit" in message.lower()
+        or "429" in message
+        or "Too Many Requests" in message
+        or "RateLimit" in type(error).__name__
+    )
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with shared Retry-After style backoff
+
+    Args:
+        name: Name used in stats
+        rate: Tokens added per second (sustained request rate)
+        burst: Bucket capacity (max requests in a burst)
+        max_wait: Longest a caller may block in acquire() (seconds)
+        backoff_base: First backoff after a rate-limit error (seconds)
+        backoff_max: Backoff ceiling (seconds)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: int,
+        max_wait: float = 30.0,
+        backoff_base: float = 2.0,
+        backoff_max: float = 60.0
+    ):
+        self.name = name
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.max_wait = max_wait
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._consecutive_limits = 0
+
+        self._acquired = 0
+        self._waited = 0
+        self._timeouts = 0
+        self._penalties = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def acquire(self, tokens: float = 1.0, max_wait: Optional[float] = None) -> float:
+        """
+        Block until `tokens` are available
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitTimeout: if the wait would exceed max_wait
+        """
+        max_wait = self.max_wait if max_wait is None else max_wait
+        started = time.monotonic()
+        deadline = started + max_wait
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._blocked_until and self._tokens >= tokens:
+                    self._tokens -= tokens
+                    waited = now - started
+                    self._acquired += 1
+                    if waited > 0.001:
+                        self._waited += 1
+                        self._wait_total += waited
+                        self._wait_max = max(self._wait_max, waited)
+                    return waited
+
+                sleep_for = max(
+                    self._blocked_until - now,
+                    (tokens - self._tokens) / self.rate if self.rate > 0 else self.max_wait
+                )
+                if now + sleep_for > deadline:
+                    self._timeouts += 1
+                    raise RateLimitTimeout(
+                        f"Yahoo Finance API rate limit exceeded "
+                        f"(upstream budget exhausted, wait {sleep_for:.1f}s > {max_wait:.1f}s)"
+                    )
+            time.sleep(min(sleep_for, max(deadline - time.monotonic(), 0.001)))
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens only if available right now (for background/prefetch work)"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now >= self._blocked_until and self._tokens >= tokens:
+                self._tokens -= tokens
+                self._acquired += 1
+                return True
+            return False
+
+    def available(self) -> float:
+        """Tokens available right now without taking any (0 while backing off)"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return self._tokens if now >= self._blocked_until else 0.0
+
+    def penalize(self, retry_after: Optional[float] = None) -> float:
+        """
+        Pause all callers after a rate-limit response
+
+        Args:
+            retry_after: Server-provided delay; exponential backoff is used if None
+
+        Returns:
+            Applied delay in seconds
+        """
+        with self._lock:
+            self._consecutive_limits += 1
+            self._penalties += 1
+            if retry_after is None:
+                retry_after = min(
+                    self.backoff_base * (2 ** (self._consecutive_limits - 1)),
+                    self.backoff_max
+                )
+            self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+            # 대기 후 burst로 한꺼번에 몰리지 않도록 토큰 비우기
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+            return retry_after
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._consecutive_limits = 0
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run an upstream call under the limiter
+
+        Rate-limit errors trigger a shared backoff and are re-raised.
+        """
+        self.acquire()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                delay = self.penalize(getattr(e, "retry_after", None))
+                print(f"[RATELIMIT] ⚠️ {self.name}: upstream rate limit, pausing all callers for {delay:.1f}s")
+            raise
+        self.record_success()
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            return {
+                "rate_per_sec": self.rate,
+                "burst": self.burst,
+                "tokens_available": round(self._tokens, 2),
+                "blocked_for_sec": round(max(self._blocked_until - now, 0.0), 2),
+                "acquired": self._acquired,
+                "waited": self._waited,
+                "timeouts": self._timeouts,
+                "penalties": self._penalties,
+                "avg_wait_ms": round(self._wait_total / self._waited * 1000, 2) if self._waited else 0.0,
+                "max_wait_ms": round(self._wait_max * 1000, 2),
+            }
+
+
+upstream_limiter = TokenBucket(
+    "yfinance",
+    rate=settings.UPSTREAM_RATE_PER_SEC if settings else 2.0,
+    burst=settings.UPSTREAM_BURST if settings else 5,
+    max_wait=settings.UPSTREAM_MAX_WAIT if settings else 30.0,
+    backoff_base=settings.UPSTREAM_BACKOFF_BASE if settings else 2.0,
+    backoff_max=settings.UPSTREAM_BACKOFF_MAX if settings else 60.0,
+)
@@ -0,0 +1,67 @@
+"""
+Fast JSON response class (app-wide default)
+
+FastAPI's default path runs every returned value through `jsonable_encoder`
+(a recursive Python walk that copies each dict/list) and then `json.dumps`.
+For history payloads with thousands of bars that walk dominates encode time.
+
+`FastJSONResponse` serializes with orjson when it is installed (native
+datetime / NumPy support, NaN → null) and falls back to the standard library
+encoder otherwise. Endpoints that return it directly skip `jsonable_encoder`
+entirely:
+
+    return FastJSONResponse(data, headers={"ETag": etag})
+"""
+import json
+from typing import Any
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+else:
+    ORJSON_OPTIONS = 0
+
+
+def _default(value: Any) -> Any:
+    """Values neither encoder handles natively (pandas Timestamp, NumPy scalars, Decimal, ...)"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+def dumps(content: Any) -> bytes:
+    """Encode a JSON-compatible value to UTF-8 bytes (orjson if available)"""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+    # 표준 json: NaN/Infinity는 JSONResponse와 같이 그대로 출력
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=True,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (standard json fallback)"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_backend() -> str:
+    return "orjson" if orjson is not None else "json"
@@ -0,0 +1,114 @@
+"""
+Single-flight request coalescing
+
+Concurrent callers asking for the same key share one in-flight call instead of
+each hitting the upstream. Works for both thread (sync) and asyncio callers:
+async waiters await the shared future without holding a worker thread.
+
+Cancelling one async caller (client disconnect, timeout) never affects the
+others: waiters are shielded, the async leader's work runs in its own task,
+and a cancellation is never stored on the shared future.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Set
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into a single execution"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        # 진행 중인 async leader 작업 (GC 방지용 참조)
+        self._tasks: Set[asyncio.Task] = set()
+        self._leaders = 0
+        self._shared = 0
+        _registry.append(self)
+
+    def _join(self, key: Hashable) -> tuple[Future, bool]:
+        """Return (future, is_leader) for key"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._shared += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self._leaders += 1
+            return future, True
+
+    def _finish(self, key: Hashable) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn once per key for all concurrent (thread) callers"""
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+            _set_result(future, result)
+            return result
+        except BaseException as e:
+            _set_exception(future, key, e)
+            raise
+        finally:
+            self._finish(key)
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await fn() once per key for all concurrent callers (sync or async)"""
+        future, leader = self._join(key)
+        if leader:
+            # leader가 취소되어도 공유 작업은 계속 진행 (다른 대기자에게 결과 전달)
+            task = asyncio.ensure_future(self._run(key, future, fn))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        # shield - 이 호출자의 취소가 공유 future로 전파되지 않도록
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    async def _run(self, key: Hashable, future: Future, fn: Callable[[], Awaitable[Any]]) -> None:
+        """Run the leader's call and publish its outcome (never raises)"""
+        try:
+            _set_result(future, await fn())
+        except BaseException as e:
+            _set_exception(future, key, e)
+        finally:
+            self._finish(key)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executions": self._leaders,
+                "coalesced": self._shared,
+            }
+
+
+def _set_result(future: Future, result: Any) -> None:
+    if not future.done():
+        future.set_result(result)
+
+
+def _set_exception(future: Future, key: Hashable, error: BaseException) -> None:
+    if future.done():
+        return
+    if isinstance(error, asyncio.CancelledError):
+        # 취소는 공유하지 않음 - 대기자에게는 일반 오류로 전달
+        error = RuntimeError(f"Shared call for {key!r} was cancelled")
+    future.set_exception(error)
+
+
+_registry: List[SingleFlight] = []
+
+
+def get_singleflight_stats() -> Dict[str, Dict[str, int]]:
+    """Return stats for every SingleFlight instance"""
+    return {flight.name: flight.stats() for flight in _registry}
@@ -1,26 +1,46 @@
 """
 Database models using SQLAlchemy
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, Float, DateTime, Text, Boolean, Index
 from sqlalchemy.sql import func
 from app.db.base import Base
 
 
 class StockData(Base):
-    """Stock market data model"""
+    """Stock market data model - one OHLCV bar per (symbol, interval, date)"""
     __tablename__ = "stock_data"
+    __table_args__ = (
+        # upsert 충돌 키 + 기간 조회(symbol, interval 고정 후 date 범위) 인덱스
+        Index("ux_stock_data_symbol_interval_date", "symbol", "interval", "date", unique=True),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
-    symbol = Column(String, index=True, nullable=False)
-    date = Column(DateTime, nullable=False)
+    symbol = Column(String, nullable=False)
+    interval = Column(String, nullable=False, default="1d")
+    date = Column(DateTime, nullable=False)  # bar 시작 시각 (UTC)
     open = Column(Float)
     high = Column(Float)
     low = Column(Float)
     close = Column(Float)
-    volume = Column(Integer)
+    volume = Column(BigInteger)
     created_at = Column(DateTime, server_default=func.now())
 
 
+class StockDataCoverage(Base):
+    """Time ranges already fetched into StockData (so gaps can be told apart from closed markets)"""
+    __tablename__ = "stock_data_coverage"
+    __table_args__ = (
+        Index("ix_stock_data_coverage_symbol_interval", "symbol", "interval"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    symbol = Column(String, nullable=False)
+    interval = Column(String, nullable=False)
+    start = Column(DateTime, nullable=False)  # UTC
+    end = Column(DateTime, nullable=False)  # UTC
+    tz = Column(String, nullable=False, default="UTC")  # 원래 index timezone
+
+
 class Prediction(Base):
     """AI prediction results model"""
     __tablename__ = "predictions"
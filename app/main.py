@@ -6,9 +6,28 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.core.database import engine, Base
 from app.api.v1.api import api_router
+from app.core.executor import get_executor_stats, shutdown_executors
+from app.core.singleflight import get_singleflight_stats
+from app.core.rate_limiter import upstream_limiter
+from app.core.circuit_breaker import upstream_breaker
+from app.core.cache import get_cache_stats
+from app.core.compression import CompressionMiddleware, get_compression_stats
+from app.core.responses import FastJSONResponse, json_backend
+from app.services.providers import get_provider_stats
+from app.services.metadata_cache import get_metadata_cache
+from app.services.bar_store import get_bar_store
+from app.services.quote_service import QuoteService
+from app.services.quote_stream import get_quote_stream_hub
+from app.services.prefetch_scheduler import get_prefetch_scheduler
+from app.services.stock_data_service import persistence_enabled
+from app.services.symbol_validation import get_negative_cache
+from app.ml_models.features import get_feature_stats
+from app.ml_models.registry import get_model_registry
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+# 이전 stock_data 스키마(interval 없음) 확인
+persistence_enabled()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -17,7 +36,9 @@ app = FastAPI(
     description="최신 논문 기반 주식/비트코인 예측 웹 서비스",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    # jsonable_encoder + json.dumps 대신 orjson으로 직렬화
+    default_response_class=FastJSONResponse
 )
 
 # CORS middleware
@@ -27,6 +48,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
+)
+
+# 임계값 이상 응답은 Accept-Encoding에 따라 brotli/gzip 압축
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
 )
 
 # Include API router
@@ -49,6 +79,47 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """Runtime metrics (executor queues, request coalescing, upstream rate limiter, providers, caches)"""
+    return {
+        "executors": get_executor_stats(),
+        "singleflight": get_singleflight_stats(),
+        "rate_limiter": {upstream_limiter.name: upstream_limiter.stats()},
+        "circuit_breaker": {upstream_breaker.name: upstream_breaker.stats()},
+        "providers": get_provider_stats(),
+        "metadata_cache": get_metadata_cache().stats(),
+        "bar_store": get_bar_store().stats(),
+        "quotes": QuoteService.stats(),
+        "negative_cache": get_negative_cache().stats(),
+        "cache": get_cache_stats(),
+        "models": get_model_registry().stats(),
+        "features": get_feature_stats(),
+        "quote_stream": get_quote_stream_hub().stats(),
+        "prefetch": get_prefetch_scheduler().stats(),
+        "responses": {"json": json_backend(), "compression": get_compression_stats()},
+    }
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Load ML models and start background market data prefetch"""
+    if settings.ML_MODEL_WARMUP:
+        # 첫 예측 요청이 모델 로드를 기다리지 않도록 미리 로드
+        get_model_registry().warm_up()
+    if settings.PREFETCH_ENABLED:
+        get_prefetch_scheduler().start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release executor threads on shutdown"""
+    get_prefetch_scheduler().stop()
+    get_quote_stream_hub().shutdown()
+    shutdown_executors()
+    get_metadata_cache().shutdown()
+
+
 if __name__ == "__main__":
     import uvicorn
     import logging
@@ -0,0 +1,664 @@
+"""
+Technical indicator / feature engine shared by all predictors
+
+Computes a standard feature matrix (MA, EMA, MACD, RSI, Bollinger bands,
+volatility, volume) from OHLCV arrays with vectorized NumPy, and keeps enough
+state to append (or revise) a bar in constant time, independent of how much
+history is loaded.
+
+    features = compute_features(close=close, volume=volume)
+    features["ma_20"][-1]
+
+    engine = FeatureEngine()
+    engine.sync(ts, close, volume)   # full vectorized build once
+    engine.sync(ts, close, volume)   # refetched history: only the new bars are computed
+
+Conventions (match pandas so models can be trained on either):
+    rolling means/stds   NaN until the window is full (min_periods=window)
+    EMAs                 seeded with the first value (ewm(adjust=False))
+    RSI                  Wilder smoothing (ewm(alpha=1/14, adjust=False)), NaN for the first 14 bars
+    volatility_20        std (ddof=1) of 1-bar returns
+    bollinger            20-bar mean ± 2 std (ddof=0)
+"""
+import copy
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+MA_WINDOWS = (5, 10, 20, 50)
+EMA_FAST = 12
+EMA_SLOW = 26
+MACD_SIGNAL = 9
+RSI_WINDOW = 14
+BB_WINDOW = 20
+BB_STDS = 2.0
+VOLATILITY_WINDOW = 20
+VOLUME_WINDOW = 20
+
+FEATURE_NAMES: Tuple[str, ...] = (
+    "close",
+    "return_1",
+    "log_return_1",
+    *(f"ma_{window}" for window in MA_WINDOWS),
+    f"ema_{EMA_FAST}",
+    f"ema_{EMA_SLOW}",
+    "macd",
+    "macd_signal",
+    "macd_hist",
+    f"rsi_{RSI_WINDOW}",
+    f"bb_upper_{BB_WINDOW}",
+    f"bb_lower_{BB_WINDOW}",
+    f"bb_pct_b_{BB_WINDOW}",
+    f"bb_width_{BB_WINDOW}",
+    f"volatility_{VOLATILITY_WINDOW}",
+    f"volume_ma_{VOLUME_WINDOW}",
+    f"volume_ratio_{VOLUME_WINDOW}",
+)
+FEATURE_INDEX = {name: i for i, name in enumerate(FEATURE_NAMES)}
+
+
+class FeatureMatrix:
+    """
+    Rows = bars, columns = FEATURE_NAMES (float64, NaN during warm-up)
+
+    `features["ma_20"]` returns a column view, `features.last()` the latest row as a dict.
+    """
+
+    def __init__(self, values: np.ndarray, ts: Optional[np.ndarray] = None):
+        self.values = values
+        self.ts = ts
+        self.names = FEATURE_NAMES
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.values[:, FEATURE_INDEX[name]]
+
+    def last(self) -> Dict[str, float]:
+        """Latest feature row (empty if there are no bars)"""
+        if not len(self.values):
+            return {}
+        return dict(zip(self.names, self.values[-1].tolist()))
+
+    def tail(self, n: int) -> "FeatureMatrix":
+        return FeatureMatrix(self.values[-n:], self.ts[-n:] if self.ts is not None else None)
+
+    def to_frame(self):
+        """pandas DataFrame (index = timestamps when known)"""
+        import pandas as pd
+        index = pd.to_datetime(self.ts, utc=True) if self.ts is not None else None
+        return pd.DataFrame(self.values, columns=list(self.names), index=index)
+
+
+# ---------------------------------------------------------------------------
+# Batch (vectorized) computation
+# ---------------------------------------------------------------------------
+
+def _rolling_means(values: np.ndarray, windows: Tuple[int, ...]) -> Dict[int, np.ndarray]:
+    """
+    Rolling means for several windows from one cumulative sum; NaN if any
+    value in the window is NaN
+    """
+    n = len(values)
+    missing = np.isnan(values)
+    has_missing = bool(missing.any())
+    # 누적합 정밀도를 위해 첫 유효값 기준으로 중심화
+    offset = values[~missing][0] if not missing.all() else 0.0
+    sums = np.empty(n + 1)
+    sums[0] = 0.0
+    np.cumsum(np.where(missing, 0.0, values - offset) if has_missing else values - offset, out=sums[1:])
+    counts = np.concatenate(([0], np.cumsum(missing))) if has_missing else None
+
+    means = {}
+    for window in windows:
+        out = np.full(n, np.nan)
+        if n >= window:
+            window_means = (sums[window:] - sums[:-window]) / window + offset
+            if counts is not None:
+                window_means[counts[window:] - counts[:-window] > 0] = np.nan
+            out[window - 1:] = window_means
+        means[window] = out
+    return means
+
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    return _rolling_means(values, (window,))[window]
+
+
+def _rolling_std(values: np.ndarray, window: int, ddof: int, mean: Optional[np.ndarray] = None) -> np.ndarray:
+    """Rolling std from deviations around the window mean (no cancellation between large sums)"""
+    out = np.full(len(values), np.nan)
+    if len(values) < window:
+        return out
+    mean = _rolling_mean(values, window) if mean is None else mean
+    deviations = sliding_window_view(values, window) - mean[window - 1:, None]
+    out[window - 1:] = np.sqrt(np.einsum("ij,ij->i", deviations, deviations) / (window - ddof))
+    return out
+
+
+def _ema(values: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    EMA seeded with the first non-NaN value (pandas ewm(alpha, adjust=False))
+
+    y[t] = (1 - a) y[t-1] + a x[t] is solved without a Python loop: the series
+    is cut into blocks short enough that (1 - a)^-k stays well inside float64
+    precision, each block is a closed-form cumulative sum, and block carries
+    decay by (1 - a)^block <= e^-8, so only a few previous blocks contribute.
+    """
+    out = np.full(len(values), np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if not len(valid):
+        return out
+    start = valid[0]
+    x = values[start:]
+    m = len(x)
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        out[start:] = x
+        return out
+
+    # y[t] = a * sum (1 - a)^(t-k) u[k], u[0] = x0 / a (시드), u[k] = x[k]
+    block = max(1, min(m, int(8.0 / -np.log(decay))))
+    blocks = -(-m // block)
+    powers = decay ** np.arange(block)
+    filtered = np.zeros(blocks * block)
+    filtered[:m] = x
+    filtered[0] /= alpha
+    rows = filtered.reshape(blocks, block)
+    rows *= 1.0 / powers
+    np.cumsum(rows, axis=1, out=rows)
+    rows *= powers
+
+    # 블록 끝 값 carry[b] = total[b] + D * carry[b-1] - D^k가 무시할 만해질 때까지만 전개
+    totals = rows[:, -1].copy()
+    carry = totals.copy()
+    block_decay = decay ** block
+    weight, k = block_decay, 1
+    while weight > 1e-18 and k < blocks:
+        carry[k:] += weight * totals[:-k]
+        weight *= block_decay
+        k += 1
+    rows[1:] += carry[:-1, None] * (decay * powers)
+
+    out[start:] = filtered[:m]
+    out[start:] *= alpha
+    return out
+
+
+def _rsi(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    # 하락이 없으면 100
+    return np.where((avg_loss == 0) & ~np.isnan(avg_gain), 100.0, rsi)
+
+
+def compute_features(
+    close: np.ndarray,
+    volume: Optional[np.ndarray] = None,
+    ts: Optional[np.ndarray] = None
+) -> FeatureMatrix:
+    """
+    Compute the full feature matrix for a price series
+
+    Args:
+        close: Close prices (oldest first)
+        volume: Volumes (NaN allowed); volume features are NaN when omitted
+        ts: Optional bar timestamps kept alongside the rows
+
+    Returns:
+        FeatureMatrix with one row per bar
+    """
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.full(len(close), np.nan) if volume is None else np.asarray(volume, dtype=np.float64)
+    values, _ = _compute(close, volume)
+    return FeatureMatrix(values, ts)
+
+
+def _compute(close: np.ndarray, volume: np.ndarray) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Feature values plus the EMA series the incremental state is rebuilt from"""
+    n = len(close)
+    values = np.full((n, len(FEATURE_NAMES)), np.nan)
+    if n == 0:
+        return values, {}
+
+    def put(name: str, column: np.ndarray) -> None:
+        values[:, FEATURE_INDEX[name]] = column
+
+    previous = np.concatenate(([np.nan], close[:-1]))
+    returns = close / previous - 1.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_returns = np.log(close / previous)
+    put("close", close)
+    put("return_1", returns)
+    put("log_return_1", log_returns)
+
+    for window, mean in _rolling_means(close, MA_WINDOWS).items():
+        put(f"ma_{window}", mean)
+
+    ema_fast = _ema(close, 2.0 / (EMA_FAST + 1))
+    ema_slow = _ema(close, 2.0 / (EMA_SLOW + 1))
+    macd = ema_fast - ema_slow
+    macd_signal = _ema(macd, 2.0 / (MACD_SIGNAL + 1))
+    put(f"ema_{EMA_FAST}", ema_fast)
+    put(f"ema_{EMA_SLOW}", ema_slow)
+    put("macd", macd)
+    put("macd_signal", macd_signal)
+    put("macd_hist", macd - macd_signal)
+
+    change = close - previous
+    alpha = 1.0 / RSI_WINDOW
+    avg_gain = _ema(np.where(np.isnan(change), np.nan, np.maximum(change, 0.0)), alpha)
+    avg_loss = _ema(np.where(np.isnan(change), np.nan, np.maximum(-change, 0.0)), alpha)
+    rsi = _rsi(avg_gain, avg_loss)
+    # 변화량 RSI_WINDOW개가 쌓이기 전까지 NaN
+    rsi[:RSI_WINDOW] = np.nan
+    put(f"rsi_{RSI_WINDOW}", rsi)
+
+    mid = values[:, FEATURE_INDEX[f"ma_{BB_WINDOW}"]] if BB_WINDOW in MA_WINDOWS else _rolling_mean(close, BB_WINDOW)
+    band = BB_STDS * _rolling_std(close, BB_WINDOW, ddof=0, mean=mid)
+    upper, lower = mid + band, mid - band
+    with np.errstate(divide="ignore", invalid="ignore"):
+        put(f"bb_pct_b_{BB_WINDOW}", np.where(upper > lower, (close - lower) / (upper - lower), np.nan))
+        put(f"bb_width_{BB_WINDOW}", (upper - lower) / mid)
+    put(f"bb_upper_{BB_WINDOW}", upper)
+    put(f"bb_lower_{BB_WINDOW}", lower)
+
+    put(f"volatility_{VOLATILITY_WINDOW}", _rolling_std(returns, VOLATILITY_WINDOW, ddof=1))
+
+    volume_ma = _rolling_mean(volume, VOLUME_WINDOW)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        put(f"volume_ratio_{VOLUME_WINDOW}", np.where(volume_ma > 0, volume / volume_ma, np.nan))
+    put(f"volume_ma_{VOLUME_WINDOW}", volume_ma)
+
+    ema_series = {
+        "ema_fast": ema_fast,
+        "ema_slow": ema_slow,
+        "macd_signal": macd_signal,
+        "avg_gain": avg_gain,
+        "avg_loss": avg_loss,
+        "returns": returns,
+    }
+    return values, ema_series
+
+
+# ---------------------------------------------------------------------------
+# Incremental computation
+# ---------------------------------------------------------------------------
+
+class _RollingWindow:
+    """Last `window` values with a running sum (NaN-aware)"""
+
+    # 누적 오차를 막기 위해 이 횟수마다 합계를 버퍼에서 다시 계산
+    RESYNC_EVERY = 4096
+
+    def __init__(self, window: int):
+        self.window = window
+        self.buffer = np.full(window, np.nan)
+        self.pos = 0
+        self.count = 0
+        self.total = 0.0
+        self.missing = 0
+        self.pushes = 0
+
+    def push(self, value: float) -> None:
+        if self.count == self.window:
+            old = self.buffer[self.pos]
+            if np.isnan(old):
+                self.missing -= 1
+            else:
+                self.total -= old
+        else:
+            self.count += 1
+        self.buffer[self.pos] = value
+        self.pos = (self.pos + 1) % self.window
+        if np.isnan(value):
+            self.missing += 1
+        else:
+            self.total += value
+
+        self.pushes += 1
+        if self.pushes % self.RESYNC_EVERY == 0:
+            self.total = float(np.nansum(self.buffer[:self.count]))
+
+    def clone(self) -> "_RollingWindow":
+        other = copy.copy(self)
+        other.buffer = self.buffer.copy()
+        return other
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.window and self.missing == 0
+
+    def mean(self) -> float:
+        return self.total / self.window if self.full else np.nan
+
+    def std(self, ddof: int) -> float:
+        # window 크기 고정 → 히스토리 길이와 무관한 상수 비용
+        return float(self.buffer.std(ddof=ddof)) if self.full else np.nan
+
+
+class _Ema:
+    def __init__(self, alpha: float, min_periods: int = 0):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value = np.nan
+        self.count = 0
+
+    def clone(self) -> "_Ema":
+        return copy.copy(self)
+
+    def restore(self, value: float, count: int) -> None:
+        self.value = value
+        self.count = count
+
+    def push(self, value: float) -> float:
+        if np.isnan(value):
+            return self.current()
+        self.value = value if self.count == 0 else self.value + self.alpha * (value - self.value)
+        self.count += 1
+        return self.current()
+
+    def current(self) -> float:
+        return self.value if self.count >= max(1, self.min_periods) else np.nan
+
+
+class FeatureState:
+    """
+    Indicator state after the last bar - `update()` returns the next feature
+    row in O(max window) time, however long the history is
+    """
+
+    def __init__(self):
+        self.previous_close = np.nan
+        self.ma = {window: _RollingWindow(window) for window in MA_WINDOWS}
+        self.bb = self.ma[BB_WINDOW] if BB_WINDOW in MA_WINDOWS else _RollingWindow(BB_WINDOW)
+        self.returns = _RollingWindow(VOLATILITY_WINDOW)
+        self.volume = _RollingWindow(VOLUME_WINDOW)
+        self.ema_fast = _Ema(2.0 / (EMA_FAST + 1))
+        self.ema_slow = _Ema(2.0 / (EMA_SLOW + 1))
+        self.macd_signal = _Ema(2.0 / (MACD_SIGNAL + 1))
+        self.avg_gain = _Ema(1.0 / RSI_WINDOW, RSI_WINDOW)
+        self.avg_loss = _Ema(1.0 / RSI_WINDOW, RSI_WINDOW)
+
+    def clone(self) -> "FeatureState":
+        """Snapshot (copies only window buffers and scalars)"""
+        other = copy.copy(self)
+        other.ma = {window: rolling.clone() for window, rolling in self.ma.items()}
+        other.bb = other.ma[BB_WINDOW] if BB_WINDOW in MA_WINDOWS else self.bb.clone()
+        other.returns = self.returns.clone()
+        other.volume = self.volume.clone()
+        for name in ("ema_fast", "ema_slow", "macd_signal", "avg_gain", "avg_loss"):
+            setattr(other, name, getattr(self, name).clone())
+        return other
+
+    @classmethod
+    def at(cls, close: np.ndarray, volume: np.ndarray, series: Dict[str, np.ndarray], i: int) -> "FeatureState":
+        """State after bar `i`, rebuilt from batch results (constant work: window tails + last EMA values)"""
+        state = cls()
+        if i < 0:
+            return state
+        state.previous_close = close[i]
+        for rolling in {id(w): w for w in (*state.ma.values(), state.bb)}.values():
+            for value in close[max(0, i + 1 - rolling.window):i + 1]:
+                rolling.push(value)
+        for value in series["returns"][max(0, i + 1 - state.returns.window):i + 1]:
+            state.returns.push(value)
+        for value in volume[max(0, i + 1 - state.volume.window):i + 1]:
+            state.volume.push(value)
+
+        # 유효 입력 개수 = EMA 계산에 쓰인 값 수 (close는 NaN 없음, 변화량은 두 번째 바부터)
+        state.ema_fast.restore(series["ema_fast"][i], i + 1)
+        state.ema_slow.restore(series["ema_slow"][i], i + 1)
+        state.macd_signal.restore(series["macd_signal"][i], i + 1)
+        state.avg_gain.restore(series["avg_gain"][i], i)
+        state.avg_loss.restore(series["avg_loss"][i], i)
+        return state
+
+    def update(self, close: float, volume: float = np.nan) -> np.ndarray:
+        row = np.full(len(FEATURE_NAMES), np.nan)
+
+        def put(name: str, value: float) -> None:
+            row[FEATURE_INDEX[name]] = value
+
+        previous = self.previous_close
+        self.previous_close = close
+        ret = close / previous - 1.0 if not np.isnan(previous) else np.nan
+        put("close", close)
+        put("return_1", ret)
+        put("log_return_1", np.log(close / previous) if not np.isnan(previous) and previous > 0 and close > 0 else np.nan)
+
+        for window, rolling in self.ma.items():
+            rolling.push(close)
+            put(f"ma_{window}", rolling.mean())
+        if self.bb is not self.ma.get(BB_WINDOW):
+            self.bb.push(close)
+
+        ema_fast = self.ema_fast.push(close)
+        ema_slow = self.ema_slow.push(close)
+        macd = ema_fast - ema_slow
+        macd_signal = self.macd_signal.push(macd)
+        put(f"ema_{EMA_FAST}", ema_fast)
+        put(f"ema_{EMA_SLOW}", ema_slow)
+        put("macd", macd)
+        put("macd_signal", macd_signal)
+        put("macd_hist", macd - macd_signal)
+
+        change = close - previous
+        avg_gain = self.avg_gain.push(max(change, 0.0) if not np.isnan(change) else np.nan)
+        avg_loss = self.avg_loss.push(max(-change, 0.0) if not np.isnan(change) else np.nan)
+        put(f"rsi_{RSI_WINDOW}", float(_rsi(np.float64(avg_gain), np.float64(avg_loss))))
+
+        mid = self.bb.mean()
+        band = BB_STDS * self.bb.std(ddof=0)
+        upper, lower = mid + band, mid - band
+        put(f"bb_upper_{BB_WINDOW}", upper)
+        put(f"bb_lower_{BB_WINDOW}", lower)
+        put(f"bb_pct_b_{BB_WINDOW}", (close - lower) / (upper - lower) if upper > lower else np.nan)
+        put(f"bb_width_{BB_WINDOW}", (upper - lower) / mid if mid else np.nan)
+
+        self.returns.push(ret)
+        put(f"volatility_{VOLATILITY_WINDOW}", self.returns.std(ddof=1))
+
+        self.volume.push(volume)
+        volume_ma = self.volume.mean()
+        put(f"volume_ma_{VOLUME_WINDOW}", volume_ma)
+        put(f"volume_ratio_{VOLUME_WINDOW}", volume / volume_ma if volume_ma > 0 else np.nan)
+        return row
+
+
+class FeatureEngine:
+    """
+    Feature matrix for one symbol/interval that grows bar by bar
+
+    `sync()` accepts the full (refetched) history every time and only does
+    work for bars newer than the last one seen; a revised last bar (live
+    intraday bar) is recomputed from the state saved before it.
+
+    Args:
+        capacity: Initial row capacity (doubles as needed)
+    """
+
+    def __init__(self, capacity: int = 512):
+        self._values = np.full((capacity, len(FEATURE_NAMES)), np.nan)
+        self._ts = np.zeros(capacity, dtype=np.int64)
+        self._inputs = np.full((capacity, 2), np.nan)  # close, volume
+        self._size = 0
+        self._state = FeatureState()
+        self._state_before_last: Optional[FeatureState] = None
+        self.appended = 0
+        self.rebuilds = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self) -> None:
+        capacity = len(self._values) * 2
+        self._values = np.concatenate((self._values, np.full_like(self._values, np.nan)))[:capacity]
+        self._ts = np.concatenate((self._ts, np.zeros_like(self._ts)))[:capacity]
+        self._inputs = np.concatenate((self._inputs, np.full_like(self._inputs, np.nan)))[:capacity]
+
+    def append(self, ts: int, close: float, volume: float = np.nan) -> np.ndarray:
+        """Add a bar after the last one; returns its feature row"""
+        if self._size == len(self._values):
+            self._grow()
+        # 마지막 바 수정(replace_last)에 대비해 직전 상태 보관 - window 크기만큼만 복사
+        self._state_before_last = self._state.clone()
+        row = self._state.update(close, volume)
+        self._values[self._size] = row
+        self._ts[self._size] = ts
+        self._inputs[self._size] = (close, volume)
+        self._size += 1
+        self.appended += 1
+        return row
+
+    def replace_last(self, close: float, volume: float = np.nan) -> np.ndarray:
+        """Recompute the last bar with revised values"""
+        if self._state_before_last is None:
+            raise ValueError("No bar to replace")
+        self._state = self._state_before_last.clone()
+        row = self._state.update(close, volume)
+        self._values[self._size - 1] = row
+        self._inputs[self._size - 1] = (close, volume)
+        return row
+
+    def rebuild(self, ts: np.ndarray, close: np.ndarray, volume: Optional[np.ndarray] = None) -> None:
+        """Replace everything with a vectorized batch computation"""
+        close = np.asarray(close, dtype=np.float64)
+        volume = np.full(len(close), np.nan) if volume is None else np.asarray(volume, dtype=np.float64)
+        n = len(close)
+        capacity = max(512, 1 << int(n).bit_length())
+        self._values = np.full((capacity, len(FEATURE_NAMES)), np.nan)
+        self._ts = np.zeros(capacity, dtype=np.int64)
+        self._inputs = np.full((capacity, 2), np.nan)
+        self._size = 0
+        self._state = FeatureState()
+        self._state_before_last = None
+        self.rebuilds += 1
+        if n == 0:
+            return
+
+        values, series = _compute(close, volume)
+        self._values[:n] = values
+        self._ts[:n] = np.asarray(ts, dtype=np.int64)
+        self._inputs[:n, 0] = close
+        self._inputs[:n, 1] = volume
+        self._size = n
+        # 증분 상태는 벡터 계산 결과에서 복원 (전체 구간을 순차 재생하지 않음)
+        self._state = FeatureState.at(close, volume, series, n - 1)
+        self._state_before_last = FeatureState.at(close, volume, series, n - 2)
+
+    def sync(self, ts: np.ndarray, close: np.ndarray, volume: Optional[np.ndarray] = None) -> FeatureMatrix:
+        """
+        Bring the engine up to date with a history and return its rows
+
+        Args:
+            ts: Bar timestamps (int64 ns, ascending)
+            close: Close prices
+            volume: Volumes (optional)
+
+        Returns:
+            FeatureMatrix aligned with `ts`
+        """
+        ts = np.asarray(ts, dtype=np.int64)
+        close = np.asarray(close, dtype=np.float64)
+        volume = np.full(len(close), np.nan) if volume is None else np.asarray(volume, dtype=np.float64)
+        n = len(ts)
+
+        if self._size == 0 or n == 0:
+            self.rebuild(ts, close, volume)
+            return self.matrix(n)
+
+        last_ts = self._ts[self._size - 1]
+        position = int(np.searchsorted(ts, last_ts))
+        overlap = position + 1
+        if position >= n or ts[position] != last_ts or not self._matches(ts[:overlap], close[:position], volume[:position]):
+            # 이어지지 않는 히스토리 (중간 바 누락, 더 오래된 구간, 배당/분할로 조정된 과거 가격 등) → 전체 재계산
+            self.rebuild(ts, close, volume)
+            return self.matrix(n)
+
+        previous_close, previous_volume = self._inputs[self._size - 1]
+        if close[position] != previous_close or not _same(volume[position], previous_volume):
+            self.replace_last(close[position], volume[position])
+        for i in range(position + 1, n):
+            self.append(int(ts[i]), close[i], volume[i])
+        return self.matrix(n)
+
+    def _matches(self, ts: np.ndarray, close: np.ndarray, volume: np.ndarray) -> bool:
+        """
+        True if the engine's last rows hold exactly these bars
+
+        `ts` covers the overlap including the last stored bar; `close`/`volume`
+        exclude it (the last bar may be revised in place by replace_last()).
+        """
+        overlap = len(ts)
+        if overlap > self._size:
+            return False
+        start = self._size - overlap
+        stored = self._inputs[start:self._size - 1]
+        return (
+            np.array_equal(self._ts[start:self._size], ts)
+            and np.array_equal(stored[:, 0], close, equal_nan=True)
+            and np.array_equal(stored[:, 1], volume, equal_nan=True)
+        )
+
+    def matrix(self, n: Optional[int] = None) -> FeatureMatrix:
+        """Latest `n` rows (all rows by default) as views"""
+        n = self._size if n is None else min(n, self._size)
+        start = self._size - n
+        return FeatureMatrix(self._values[start:self._size], self._ts[start:self._size])
+
+
+def _same(a: float, b: float) -> bool:
+    return a == b or (np.isnan(a) and np.isnan(b))
+
+
+_engines: "OrderedDict[Tuple[str, str], FeatureEngine]" = OrderedDict()
+_engines_guard = threading.Lock()
+_engine_locks: Dict[Tuple[str, str], threading.Lock] = {}
+MAX_ENGINES = 256
+
+
+def get_features(
+    symbol: str,
+    interval: str,
+    ts: np.ndarray,
+    close: np.ndarray,
+    volume: Optional[np.ndarray] = None
+) -> FeatureMatrix:
+    """
+    Feature matrix for a symbol's history, reusing the process-wide engine so
+    a refetched history with one new bar costs one incremental update
+
+    Returns:
+        A copy aligned with `ts` (safe to keep after later updates)
+    """
+    key = (symbol.strip().upper(), interval)
+    with _engines_guard:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = FeatureEngine()
+            _engines[key] = engine
+            _engine_locks[key] = threading.Lock()
+            while len(_engines) > MAX_ENGINES:
+                evicted, _ = _engines.popitem(last=False)
+                _engine_locks.pop(evicted, None)
+        _engines.move_to_end(key)
+        lock = _engine_locks[key]
+    with lock:
+        matrix = engine.sync(ts, close, volume)
+        return FeatureMatrix(matrix.values.copy(), matrix.ts.copy())
+
+
+def get_feature_stats() -> Dict[str, Any]:
+    with _engines_guard:
+        engines = list(_engines.values())
+    return {
+        "engines": len(engines),
+        "bars": sum(len(engine) for engine in engines),
+        "appended": sum(engine.appended for engine in engines),
+        "rebuilds": sum(engine.rebuilds for engine in engines),
+    }
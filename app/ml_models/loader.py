@@ -1,20 +1,33 @@
 """
 Model loader for loading pre-trained ML models
 """
-import os
-import pickle
-from typing import Optional, Any
-from pathlib import Path
+from typing import Optional, Any, Dict
+
+import numpy as np
+
 from app.core.config import settings
+from app.ml_models.registry import ModelRegistry, get_model_registry
 
 
 class ModelLoader:
-    """Loader for ML models"""
+    """
+    Loader for ML models
+    
+    Backed by the process-wide ModelRegistry, so models loaded by one request
+    are reused by every later request (and reloaded when their file changes).
+    """
     
     def __init__(self, model_dir: Optional[str] = None):
-        self.model_dir = Path(model_dir or settings.ML_MODEL_PATH)
-        self.model_dir.mkdir(parents=True, exist_ok=True)
-        self._models: dict[str, Any] = {}
+        if model_dir is None or model_dir == settings.ML_MODEL_PATH:
+            self.registry = get_model_registry()
+        else:
+            # 별도 디렉토리 (학습 스크립트 등) - 공유 레지스트리와 분리
+            self.registry = ModelRegistry(
+                model_dir,
+                check_interval=settings.ML_MODEL_RELOAD_CHECK_SEC,
+                max_bytes=settings.ML_MODEL_CACHE_MB * 1024 * 1024,
+            )
+        self.model_dir = self.registry.model_dir
     
     def load_model(self, model_name: str) -> Optional[Any]:
         """
@@ -26,22 +39,7 @@ class ModelLoader:
         Returns:
             Loaded model object or None if not found
         """
-        if model_name in self._models:
-            return self._models[model_name]
-        
-        model_path = self.model_dir / f"{model_name}.pkl"
-        
-        if not model_path.exists():
-            return None
-        
-        try:
-            with open(model_path, 'rb') as f:
-                model = pickle.load(f)
-            self._models[model_name] = model
-            return model
-        except Exception as e:
-            print(f"Error loading model {model_name}: {e}")
-            return None
+        return self.registry.get(model_name)
     
     def save_model(self, model: Any, model_name: str) -> bool:
         """
@@ -54,20 +52,22 @@ class ModelLoader:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            model_path = self.model_dir / f"{model_name}.pkl"
-            with open(model_path, 'wb') as f:
-                pickle.dump(model, f)
-            self._models[model_name] = model
-            return True
-        except Exception as e:
-            print(f"Error saving model {model_name}: {e}")
-            return False
+        return self.registry.save(model, model_name)
+    
+    def save_weights(self, weights: Dict[str, np.ndarray], model_name: str, meta: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Save model weights as memory-mapped `.npy` files (shared across workers)
+        
+        Args:
+            weights: Tensor name -> array
+            model_name: Name to save the model as
+            meta: JSON-serializable architecture/hyperparameters
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        return self.registry.save_weights(model_name, weights, meta)
     
     def list_available_models(self) -> list[str]:
         """List all available model files"""
-        models = []
-        for file in self.model_dir.glob("*.pkl"):
-            models.append(file.stem)
-        return models
-
+        return self.registry.list_available()
@@ -2,89 +2,242 @@
 Stock prediction model based on research papers
 This is where you'll implement models from papers you read
 """
+import threading
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
+from app.core.config import settings
+from app.ml_models.features import FEATURE_INDEX, FeatureMatrix, get_features
 from app.ml_models.loader import ModelLoader
-from app.services.stock_service import StockService
+from app.services.market_data_service import MarketDataService
+
+DEFAULT_MODEL_NAME = "default_lstm"  # Change this to your preferred default model
 
 
 class StockPredictor:
     """
     Main predictor class for stock/crypto predictions
     Implement your paper-based models here
+    
+    Holds no per-request state - use get_stock_predictor() to share one
+    instance (and its loaded models) across requests.
     """
     
     def __init__(self):
         self.model_loader = ModelLoader()
-        self.stock_service = StockService()
     
-    def predict(
+    def prepare(
         self,
         symbol: str,
-        days_ahead: int = 1,
         model_name: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Generate prediction for a given symbol
+        Load the inputs of a prediction: history, features and model
+        
+        Also returns what the result depends on (`model_version`,
+        `last_bar_ts`), so callers can reuse an earlier result while neither
+        the model file nor the data has changed. History comes from the same
+        bar store path as predict_batch(), so a warm symbol costs at most one
+        tail request.
         
         Args:
             symbol: Stock or crypto symbol
-            days_ahead: Number of days to predict ahead
             model_name: Specific model to use (optional)
         
         Returns:
-            Dictionary with prediction results
+            Dictionary with df, features, model, model_name, model_version, last_bar_ts
         """
-        # Get historical data
         try:
-            data = self.stock_service.get_stock_data(symbol, period="1y", interval="1d")
-            history = data.get("history", [])
-            
-            if not history:
-                raise ValueError(f"No historical data available for {symbol}")
-            
-            # Convert to DataFrame
-            df = pd.DataFrame(history)
-            df['date'] = pd.to_datetime(df['date'])
-            df = df.sort_values('date')
+            # 배치 예측과 같은 경로 - 바 스토어 우선, 새 바만 꼬리 조회
+            frames, errors = MarketDataService.get_history_frames_batch([symbol], period="1y", interval="1d")
+            frame = next(iter(frames.values()), None)
+            inputs = self._frame_inputs(symbol.strip().upper(), frame) if frame is not None else None
+            if inputs is None:
+                raise ValueError(next(iter(errors.values()), f"No historical data available for {symbol}"))
+            df, ts, features = inputs
             
             # Use default model if none specified
             if model_name is None:
-                model_name = "default_lstm"  # Change this to your preferred default model
+                model_name = DEFAULT_MODEL_NAME
             
             # Load model or use simple prediction as fallback
             model = self.model_loader.load_model(model_name)
-            
+        except Exception as e:
+            raise ValueError(f"Prediction failed: {str(e)}")
+        
+        return {
+            "symbol": symbol,
+            "df": df,
+            "features": features,
+            "model": model,
+            "model_name": model_name if model is not None else "simple_ma",
+            # 파일 버전 (mtime_ns, size) - 모델 파일이 바뀌면 달라짐
+            "model_version": self.model_loader.registry.version(model_name) if model is not None else None,
+            # 마지막 바 (UTC ns) + 종가 - 새 바가 들어오거나 진행 중인 바가 갱신되면 달라짐
+            "last_bar_ts": int(ts[-1]),
+            "last_close": float(df['close'].iloc[-1]),
+        }
+    
+    def predict(
+        self,
+        symbol: str,
+        days_ahead: int = 1,
+        model_name: Optional[str] = None,
+        prepared: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate prediction for a given symbol
+        
+        Args:
+            symbol: Stock or crypto symbol
+            days_ahead: Number of days to predict ahead
+            model_name: Specific model to use (optional)
+            prepared: Inputs from prepare() (loaded here if omitted)
+        
+        Returns:
+            Dictionary with prediction results
+        """
+        if prepared is None:
+            prepared = self.prepare(symbol, model_name)
+        
+        try:
+            model = prepared["model"]
             if model is not None:
                 # Use loaded model for prediction
-                prediction = self._predict_with_model(model, df, days_ahead)
+                prediction = self._predict_with_model(model, prepared["df"], prepared["features"], days_ahead)
             else:
                 # Fallback to simple moving average prediction
-                prediction = self._simple_prediction(df, days_ahead)
+                prediction = self._simple_prediction(prepared["features"], days_ahead)
             
             return {
                 "symbol": symbol,
                 "predicted_price": float(prediction["price"]),
                 "confidence": float(prediction.get("confidence", 0.7)),
-                "model_name": model_name if model else "simple_ma",
+                "model_name": prepared["model_name"],
                 "days_ahead": days_ahead,
-                "current_price": float(df['close'].iloc[-1]),
+                "current_price": prepared["last_close"],
                 "prediction_date": (datetime.now() + timedelta(days=days_ahead)).isoformat()
             }
         except Exception as e:
             raise ValueError(f"Prediction failed: {str(e)}")
     
+    def predict_batch(
+        self,
+        symbols: List[str],
+        horizons: List[int],
+        model_name: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Predict every symbol × horizon with one bulk history fetch
+        
+        Histories come from the bar store / one yf.download() per chunk of
+        MARKET_DATA_BATCH_MAX_SYMBOLS symbols; the latest feature row of each
+        symbol is stacked into one matrix that _predict_batch_with_model() (or
+        the simple_ma fallback) scores in one call.
+        
+        Args:
+            symbols: Stock or crypto symbols
+            horizons: Days ahead to predict for each symbol
+            model_name: Specific model to use (optional)
+        
+        Returns:
+            {"predictions": [same fields as predict()], "errors": {symbol: reason}}
+        """
+        model_name = model_name or DEFAULT_MODEL_NAME
+        chunk_size = settings.MARKET_DATA_BATCH_MAX_SYMBOLS
+        
+        frames: Dict[str, pd.DataFrame] = {}
+        errors: Dict[str, str] = {}
+        for begin in range(0, len(symbols), chunk_size):
+            chunk_frames, chunk_errors = MarketDataService.get_history_frames_batch(
+                symbols[begin:begin + chunk_size], period="1y", interval="1d"
+            )
+            frames.update(chunk_frames)
+            errors.update(chunk_errors)
+        
+        scored: List[str] = []
+        inputs: List[Tuple[pd.DataFrame, FeatureMatrix]] = []
+        for symbol, frame in frames.items():
+            frame_inputs = self._frame_inputs(symbol, frame)
+            if frame_inputs is None:
+                errors[symbol] = f"No historical data available for {symbol}"
+                continue
+            df, _, features = frame_inputs
+            scored.append(symbol)
+            inputs.append((df, features))
+        
+        if not scored:
+            return {"predictions": [], "errors": errors}
+        
+        # 종목마다 horizon 수만큼 행 반복 (종목 × horizon 순서)
+        matrix = np.repeat(np.vstack([features.values[-1] for _, features in inputs]), len(horizons), axis=0)
+        days_ahead = np.tile(np.asarray(horizons, dtype=np.int64), len(scored))
+        model = self.model_loader.load_model(model_name)
+        if model is not None:
+            rows = [pair for pair in inputs for _ in horizons]
+            prices, confidences = self._predict_batch_with_model(model, matrix, days_ahead, rows)
+        else:
+            prices, confidences = self._simple_prediction_batch(matrix, days_ahead)
+        
+        now = datetime.now()
+        current_prices = matrix[:, FEATURE_INDEX["close"]]
+        predictions = []
+        for i, symbol in enumerate(np.repeat(scored, len(horizons))):
+            days = int(days_ahead[i])
+            predictions.append({
+                "symbol": str(symbol),
+                "predicted_price": float(prices[i]),
+                "confidence": float(confidences[i]),
+                "model_name": model_name if model is not None else "simple_ma",
+                "days_ahead": days,
+                "current_price": float(current_prices[i]),
+                "prediction_date": (now + timedelta(days=days)).isoformat()
+            })
+        return {"predictions": predictions, "errors": errors}
+    
+    def _frame_inputs(
+        self,
+        symbol: str,
+        frame: pd.DataFrame
+    ) -> Optional[Tuple[pd.DataFrame, np.ndarray, FeatureMatrix]]:
+        """
+        Turn an OHLCV frame from get_history_frames_batch() into model inputs
+        
+        Returns:
+            (df with date/open/high/low/close/volume columns, bar timestamps
+            in UTC ns, features), or None if the frame has no closes
+        """
+        frame = frame.dropna(subset=['Close'])
+        if frame.empty:
+            return None
+        
+        # 1년 히스토리는 DST로 UTC offset이 섞이므로 UTC로 통일
+        index = pd.DatetimeIndex(frame.index)
+        index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+        df = frame.rename(columns=str.lower).reset_index(drop=True)
+        df.insert(0, 'date', index)
+        
+        # 공통 피처 (종목별 엔진에 캐시 - 새 바만 증분 계산)
+        ts = index.as_unit("ns").asi8
+        volume = df['volume'].to_numpy(dtype=np.float64) if 'volume' in df else None
+        features = get_features(symbol, "1d", ts, df['close'].to_numpy(dtype=np.float64), volume)
+        return df, ts, features
+    
     def _predict_with_model(
         self,
         model: Any,
         df: pd.DataFrame,
+        features: FeatureMatrix,
         days_ahead: int
     ) -> Dict[str, float]:
         """
         Predict using a loaded ML model
         
+        `features` holds the standard indicator matrix (one row per row of df,
+        columns in app.ml_models.features.FEATURE_NAMES) - use it instead of
+        recomputing indicators with pandas.
+        
         TODO: Implement your paper-based model logic here
         This is a placeholder - replace with your actual model implementation
         """
@@ -96,30 +249,71 @@ class StockPredictor:
             "confidence": 0.75
         }
     
+    def _predict_batch_with_model(
+        self,
+        model: Any,
+        features: np.ndarray,
+        days_ahead: np.ndarray,
+        inputs: List[Tuple[pd.DataFrame, FeatureMatrix]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predict a whole batch with a loaded ML model
+        
+        `features` is (rows × FEATURE_NAMES) - the latest feature row of each
+        symbol, repeated once per horizon in `days_ahead`; `inputs` holds the
+        (df, features) of each row's symbol.
+        
+        Calls _predict_with_model() row by row - override with one vectorized
+        call over `features` once the model supports it.
+        
+        Returns:
+            (predicted prices, confidences), one per row
+        """
+        results = [
+            self._predict_with_model(model, df, symbol_features, int(days))
+            for (df, symbol_features), days in zip(inputs, days_ahead)
+        ]
+        prices = np.array([result["price"] for result in results], dtype=np.float64)
+        confidences = np.array([result.get("confidence", 0.7) for result in results], dtype=np.float64)
+        return prices, confidences
+    
     def _simple_prediction(
         self,
-        df: pd.DataFrame,
+        features: FeatureMatrix,
         days_ahead: int
     ) -> Dict[str, float]:
         """
         Simple moving average based prediction (fallback)
         """
-        # Calculate moving averages
-        ma_short = df['close'].rolling(window=5).mean().iloc[-1]
-        ma_long = df['close'].rolling(window=20).mean().iloc[-1]
-        last_price = df['close'].iloc[-1]
+        prices, confidences = self._simple_prediction_batch(features.values[-1:], np.array([days_ahead]))
+        return {
+            "price": float(prices[0]),
+            "confidence": float(confidences[0])
+        }
+    
+    def _simple_prediction_batch(
+        self,
+        features: np.ndarray,
+        days_ahead: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Simple moving average based prediction for many rows at once (fallback)
+        """
+        # 피처 엔진의 이동평균 사용
+        ma_short = features[:, FEATURE_INDEX["ma_5"]]
+        ma_long = features[:, FEATURE_INDEX["ma_20"]]
+        last_price = features[:, FEATURE_INDEX["close"]]
         
-        # Simple trend-based prediction
-        trend = (ma_short - ma_long) / ma_long
+        # Simple trend-based prediction (20일 미만 데이터면 추세 0)
+        valid = np.isfinite(ma_long) & (ma_long != 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            trend = np.where(valid, (ma_short - ma_long) / ma_long, 0.0)
         predicted_price = last_price * (1 + trend * days_ahead * 0.1)
         
         # Confidence based on trend strength
-        confidence = min(0.8, 0.5 + abs(trend) * 2)
+        confidence = np.minimum(0.8, 0.5 + np.abs(trend) * 2)
         
-        return {
-            "price": float(predicted_price),
-            "confidence": float(confidence)
-        }
+        return predicted_price, confidence
     
     def train_model(
         self,
@@ -134,8 +328,21 @@ class StockPredictor:
         """
         # Placeholder - implement your training logic here
         print(f"Training model: {model_name}")
-        # Example: model = YourModelClass(**kwargs)
-        # model.train(training_data)
+        # Example: features = compute_features(training_data['close'], training_data['volume'])
+        # model = YourModelClass(**kwargs)
+        # model.train(features.values[50:], ...)  # 앞쪽 warm-up(NaN) 구간 제외
         # self.model_loader.save_model(model, model_name)
         return True
 
+
+_stock_predictor: Optional[StockPredictor] = None
+_stock_predictor_guard = threading.Lock()
+
+
+def get_stock_predictor() -> StockPredictor:
+    """Return the process-wide predictor"""
+    global _stock_predictor
+    with _stock_predictor_guard:
+        if _stock_predictor is None:
+            _stock_predictor = StockPredictor()
+        return _stock_predictor
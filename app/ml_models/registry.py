@@ -0,0 +1,381 @@
+"""
+Process-wide model registry
+
+Models are loaded once per process and shared by every request (and every
+thread). The registry
+
+    - warms up all models in ML_MODEL_PATH at startup (ML_MODEL_WARMUP)
+    - hot-reloads a model when its file changes (mtime/size checked at most
+      every ML_MODEL_RELOAD_CHECK_SEC per model), keeping the previous version
+      if the new file cannot be loaded
+    - loads each model at most once even when many requests ask for it at the
+      same time (per-model load lock)
+    - keeps loaded models within ML_MODEL_CACHE_MB, evicting the least
+      recently used ones
+
+Model formats in ML_MODEL_PATH (a weights directory wins over a pickle):
+
+    <name>.weights/     one `<tensor>.npy` per weight + optional meta.json;
+                        tensors are memory-mapped read-only at load time,
+                        so all workers share the OS page cache and only
+                        touched pages are resident
+    <name>.pkl          pickled object, read fully into private memory
+
+Only private (pickled) bytes count against the budget; mapped weights are
+page cache the OS can drop and re-read at any time.
+"""
+import json
+import os
+import pickle
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from app.core.config import settings
+except ImportError:
+    settings = None
+
+# (mtime_ns, size) - 파일이 바뀌었는지 판단하는 버전
+ModelVersion = Tuple[int, int]
+
+WEIGHTS_SUFFIX = ".weights"
+WEIGHTS_META = "meta.json"
+
+
+class MappedWeights(Mapping):
+    """
+    Read-only tensors memory-mapped from a `<name>.weights/` directory
+
+    Every `<tensor>.npy` is mapped when the object is created (pages are
+    still read only when touched), so one object always holds a single
+    version even if save_weights() swaps the directory later. `meta` holds
+    meta.json (architecture/hyperparameters), if present.
+    """
+
+    # 여는 도중 디렉토리가 교체되면 다시 여는 횟수
+    OPEN_ATTEMPTS = 3
+
+    def __init__(self, path: Path):
+        self.path = path
+        for _ in range(self.OPEN_ATTEMPTS):
+            inode = path.stat().st_ino
+            arrays = {
+                file.stem: np.load(file, mmap_mode="r", allow_pickle=False)
+                for file in sorted(path.glob("*.npy"))
+            }
+            meta_path = path / WEIGHTS_META
+            meta = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else {}
+            # save_weights()는 디렉토리를 통째로 교체 → inode가 같으면 한 버전만 읽은 것
+            if path.stat().st_ino == inode:
+                break
+        else:
+            raise RuntimeError(f"Weights directory kept changing while loading: {path}")
+        self._arrays: Dict[str, np.ndarray] = arrays
+        self.meta: Dict[str, Any] = meta
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self._arrays[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._arrays)
+
+    def __len__(self) -> int:
+        return len(self._arrays)
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the mapped tensors (page cache, not private memory)"""
+        return sum(array.nbytes for array in self._arrays.values())
+
+
+class ModelRegistry:
+    """
+    Thread-safe cache of loaded models keyed by name (file stem)
+
+    Args:
+        model_dir: Directory holding `<name>.weights/` directories and `<name>.pkl` files
+        check_interval: Minimum seconds between file checks for one model
+        max_bytes: Budget for private (unpickled) model memory
+    """
+
+    def __init__(self, model_dir: str, check_interval: float = 2.0, max_bytes: int = 1024 * 1024 * 1024):
+        self.model_dir = Path(model_dir)
+        self.model_dir.mkdir(parents=True, exist_ok=True)
+        self.check_interval = check_interval
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        # name -> {"model", "version", "format", "nbytes", "mapped_bytes", "loaded_at", "checked_at"[, "missing_at"]} (LRU 순서)
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._private_bytes = 0
+
+        self._hits = 0
+        self._loads = 0
+        self._reloads = 0
+        self._evictions = 0
+        self._failures = 0
+
+    def _path(self, name: str) -> Path:
+        return self.model_dir / f"{name}.pkl"
+
+    def _weights_path(self, name: str) -> Path:
+        return self.model_dir / f"{name}{WEIGHTS_SUFFIX}"
+
+    def _load_lock(self, name: str) -> threading.Lock:
+        with self._lock:
+            if name not in self._load_locks:
+                self._load_locks[name] = threading.Lock()
+            return self._load_locks[name]
+
+    def _file_version(self, name: str) -> Optional[ModelVersion]:
+        weights_path = self._weights_path(name)
+        if weights_path.is_dir():
+            stats = [file.stat() for file in weights_path.iterdir() if file.is_file()]
+            if stats:
+                return max(stat.st_mtime_ns for stat in stats), sum(stat.st_size for stat in stats)
+        try:
+            stat = self._path(name).stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _store(self, name: str, model: Any, version: ModelVersion) -> None:
+        """Register a loaded model as most recently used and evict over budget (lock held)"""
+        old = self._entries.pop(name, None)
+        if old is not None:
+            self._private_bytes -= old["nbytes"]
+        if isinstance(model, MappedWeights):
+            fmt, nbytes, mapped_bytes = "weights", 0, model.nbytes
+        else:
+            # pickle 크기 ≈ 역직렬화된 객체 크기 (가중치 배열이 대부분인 모델 기준 추정치)
+            fmt, nbytes, mapped_bytes = "pickle", version[1], 0
+        self._entries[name] = {
+            "model": model,
+            "version": version,
+            "format": fmt,
+            "nbytes": nbytes,
+            "mapped_bytes": mapped_bytes,
+            "loaded_at": time.time(),
+            "checked_at": time.monotonic(),
+        }
+        self._private_bytes += nbytes
+
+        while self._private_bytes > self.max_bytes and len(self._entries) > 1:
+            evicted_name, evicted = next(iter(self._entries.items()))
+            if evicted_name == name:
+                break
+            del self._entries[evicted_name]
+            self._private_bytes -= evicted["nbytes"]
+            self._evictions += 1
+            print(f"[MODELS] Evicted {evicted_name} ({evicted['nbytes'] / 1024 / 1024:.1f}MB, least recently used)")
+
+    def get(self, name: str) -> Optional[Any]:
+        """
+        Return the loaded model, loading or reloading it if its file changed
+
+        A loaded model whose file is missing is kept until the next check, so
+        another worker swapping in new weights does not unload it.
+
+        Returns:
+            Model object (MappedWeights for a weights directory), or None if no
+            model file exists (or it never loaded)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and now - entry["checked_at"] < self.check_interval:
+                self._entries.move_to_end(name)
+                self._hits += 1
+                return entry["model"]
+
+        version = self._file_version(name)
+        if version is None:
+            with self._lock:
+                entry = self._entries.get(name)
+                if entry is not None and "missing_at" not in entry:
+                    # save_weights()의 디렉터리 교체 중일 수 있음 → 다음 확인까지 기존 모델 유지
+                    entry["missing_at"] = entry["checked_at"] = now
+                    return entry["model"]
+                removed = self._entries.pop(name, None)
+                if removed is not None:
+                    self._private_bytes -= removed["nbytes"]
+                    print(f"[MODELS] Model file removed, unloaded: {name}")
+            return None
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry["version"] == version:
+                entry.pop("missing_at", None)
+                entry["checked_at"] = now
+                self._entries.move_to_end(name)
+                self._hits += 1
+                return entry["model"]
+
+        return self._load(name, version)
+
+    def _load(self, name: str, version: ModelVersion) -> Optional[Any]:
+        """Load (map or unpickle) a model once, even with concurrent callers"""
+        with self._load_lock(name):
+            with self._lock:
+                entry = self._entries.get(name)
+                if entry is not None and entry["version"] == version:
+                    # 다른 요청이 먼저 로드함
+                    return entry["model"]
+                previous = entry
+
+            start = time.perf_counter()
+            try:
+                weights_path = self._weights_path(name)
+                if weights_path.is_dir():
+                    model = MappedWeights(weights_path)
+                else:
+                    with open(self._path(name), "rb") as f:
+                        model = pickle.load(f)
+            except Exception as e:
+                print(f"[MODELS] ⚠️ Error loading model {name}: {e}")
+                with self._lock:
+                    self._failures += 1
+                    if previous is not None:
+                        # 새 파일이 깨졌으면 이전 버전 유지 (다음 check_interval 후 재시도)
+                        previous["checked_at"] = time.monotonic()
+                        return previous["model"]
+                return None
+
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._store(name, model, version)
+                if previous is not None:
+                    self._reloads += 1
+                else:
+                    self._loads += 1
+            action = "Reloaded" if previous is not None else "Loaded"
+            print(f"[MODELS] ✅ {action} {name} in {elapsed * 1000:.1f}ms")
+            return model
+
+    def version(self, name: str) -> Optional[ModelVersion]:
+        """Version (mtime_ns, size) of the loaded model, or None if not loaded"""
+        with self._lock:
+            entry = self._entries.get(name)
+            return entry["version"] if entry is not None else None
+
+    def reload(self, name: str) -> Optional[Any]:
+        """Force a file check for a model on the next access and return it"""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None:
+                entry["checked_at"] = float("-inf")
+        return self.get(name)
+
+    def warm_up(self, names: Optional[List[str]] = None) -> List[str]:
+        """
+        Load models eagerly (every model in the directory by default)
+
+        Returns:
+            Names of the models that are loaded
+        """
+        loaded = []
+        for name in names if names is not None else self.list_available():
+            if self.get(name) is not None:
+                loaded.append(name)
+        print(f"[MODELS] Warm-up: {len(loaded)} models loaded from {self.model_dir}")
+        return loaded
+
+    def save(self, model: Any, name: str) -> bool:
+        """Write a model atomically and register it as the current version"""
+        path = self._path(name)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with self._load_lock(name):
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(model, f)
+                # 다른 worker가 쓰는 도중의 파일을 읽지 않도록 원자적 교체
+                os.replace(tmp_path, path)
+                version = self._file_version(name)
+                with self._lock:
+                    self._store(name, model, version)
+            return True
+        except Exception as e:
+            print(f"[MODELS] ⚠️ Error saving model {name}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return False
+
+    def save_weights(self, name: str, weights: Dict[str, np.ndarray], meta: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Write weights as a memory-mappable `<name>.weights/` directory
+
+        The directory is built next to the target and swapped in by rename;
+        workers still mapping the old files keep valid mappings until they reload.
+
+        Args:
+            weights: Tensor name -> array (names become file names)
+            meta: JSON-serializable architecture/hyperparameters
+        """
+        path = self._weights_path(name)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        old_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.old")
+        try:
+            with self._load_lock(name):
+                tmp_path.mkdir(parents=True)
+                for tensor_name, values in weights.items():
+                    np.save(tmp_path / f"{tensor_name}.npy", np.ascontiguousarray(values), allow_pickle=False)
+                if meta is not None:
+                    (tmp_path / WEIGHTS_META).write_text(json.dumps(meta), encoding="utf-8")
+                if path.exists():
+                    os.replace(path, old_path)
+                os.replace(tmp_path, path)
+                shutil.rmtree(old_path, ignore_errors=True)
+
+                version = self._file_version(name)
+                with self._lock:
+                    self._store(name, MappedWeights(path), version)
+            return True
+        except Exception as e:
+            print(f"[MODELS] ⚠️ Error saving weights {name}: {e}")
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return False
+
+    def list_available(self) -> List[str]:
+        """Model names in the model directory (weights directories and pickles)"""
+        names = {file.stem for file in self.model_dir.glob("*.pkl")}
+        names.update(path.name[:-len(WEIGHTS_SUFFIX)] for path in self.model_dir.glob(f"*{WEIGHTS_SUFFIX}") if path.is_dir())
+        return sorted(names)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "model_dir": str(self.model_dir),
+                "loaded": list(self._entries),
+                "private_mb": round(self._private_bytes / 1024 / 1024, 2),
+                "mapped_mb": round(sum(entry["mapped_bytes"] for entry in self._entries.values()) / 1024 / 1024, 2),
+                "budget_mb": round(self.max_bytes / 1024 / 1024, 2),
+                "hits": self._hits,
+                "loads": self._loads,
+                "reloads": self._reloads,
+                "evictions": self._evictions,
+                "failures": self._failures,
+            }
+
+
+_model_registry: Optional[ModelRegistry] = None
+_model_registry_guard = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the process-wide model registry"""
+    global _model_registry
+    with _model_registry_guard:
+        if _model_registry is None:
+            _model_registry = ModelRegistry(
+                settings.ML_MODEL_PATH if settings else "./models",
+                check_interval=settings.ML_MODEL_RELOAD_CHECK_SEC if settings else 2.0,
+                max_bytes=(settings.ML_MODEL_CACHE_MB if settings else 1024) * 1024 * 1024,
+            )
+        return _model_registry
@@ -1,9 +1,9 @@
 """
 Pydantic schemas for predictions
 """
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 # 공통 설정: model_name 필드 충돌 해결
 COMMON_CONFIG = ConfigDict(protected_namespaces=(), from_attributes=True)
@@ -42,6 +42,23 @@ class PredictionRequest(BaseModel):
     days_ahead: int = Field(default=1, ge=1, le=30, description="Number of days to predict ahead")
 
 
+class BatchPredictionRequest(BaseModel):
+    """Schema for scoring many symbols (× horizons) in one request"""
+    model_config = COMMON_CONFIG
+    
+    symbols: List[str] = Field(..., min_length=1, description="Stock or cryptocurrency symbols")
+    model_name: Optional[str] = Field(None, description="Specific model to use (optional)")
+    horizons: List[int] = Field(default=[1], min_length=1, description="Days ahead to predict for every symbol (1-30 each)")
+    
+    @field_validator("horizons")
+    @classmethod
+    def check_horizons(cls, horizons: List[int]) -> List[int]:
+        if any(days < 1 or days > 30 for days in horizons):
+            raise ValueError("Each horizon must be between 1 and 30 days")
+        # 중복 제거 (순서 유지)
+        return list(dict.fromkeys(horizons))
+
+
 class PaperInsightBase(BaseModel):
     """Base schema for paper insight"""
     model_config = COMMON_CONFIG
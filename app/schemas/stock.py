@@ -14,6 +14,7 @@ class StockDataBase(BaseModel):
     
     """Base schema for stock data"""
     symbol: str = Field(..., description="Stock symbol (e.g., AAPL, TSLA)")
+    interval: str = Field(default="1d", description="Bar interval (e.g., 1m, 1h, 1d)")
     date: datetime
     open: Optional[float] = None
     high: Optional[float] = None
@@ -46,6 +47,7 @@ class StockQuoteResponse(BaseModel):
     change_percent: float
     volume: int
     timestamp: datetime
+    stale: bool = False
 
 
 class StockHistoryRequest(BaseModel):
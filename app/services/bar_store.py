@@ -0,0 +1,483 @@
+"""
+Local OHLCV bar store - per symbol/interval columnar NumPy files with coverage tracking
+
+Layout: {BAR_STORE_PATH}/{interval}/{SYMBOL}.npz
+    ts        int64[n]    bar timestamps (UTC, ns)
+    open..    float64[n]  OHLCV columns (volume may contain NaN)
+    coverage  int64[k,2]  [start, end] ranges (UTC, ns) already fetched from upstream
+    tz        str         original index timezone (used to restore isoformat output)
+
+Recently used files stay in memory (hot layer, LRU by bytes) as read-only arrays,
+so any period inside a cached window is answered by slicing views of them.
+"""
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional, List, Tuple, Dict
+
+try:
+    from app.core.config import settings
+except ImportError:
+    settings = None
+
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+
+# yfinance 컬럼 이름 (기존 파싱 로직과 호환되도록 동일한 이름으로 복원)
+FRAME_COLUMNS = {
+    "open": "Open",
+    "high": "High",
+    "low": "Low",
+    "close": "Close",
+    "volume": "Volume",
+}
+
+# Period 문자열 → 기간 (ytd, max는 고정 길이가 아니므로 제외)
+PERIOD_DELTAS = {
+    '1d': timedelta(days=1),
+    '5d': timedelta(days=5),
+    '1mo': timedelta(days=30),
+    '3mo': timedelta(days=91),
+    '6mo': timedelta(days=182),
+    '1y': timedelta(days=365),
+    '2y': timedelta(days=730),
+    '5y': timedelta(days=1826),
+    '10y': timedelta(days=3652),
+}
+
+# 거래일(세션) 수로 세는 period - Yahoo의 1d/5d는 달력 기간이 아니라 최근 N 세션
+SESSION_PERIODS = {'1d': 1, '5d': 5}
+
+# 세션 period를 읽을 때 주말/휴장일을 덮도록 창을 넓히는 여유 (이후 최근 N 세션만 남김)
+SESSION_MARGIN = timedelta(days=5)
+
+# 'max' 요청의 시작 시점 (1970 이전/음수 epoch는 Yahoo에서 오류)
+MAX_PERIOD_START = datetime(1970, 1, 2, tzinfo=timezone.utc)
+
+# bar store로 응답할 수 있는 period (고정 길이 + ytd/max)
+STORE_PERIODS = tuple(PERIOD_DELTAS) + ('ytd', 'max')
+
+# Interval 문자열 → 바 하나의 길이
+INTERVAL_DELTAS = {
+    '1m': timedelta(minutes=1),
+    '2m': timedelta(minutes=2),
+    '5m': timedelta(minutes=5),
+    '15m': timedelta(minutes=15),
+    '30m': timedelta(minutes=30),
+    '60m': timedelta(hours=1),
+    '90m': timedelta(minutes=90),
+    '1h': timedelta(hours=1),
+    '1d': timedelta(days=1),
+    '5d': timedelta(days=5),
+    '1wk': timedelta(weeks=1),
+    '1mo': timedelta(days=31),
+    '3mo': timedelta(days=92),
+}
+
+Range = Tuple[datetime, datetime]
+
+
+def period_start(period: str, end: datetime) -> datetime:
+    """
+    Normalize a period string to the start of its window ending at `end`
+
+    Fixed periods are relative to `end`, 'ytd' starts on January 1st and 'max'
+    starts at MAX_PERIOD_START. Session periods (SESSION_PERIODS) are widened
+    by SESSION_MARGIN so the window spans weekends and holidays - cut the
+    result back with trim_sessions().
+    """
+    period = period.strip().lower()
+    if period in SESSION_PERIODS:
+        return end - PERIOD_DELTAS[period] - SESSION_MARGIN
+    if period in PERIOD_DELTAS:
+        return end - PERIOD_DELTAS[period]
+    if period == 'ytd':
+        return datetime(end.year, 1, 1, tzinfo=end.tzinfo or timezone.utc)
+    if period == 'max':
+        return MAX_PERIOD_START
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def session_window_start(hist: Optional[pd.DataFrame], period: str) -> Optional[pd.Timestamp]:
+    """
+    Start (local midnight) of the last N trading sessions of a session period
+
+    Sessions are the distinct local dates of daily or finer bars. Returns None
+    for other periods or when `hist` holds no more than N sessions.
+    """
+    sessions = SESSION_PERIODS.get(period.strip().lower())
+    if sessions is None or hist is None or hist.empty:
+        return None
+    unique = pd.DatetimeIndex(hist.index).normalize().unique()
+    if len(unique) <= sessions:
+        return None
+    return unique[-sessions]
+
+
+def trim_sessions(hist: Optional[pd.DataFrame], period: str, interval: str) -> Optional[pd.DataFrame]:
+    """
+    Keep only the last N trading sessions of a session period ('1d', '5d')
+
+    The result matches what Yahoo returns for the same period. Other periods
+    and bars longer than a day (resample those from trimmed finer bars) are
+    returned unchanged.
+    """
+    if INTERVAL_DELTAS.get(interval, timedelta(days=1)) > timedelta(days=1):
+        return hist
+    start = session_window_start(hist, period)
+    if start is None:
+        return hist
+    trimmed = hist[pd.DatetimeIndex(hist.index) >= start]
+    trimmed.attrs = dict(hist.attrs)
+    return trimmed
+
+
+def _to_ns(value: datetime) -> int:
+    """Convert a datetime (naive = UTC) to UTC epoch nanoseconds"""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return int(ts.value)
+
+
+def _from_ns(value: int) -> datetime:
+    """Convert UTC epoch nanoseconds to an aware datetime"""
+    return pd.Timestamp(int(value), tz="UTC").to_pydatetime()
+
+
+def _merge_ranges(ranges: np.ndarray) -> np.ndarray:
+    """Merge overlapping/adjacent [start, end] ranges (int64 ns, shape (k, 2))"""
+    if len(ranges) == 0:
+        return ranges.reshape(0, 2)
+    ranges = ranges[np.argsort(ranges[:, 0])]
+    merged = [ranges[0].copy()]
+    for start, end in ranges[1:]:
+        if start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append(np.array([start, end], dtype=np.int64))
+    return np.vstack(merged).astype(np.int64)
+
+
+class BarStore:
+    """
+    Persistent per-symbol/per-interval OHLCV store
+
+    Keeps track of which time ranges were already fetched so callers only
+    need to download the missing tail (or interior gaps) from the provider.
+    """
+
+    def __init__(self, root: Optional[str] = None, hot_max_bytes: Optional[int] = None):
+        default_root = settings.BAR_STORE_PATH if settings else "./data/bars"
+        self.root = Path(root or default_root)
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+        if hot_max_bytes is None:
+            hot_max_bytes = (settings.BAR_STORE_HOT_MB if settings else 256) * 1024 * 1024
+        self.hot_max_bytes = hot_max_bytes
+        self._hot: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
+        self._hot_bytes = 0
+        self._hot_guard = threading.Lock()
+        self._hot_hits = 0
+        self._hot_misses = 0
+
+    def _path(self, symbol: str, interval: str) -> Path:
+        return self.root / interval / f"{symbol.upper()}.npz"
+
+    def _lock(self, symbol: str, interval: str) -> threading.Lock:
+        key = (symbol.upper(), interval)
+        with self._locks_guard:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    def _load_entry(self, symbol: str, interval: str) -> Optional[Dict]:
+        """
+        Return the hot-layer entry {arrays, index, ...} for symbol/interval
+
+        The entry is reloaded from disk when the file changed (e.g. written by
+        another worker process). Arrays are read-only and shared by all readers.
+        """
+        key = (symbol.upper(), interval)
+        path = self._path(symbol, interval)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._forget(key)
+            return None
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        with self._hot_guard:
+            entry = self._hot.get(key)
+            if entry is not None and entry["version"] == version:
+                self._hot.move_to_end(key)
+                self._hot_hits += 1
+                return entry
+            self._hot_misses += 1
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+        except Exception as e:
+            print(f"[BARSTORE] ⚠️ Failed to read {path}: {e}")
+            return None
+        return self._remember(key, arrays, version)
+
+    def _load_arrays(self, symbol: str, interval: str) -> Optional[Dict[str, np.ndarray]]:
+        entry = self._load_entry(symbol, interval)
+        return entry["arrays"] if entry is not None else None
+
+    def _remember(self, key: Tuple[str, str], arrays: Dict[str, np.ndarray], version: Tuple[int, int]) -> Dict:
+        """Put arrays into the hot layer and evict least recently used entries over budget"""
+        for values in arrays.values():
+            values.flags.writeable = False
+        entry = {
+            "arrays": arrays,
+            "index": None,  # 첫 read()에서 생성
+            "version": version,
+            "nbytes": sum(values.nbytes for values in arrays.values()),
+        }
+        with self._hot_guard:
+            old = self._hot.pop(key, None)
+            if old is not None:
+                self._hot_bytes -= old["nbytes"]
+            self._hot[key] = entry
+            self._hot_bytes += entry["nbytes"]
+            while self._hot_bytes > self.hot_max_bytes and len(self._hot) > 1:
+                _, evicted = self._hot.popitem(last=False)
+                self._hot_bytes -= evicted["nbytes"]
+        return entry
+
+    def _forget(self, key: Tuple[str, str]) -> None:
+        with self._hot_guard:
+            old = self._hot.pop(key, None)
+            if old is not None:
+                self._hot_bytes -= old["nbytes"]
+
+    def _save_arrays(self, symbol: str, interval: str, arrays: Dict[str, np.ndarray]) -> None:
+        path = self._path(symbol, interval)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        # 원자적 교체 - 다른 프로세스가 읽는 도중에도 깨진 파일을 보지 않음
+        os.replace(tmp_path, path)
+        stat = path.stat()
+        self._remember((symbol.upper(), interval), arrays, (stat.st_mtime_ns, stat.st_size))
+
+    def coverage(self, symbol: str, interval: str) -> List[Range]:
+        """Return the fetched [start, end] ranges held for symbol/interval"""
+        arrays = self._load_arrays(symbol, interval)
+        if arrays is None:
+            return []
+        return [(_from_ns(s), _from_ns(e)) for s, e in arrays["coverage"]]
+
+    def has_symbol(self, symbol: str) -> bool:
+        """True if bars are stored for symbol in any interval (empty fetches are never stored)"""
+        symbol = symbol.upper()
+        with self._hot_guard:
+            if any(key[0] == symbol for key in self._hot):
+                return True
+        return any(self.root.glob(f"*/{symbol}.npz"))
+
+    def missing_ranges(
+        self,
+        symbol: str,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        tail_tolerance: Optional[timedelta] = None
+    ) -> List[Range]:
+        """
+        Compute the sub-ranges of [start, end] not yet covered by the store
+
+        Args:
+            symbol: Stock or crypto symbol
+            interval: Bar interval
+            start: Requested range start
+            end: Requested range end
+            tail_tolerance: Tail gaps shorter than this are treated as fresh
+
+        Returns:
+            List of (start, end) ranges that must be fetched upstream
+        """
+        if tail_tolerance is None:
+            ttl = settings.BAR_STORE_TAIL_TTL if settings else 60
+            tail_tolerance = timedelta(seconds=ttl)
+
+        start_ns, end_ns = _to_ns(start), _to_ns(end)
+        arrays = self._load_arrays(symbol, interval)
+        if arrays is None or len(arrays["coverage"]) == 0:
+            return [(_from_ns(start_ns), _from_ns(end_ns))]
+
+        bar_ns = int(INTERVAL_DELTAS.get(interval, timedelta(days=1)).total_seconds() * 1e9)
+        tail_ns = int(tail_tolerance.total_seconds() * 1e9)
+
+        gaps = []
+        cursor = start_ns
+        for cov_start, cov_end in arrays["coverage"]:
+            if cov_end <= cursor:
+                continue
+            if cov_start >= end_ns:
+                break
+            if cov_start > cursor:
+                gaps.append((cursor, min(cov_start, end_ns)))
+            cursor = max(cursor, cov_end)
+            if cursor >= end_ns:
+                break
+        if cursor < end_ns:
+            gaps.append((cursor, end_ns))
+
+        result = []
+        for gap_start, gap_end in gaps:
+            # 마지막(tail) 구간은 TTL 이내면 최신으로 간주, 내부 구간은 바 하나보다 짧으면 무시
+            threshold = tail_ns if gap_end == end_ns else bar_ns
+            if gap_end - gap_start > threshold:
+                result.append((_from_ns(gap_start), _from_ns(gap_end)))
+        return result
+
+    def merge(
+        self,
+        symbol: str,
+        interval: str,
+        hist: pd.DataFrame,
+        start: datetime,
+        end: datetime
+    ) -> None:
+        """
+        Merge freshly fetched bars into the store and mark [start, end] as covered
+
+        Bars with an existing timestamp are replaced (the latest, possibly partial,
+        bar gets updated on every tail refresh).
+        """
+        with self._lock(symbol, interval):
+            arrays = self._load_arrays(symbol, interval)
+            has_bars = arrays is not None and len(arrays["ts"]) > 0
+
+            if (hist is None or hist.empty) and not has_bars:
+                # 심볼이 존재하지 않을 수 있으므로 빈 결과는 커버리지로 기록하지 않음
+                return
+
+            new = self._frame_to_arrays(hist) if hist is not None and not hist.empty else None
+
+            if arrays is not None:
+                # hot layer의 배열은 공유(read-only) - 새 dict에 결과를 만든다
+                arrays = dict(arrays)
+            else:
+                arrays = {
+                    "ts": np.empty(0, dtype=np.int64),
+                    **{col: np.empty(0, dtype=np.float64) for col in COLUMNS},
+                    "coverage": np.empty((0, 2), dtype=np.int64),
+                    "tz": np.array(new["tz"] if new else "UTC"),
+                }
+
+            if new is not None:
+                ts = np.concatenate([arrays["ts"], new["ts"]])
+                columns = {col: np.concatenate([arrays[col], new[col]]) for col in COLUMNS}
+                # 같은 타임스탬프는 새 값 우선 (뒤에서부터 unique)
+                _, reverse_idx = np.unique(ts[::-1], return_index=True)
+                keep = len(ts) - 1 - reverse_idx
+                order = keep[np.argsort(ts[keep], kind="stable")]
+                arrays["ts"] = ts[order]
+                for col in COLUMNS:
+                    arrays[col] = columns[col][order]
+                arrays["tz"] = np.array(new["tz"])
+
+            coverage = np.vstack([
+                arrays["coverage"].reshape(-1, 2),
+                np.array([[_to_ns(start), _to_ns(end)]], dtype=np.int64)
+            ])
+            arrays["coverage"] = _merge_ranges(coverage)
+            self._save_arrays(symbol, interval, arrays)
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Read stored bars in [start, end] as a yfinance-shaped DataFrame
+
+        Columns and index are views into the hot-layer arrays (no copy), so any
+        sub-window of a cached period costs two binary searches.
+
+        Returns:
+            DataFrame indexed by timestamp with Open/High/Low/Close/Volume columns,
+            or None if nothing is stored for symbol/interval
+        """
+        entry = self._load_entry(symbol, interval)
+        if entry is None or len(entry["arrays"]["ts"]) == 0:
+            return None
+        arrays = entry["arrays"]
+
+        index = entry["index"]
+        if index is None:
+            # tz 변환된 전체 인덱스는 파일 버전당 한 번만 생성 (이후 slice는 view)
+            index = pd.DatetimeIndex(pd.to_datetime(arrays["ts"], utc=True)).tz_convert(str(arrays["tz"]))
+            entry["index"] = index
+
+        ts = arrays["ts"]
+        lo = np.searchsorted(ts, _to_ns(start), side="left") if start is not None else 0
+        hi = np.searchsorted(ts, _to_ns(end), side="right") if end is not None else len(ts)
+
+        return pd.DataFrame(
+            {FRAME_COLUMNS[col]: arrays[col][lo:hi] for col in COLUMNS},
+            index=index[lo:hi],
+            copy=False
+        )
+
+    def stats(self) -> Dict[str, float]:
+        """Hot layer size and hit rate"""
+        with self._hot_guard:
+            lookups = self._hot_hits + self._hot_misses
+            return {
+                "hot_entries": len(self._hot),
+                "hot_mb": round(self._hot_bytes / 1024 / 1024, 2),
+                "hot_max_mb": round(self.hot_max_bytes / 1024 / 1024, 2),
+                "hot_hits": self._hot_hits,
+                "hot_misses": self._hot_misses,
+                "hot_hit_rate": round(self._hot_hits / lookups, 4) if lookups else 0.0,
+            }
+
+    @staticmethod
+    def _frame_to_arrays(hist: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Convert a flattened yfinance DataFrame into store arrays"""
+        index = pd.DatetimeIndex(hist.index)
+        tz = str(index.tz) if index.tz is not None else "UTC"
+        if index.tz is None:
+            index = index.tz_localize("UTC")
+        result = {
+            "ts": index.tz_convert("UTC").as_unit("ns").asi8.astype(np.int64),
+            "tz": tz,
+        }
+        lower = {str(col).lower(): col for col in hist.columns}
+        for col in COLUMNS:
+            source = lower.get(col)
+            if source is None and col == "volume":
+                # 거래량이 없으면 NaN (종가로 채우면 재집계 시 가격이 거래량으로 합산됨)
+                result[col] = np.full(len(index), np.nan)
+                continue
+            if source is None:
+                source = lower.get("close")
+            result[col] = hist[source].to_numpy(dtype=np.float64, na_value=np.nan)
+        return result
+
+
+_bar_store: Optional[BarStore] = None
+_bar_store_guard = threading.Lock()
+
+
+def get_bar_store() -> BarStore:
+    """Return the process-wide BarStore instance"""
+    global _bar_store
+    with _bar_store_guard:
+        if _bar_store is None:
+            _bar_store = BarStore()
+        return _bar_store
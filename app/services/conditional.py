@@ -0,0 +1,87 @@
+"""
+Conditional GET and incremental history helpers
+
+    ETag           weak validator derived from the last bar (time + values) and
+                   the response variant (period, interval, layout, format, since)
+    If-None-Match  answered with 304 when the client already has that version
+    since=         only bars strictly newer than the given time are returned, so
+                   chart clients can append deltas instead of refetching the series
+"""
+import hashlib
+import json
+from typing import Any, Dict, Iterable, Optional
+
+import pandas as pd
+
+
+def parse_since(value: Optional[str]) -> Optional[pd.Timestamp]:
+    """
+    Parse a `since` parameter (ISO 8601 or epoch seconds/milliseconds) to a UTC timestamp
+
+    Naive ISO values are taken as UTC.
+
+    Raises:
+        ValueError: if the value cannot be parsed
+    """
+    if value is None or not str(value).strip():
+        return None
+    value = str(value).strip()
+    try:
+        number = float(value)
+    except ValueError:
+        number = None
+
+    if number is not None:
+        # 1e11초 이후(서기 5138년)는 밀리초로 해석
+        ts = pd.Timestamp(number, unit="ms" if abs(number) >= 1e11 else "s", tz="UTC")
+    else:
+        try:
+            ts = pd.Timestamp(value)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid since value: {value} (use ISO 8601 or epoch seconds)") from e
+        ts = ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+    return ts
+
+
+def filter_since(hist: pd.DataFrame, since: Optional[pd.Timestamp]) -> pd.DataFrame:
+    """Bars strictly newer than `since` (binary search on the sorted index, no copy)"""
+    if since is None or hist is None or hist.empty:
+        return hist
+    bound = since
+    if getattr(hist.index, "tz", None) is None:
+        bound = since.tz_convert("UTC").tz_localize(None)
+    position = hist.index.searchsorted(bound, side="right")
+    return hist.iloc[position:]
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag over JSON-serializable parts"""
+    digest = hashlib.sha1(json.dumps(parts, default=str, sort_keys=True).encode()).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def market_data_etag(result: Dict[str, Any], *variant: Any) -> str:
+    """ETag for a market data result: last bar time/values + response variant"""
+    return make_etag(
+        result.get("symbol"),
+        result.get("as_of"),
+        result.get("current_price"),
+        result.get("change"),
+        result.get("volume"),
+        result.get("stale", False),
+        *variant
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check with weak comparison (W/ prefixes ignored)"""
+    if not if_none_match:
+        return False
+    candidates: Iterable[str] = (tag.strip() for tag in if_none_match.split(","))
+    weak = etag[2:] if etag.startswith("W/") else etag
+    for tag in candidates:
+        if tag == "*":
+            return True
+        if (tag[2:] if tag.startswith("W/") else tag) == weak:
+            return True
+    return False
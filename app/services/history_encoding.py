@@ -0,0 +1,190 @@
+"""
+Binary columnar encodings for history responses (content negotiation)
+
+JSON stays the default. Clients that send
+
+    Accept: application/vnd.apache.arrow.stream   → Arrow IPC stream
+    Accept: application/x-msgpack                 → MessagePack
+
+get the history encoded straight from the column arrays (see
+`serialize_history(..., layout="arrays")`) instead of a list of per-bar dicts.
+
+Arrow: one record batch with date/open/high/low/close/volume columns; the rest
+of the response (symbol, current_price, info, ...) is JSON in the schema
+metadata under b"response".
+MessagePack: the response map with `history` as a map of column lists.
+
+Both libraries are optional (`pip install pyarrow msgpack`); a format whose
+library is missing is never negotiated.
+"""
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON_MEDIA_TYPE = "application/json"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+
+# Accept 값 → 응답 형식
+FORMAT_MEDIA_TYPES = {
+    "arrow": (ARROW_MEDIA_TYPE, "application/vnd.apache.arrow.file"),
+    "msgpack": (MSGPACK_MEDIA_TYPE, "application/msgpack", "application/vnd.msgpack"),
+}
+
+
+class NotAcceptableError(ValueError):
+    """Raised when the client accepts only formats this server cannot produce"""
+
+
+def available_formats() -> List[str]:
+    formats = ["json"]
+    if pa is not None:
+        formats.append("arrow")
+    if msgpack is not None:
+        formats.append("msgpack")
+    return formats
+
+
+def _parse_accept(accept: str) -> List[Tuple[str, float]]:
+    entries = []
+    for part in accept.split(","):
+        fields = [field.strip() for field in part.split(";")]
+        if not fields[0]:
+            continue
+        quality = 1.0
+        for param in fields[1:]:
+            if param.startswith("q="):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        entries.append((fields[0].lower(), quality))
+    return entries
+
+
+def negotiate_history_format(accept: Optional[str]) -> str:
+    """
+    Pick the response format for an Accept header
+
+    Returns:
+        'json', 'arrow' or 'msgpack' (JSON unless a binary type is preferred)
+
+    Raises:
+        NotAcceptableError: if only unavailable binary formats are accepted
+    """
+    if not accept:
+        return "json"
+
+    available = available_formats()
+    best, best_quality = None, 0.0
+    requested_binary = False
+    for media_type, quality in _parse_accept(accept):
+        if media_type in (JSON_MEDIA_TYPE, "application/*", "*/*"):
+            fmt = "json"
+        else:
+            fmt = next((name for name, types in FORMAT_MEDIA_TYPES.items() if media_type in types), None)
+            if fmt is None:
+                continue
+            requested_binary = True
+            if fmt not in available:
+                continue
+        # 같은 q면 먼저 나온 형식 우선
+        if quality > best_quality:
+            best, best_quality = fmt, quality
+
+    if best is None:
+        if requested_binary:
+            raise NotAcceptableError(
+                f"Requested history format is not available on this server (available: {', '.join(available)})"
+            )
+        return "json"
+    return best
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_arrow(result: Dict[str, Any], history_path: Tuple[str, ...] = ("history",)) -> bytes:
+    """
+    Encode a response whose history (at `history_path`) holds column arrays as an Arrow IPC stream
+    """
+    if pa is None:
+        raise NotAcceptableError("pyarrow is not installed")
+
+    columns, rest = _split_history(result, history_path)
+    # float/int 컬럼은 NumPy 버퍼를 그대로 사용 (복사 없음)
+    batch = pa.RecordBatch.from_pydict({key: pa.array(values) for key, values in columns.items()})
+    batch = batch.replace_schema_metadata({b"response": json.dumps(rest, default=_json_default).encode()})
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, batch.schema) as writer:
+        writer.write_batch(batch)
+    return sink.getvalue().to_pybytes()
+
+
+def encode_msgpack(result: Dict[str, Any], history_path: Tuple[str, ...] = ("history",)) -> bytes:
+    """
+    Encode a response whose history (at `history_path`) holds column arrays as MessagePack
+    """
+    if msgpack is None:
+        raise NotAcceptableError("msgpack is not installed")
+
+    columns, rest = _split_history(result, history_path)
+    # tolist()는 C 레벨 변환 - 행 단위 dict를 만들지 않음
+    history = {key: values.tolist() for key, values in columns.items()}
+    return msgpack.packb(_with_history(rest, history_path, history), default=_json_default, use_bin_type=True)
+
+
+def _split_history(result: Dict[str, Any], path: Tuple[str, ...]) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """(history column arrays, response without the history)"""
+    parent = result
+    for key in path[:-1]:
+        parent = parent[key]
+    columns = parent[path[-1]]
+    return columns, _with_history(result, path, None)
+
+
+def _with_history(result: Dict[str, Any], path: Tuple[str, ...], history: Any) -> Dict[str, Any]:
+    """Shallow copy of the response with the history replaced (None drops it)"""
+    if len(path) == 1:
+        copied = {key: value for key, value in result.items() if key != path[0]}
+        if history is not None:
+            copied[path[0]] = history
+        return copied
+    return {**result, path[0]: _with_history(result[path[0]], path[1:], history)}
+
+
+def encode_history_response(
+    result: Dict[str, Any],
+    fmt: str,
+    history_path: Tuple[str, ...] = ("history",)
+) -> Tuple[bytes, str]:
+    """
+    Encode a response in a negotiated binary format
+
+    Returns:
+        (body, media type)
+    """
+    if fmt == "arrow":
+        return encode_arrow(result, history_path), ARROW_MEDIA_TYPE
+    if fmt == "msgpack":
+        return encode_msgpack(result, history_path), MSGPACK_MEDIA_TYPE
+    raise ValueError(f"Unsupported binary format: {fmt}")
@@ -0,0 +1,148 @@
+"""
+Vectorized OHLCV history serialization
+
+Builds the `history` part of market data responses column-wise from NumPy
+arrays instead of walking the DataFrame with iterrows().
+
+Layouts:
+    rows     [{"date": ..., "open": ..., ...}, ...]   (default, 기존 응답 형식)
+    columns  {"date": [...], "open": [...], ...}
+    arrays   {"date": ndarray, "open": ndarray, ...}  (internal - binary encoders, not JSON-serializable)
+"""
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+HISTORY_LAYOUTS = ("rows", "columns")
+
+HISTORY_KEYS = ("date", "open", "high", "low", "close", "volume")
+
+
+def find_ohlcv_columns(hist: pd.DataFrame) -> Tuple[Any, Any, Any, Any, Optional[Any]]:
+    """
+    Detect (open, high, low, close, volume) column names in a yfinance DataFrame
+
+    Missing price columns fall back to the close column; volume may be None.
+    """
+    close_col = None
+    open_col = None
+    high_col = None
+    low_col = None
+    volume_col = None
+
+    for col in hist.columns:
+        col_lower = str(col).lower()
+        if 'close' in col_lower and close_col is None:
+            close_col = col
+        elif 'open' in col_lower and open_col is None:
+            open_col = col
+        elif 'high' in col_lower and high_col is None:
+            high_col = col
+        elif 'low' in col_lower and low_col is None:
+            low_col = col
+        elif 'volume' in col_lower and volume_col is None:
+            volume_col = col
+
+    # 기본값 설정
+    if close_col is None:
+        close_col = 'Close' if 'Close' in hist.columns else hist.columns[0]
+    if open_col is None:
+        open_col = 'Open' if 'Open' in hist.columns else close_col
+    if high_col is None:
+        high_col = 'High' if 'High' in hist.columns else close_col
+    if low_col is None:
+        low_col = 'Low' if 'Low' in hist.columns else close_col
+    if volume_col is None:
+        volume_col = 'Volume' if 'Volume' in hist.columns else None
+
+    return open_col, high_col, low_col, close_col, volume_col
+
+
+def format_dates(index: pd.Index) -> np.ndarray:
+    """
+    Format a DatetimeIndex like Timestamp.isoformat(), without a per-row Python loop
+
+    Tz-aware indexes get their (possibly DST-varying) UTC offset appended,
+    e.g. '2024-01-02T00:00:00-05:00'.
+    """
+    if not isinstance(index, pd.DatetimeIndex):
+        return np.array([idx.isoformat() if hasattr(idx, 'isoformat') else str(idx) for idx in index])
+
+    wall = index.tz_localize(None) if index.tz is not None else index
+    wall_values = wall.as_unit("ns").values
+    has_fraction = bool(np.any(wall_values.astype(np.int64) % 1_000_000_000))
+    dates = np.datetime_as_string(wall_values, unit="us" if has_fraction else "s")
+
+    if index.tz is None:
+        return dates
+
+    # 오프셋 = 현지 시각 - UTC (초), 고유 값만 문자열로 변환
+    utc_values = index.tz_convert("UTC").tz_localize(None).as_unit("ns").values
+    offsets = (wall_values - utc_values).astype("timedelta64[s]").astype(np.int64)
+    unique_offsets, inverse = np.unique(offsets, return_inverse=True)
+    suffixes = np.array([_format_offset(int(offset)) for offset in unique_offsets])
+    return np.char.add(dates, suffixes[inverse])
+
+
+def _format_offset(seconds: int) -> str:
+    sign = "+" if seconds >= 0 else "-"
+    seconds = abs(seconds)
+    return f"{sign}{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}"
+
+
+def history_arrays(hist: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Extract the history columns as NumPy arrays (date strings, float64 prices, int64 volume)
+
+    NaN volumes become 0.
+    """
+    open_col, high_col, low_col, close_col, volume_col = find_ohlcv_columns(hist)
+    n = len(hist)
+
+    if volume_col is not None:
+        volume = hist[volume_col].to_numpy(dtype=np.float64, na_value=np.nan)
+        volume = np.nan_to_num(volume, nan=0.0).astype(np.int64)
+    else:
+        volume = np.zeros(n, dtype=np.int64)
+
+    return {
+        "date": format_dates(hist.index),
+        "open": hist[open_col].to_numpy(dtype=np.float64, na_value=np.nan),
+        "high": hist[high_col].to_numpy(dtype=np.float64, na_value=np.nan),
+        "low": hist[low_col].to_numpy(dtype=np.float64, na_value=np.nan),
+        "close": hist[close_col].to_numpy(dtype=np.float64, na_value=np.nan),
+        "volume": volume,
+    }
+
+
+def serialize_history(
+    hist: pd.DataFrame,
+    layout: str = "rows"
+) -> Union[List[Dict[str, Any]], Dict[str, List[Any]]]:
+    """
+    Serialize an OHLCV DataFrame into the response `history` shape
+
+    Args:
+        hist: Single-symbol OHLCV DataFrame indexed by timestamp
+        layout: 'rows' (list of per-bar dicts), 'columns' (dict of lists) or
+            'arrays' (dict of NumPy arrays, for binary encoders)
+
+    Returns:
+        History in the requested layout
+    """
+    if layout not in HISTORY_LAYOUTS and layout != "arrays":
+        raise ValueError(f"Invalid history layout: {layout} (expected one of {', '.join(HISTORY_LAYOUTS)})")
+
+    arrays = history_arrays(hist)
+    if layout == "arrays":
+        return arrays
+    # tolist()는 C 레벨에서 Python float/int로 변환 - 행 단위 변환보다 훨씬 빠름
+    columns = {key: arrays[key].tolist() for key in HISTORY_KEYS}
+
+    if layout == "columns":
+        return columns
+
+    return [
+        dict(zip(HISTORY_KEYS, values))
+        for values in zip(*(columns[key] for key in HISTORY_KEYS))
+    ]
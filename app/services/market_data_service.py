@@ -1,17 +1,56 @@
 """
 Market data service using yf.download() - more stable than ticker.history()
 """
-import yfinance as yf
-import pandas as pd
+import threading
 import time
-from datetime import datetime
-from typing import Optional, Dict, Any
+import pandas as pd
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Tuple
+from app.services.bar_store import (
+    get_bar_store, period_start, session_window_start, trim_sessions, STORE_PERIODS, SESSION_PERIODS,
+    INTERVAL_DELTAS
+)
+from app.services.resampler import CALENDAR_PERIODS, RESAMPLE_SOURCES, align_start, can_resample, resample_ohlcv
+from app.core.singleflight import SingleFlight
+from app.core.rate_limiter import RateLimitTimeout, is_rate_limit_error
+from app.core.circuit_breaker import upstream_breaker
+from app.core.cache import cache_enabled, get_cache
+from app.services.providers import get_provider
+from app.services.metadata_cache import get_cached_info
+from app.services.history_serializer import find_ohlcv_columns, serialize_history
+from app.services.conditional import filter_since
+from app.services.stock_data_service import StockDataService, persistence_enabled
+from app.services.symbol_validation import (
+    InvalidSymbolError, check_symbol, get_negative_cache, has_local_data, unknown_symbol_error
+)
+from app.core.database import SessionLocal
 
 try:
     from app.core.config import settings
 except ImportError:
     settings = None
 
+# 같은 (symbol, period, interval) 동시 요청은 upstream 호출 한 번을 공유
+_market_data_flight = SingleFlight("market_data")
+
+# 마지막 정상 응답 (flight key → (result, 저장 시각)) - upstream 장애 시 stale로 즉시 응답
+_last_good: "OrderedDict[tuple, tuple[Dict[str, Any], float]]" = OrderedDict()
+_last_good_lock = threading.Lock()
+
+# 장애 중 복구 확인용 백그라운드 갱신은 프로세스 전체에서 하나만
+_revalidate_lock = threading.Lock()
+_revalidate_pending = False
+
+# DB에서 bar store로 복원을 시도한 (symbol, interval) - 프로세스당 한 번
+_seeded_keys: set = set()
+_seeded_lock = threading.Lock()
+
+# 최근 사용자 요청 (symbol, period, interval) → 마지막 요청 시각 - prefetch 대상 선정용
+_recent_requests: "OrderedDict[tuple[str, str, str], float]" = OrderedDict()
+_recent_requests_lock = threading.Lock()
+_RECENT_REQUESTS_MAX = 256
+
 
 class MarketDataService:
     """Service for handling market data operations using yf.download()"""
@@ -62,11 +101,532 @@ class MarketDataService:
         
         return period, interval
     
+    @staticmethod
+    def _flatten_columns(hist: pd.DataFrame) -> pd.DataFrame:
+        """yf.download() 결과의 MultiIndex 컬럼을 단일 레벨로 변환"""
+        if hist is not None and isinstance(hist.columns, pd.MultiIndex):
+            if len(hist.columns.levels[1]) == 1:
+                # 단일 심볼인 경우
+                symbol_name = hist.columns.levels[1][0]
+                hist = hist.xs(symbol_name, axis=1, level=1, drop_level=True)
+            else:
+                # 여러 심볼인 경우 첫 번째 레벨만 사용
+                hist.columns = hist.columns.get_level_values(0)
+        return hist
+    
+    @staticmethod
+    def _bar_store_enabled() -> bool:
+        return bool(settings and settings.BAR_STORE_ENABLED)
+    
+    @staticmethod
+    def _fetch_via_store(
+        symbol: str,
+        period: str,
+        interval: str,
+        start: Optional[datetime] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Serve a period from the local bar store, fetching only the missing ranges upstream
+        
+        Args:
+            start: Explicit window start (defaults to now - period, cut back
+                to the last N sessions for '1d'/'5d')
+        
+        Returns:
+            DataFrame for the requested window, or None if nothing could be served
+        """
+        store = get_bar_store()
+        end = datetime.now(timezone.utc)
+        by_period = start is None
+        start = start or period_start(period, end)
+        
+        MarketDataService._seed_store(symbol, interval)
+        missing = store.missing_ranges(symbol, interval, start, end)
+        if not missing:
+            print(f"[BARSTORE] ⚡ Full hit: {symbol} {interval} ({period})")
+        
+        stale = False
+        try:
+            for gap_start, gap_end in missing:
+                print(f"[BARSTORE] Fetching gap: {symbol} {interval} {gap_start.isoformat()} ~ {gap_end.isoformat()}")
+                fetched = MarketDataService._download_range(symbol, interval, gap_start, gap_end)
+                MarketDataService._store_bars(symbol, interval, fetched, gap_start, gap_end)
+        except RateLimitTimeout as e:
+            # upstream 장애/한도 초과: 저장된 bar가 있으면 그대로 stale로 응답
+            cached = store.read(symbol, interval, start, end)
+            if cached is None or cached.empty:
+                raise
+            print(f"[BARSTORE] ⚠️ Upstream unavailable ({e}), serving stale bars")
+            stale = True
+        
+        hist = store.read(symbol, interval, start, end)
+        if hist is not None:
+            if by_period:
+                hist = trim_sessions(hist, period, interval)
+            hist.attrs["stale"] = stale
+            print(f"[BARSTORE] ✅ Served {len(hist)} rows from store")
+        return hist
+    
+    @staticmethod
+    def _store_bars(symbol: str, interval: str, hist: pd.DataFrame, start: datetime, end: datetime) -> None:
+        """Merge fetched bars into the bar store and upsert them into StockData"""
+        get_bar_store().merge(symbol, interval, hist, start, end)
+        if not persistence_enabled():
+            return
+        try:
+            with SessionLocal() as db:
+                written = StockDataService(db).upsert_bars(symbol, interval, hist, start, end)
+            if written:
+                print(f"[STOCKDATA] Upserted {written} bars: {symbol} {interval}")
+        except Exception as e:
+            # DB 저장 실패는 응답에 영향 없음 (bar store에는 이미 반영)
+            print(f"[STOCKDATA] ⚠️ Failed to persist bars for {symbol} {interval}: {e}")
+    
+    @staticmethod
+    def _seed_store(symbol: str, interval: str) -> None:
+        """
+        Restore an empty bar store key from StockData (e.g. after a restart on a fresh disk)
+        
+        Only ranges recorded as fetched are marked covered, so gaps still go upstream.
+        """
+        key = (symbol.upper(), interval)
+        with _seeded_lock:
+            if key in _seeded_keys:
+                return
+            _seeded_keys.add(key)
+        
+        store = get_bar_store()
+        if store.coverage(symbol, interval) or not persistence_enabled():
+            return
+        try:
+            with SessionLocal() as db:
+                service = StockDataService(db)
+                ranges = service.coverage(symbol, interval)
+                if not ranges:
+                    return
+                hist = service.read_range(symbol, interval)
+        except Exception as e:
+            print(f"[STOCKDATA] ⚠️ Failed to read stored bars for {symbol} {interval}: {e}")
+            return
+        
+        # DB는 naive UTC로 저장
+        ranges = [(s.replace(tzinfo=timezone.utc), e.replace(tzinfo=timezone.utc)) for s, e in ranges]
+        store.merge(symbol, interval, hist, *ranges[0])
+        for range_start, range_end in ranges[1:]:
+            store.merge(symbol, interval, None, range_start, range_end)
+        print(f"[STOCKDATA] ⚡ Restored {len(hist)} bars ({len(ranges)} ranges) into bar store: {symbol} {interval}")
+    
+    @staticmethod
+    def _read_resampled(
+        symbol: str,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        period: Optional[str] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Build `interval` bars from finer bars the store already covers (no upstream call)
+        
+        Args:
+            period: Requested period - '1d'/'5d' keep only the bars of the last N sessions
+        
+        Returns:
+            Resampled DataFrame, or None if no finer interval covers the window
+        """
+        store = get_bar_store()
+        # 첫 bar가 잘리지 않도록 coarse bar 시작 시점부터 읽기
+        # (주/월/분기 bar는 시작일부터 일봉이 있어야 완전, 장중 bar는 있는 만큼만 사용)
+        fine_start = align_start(start, interval)
+        covered_from = fine_start if interval in CALENDAR_PERIODS else start
+        for source in RESAMPLE_SOURCES.get(interval, ()):
+            if store.missing_ranges(symbol, source, covered_from, end):
+                continue
+            fine = store.read(symbol, source, fine_start, end)
+            if fine is None or fine.empty:
+                continue
+            hist = MarketDataService._resample_window(fine, interval, start, period)
+            print(f"[BARSTORE] ⚡ Resampled {symbol} {source} → {interval}: {len(fine)} → {len(hist)} rows")
+            return hist
+        return None
+    
+    @staticmethod
+    def _resample_window(fine: pd.DataFrame, interval: str, start: datetime, period: Optional[str]) -> pd.DataFrame:
+        """
+        Resample finer bars, starting at the first of the last N sessions for '1d'/'5d'
+        
+        The first coarse bar stays complete (its finer bars before that session
+        are still aggregated), like the bars Yahoo returns for the period.
+        """
+        sessions_from = session_window_start(fine, period) if period else None
+        return resample_ohlcv(fine, interval, sessions_from.to_pydatetime() if sessions_from is not None else start)
+    
+    @staticmethod
+    def _fetch_resampled(symbol: str, period: str, interval: str) -> Optional[pd.DataFrame]:
+        """
+        Serve a coarser interval by resampling finer bars
+        
+        Finer intraday bars are used only when the store already covers the
+        window. Weekly/monthly/quarterly bars always come from the daily store,
+        which fetches just the missing daily ranges - so 1d/1wk/1mo/3mo share
+        one upstream series per symbol.
+        """
+        end = datetime.now(timezone.utc)
+        start = period_start(period, end)
+        
+        hist = MarketDataService._read_resampled(symbol, interval, start, end, period)
+        if hist is not None and not hist.empty:
+            return hist
+        
+        if RESAMPLE_SOURCES[interval] == ('1d',):
+            daily = MarketDataService._fetch_via_store(symbol, period, '1d', start=align_start(start, interval))
+            if daily is not None and not daily.empty:
+                hist = MarketDataService._resample_window(daily, interval, start, period)
+                hist.attrs["stale"] = daily.attrs.get("stale", False)
+                print(f"[BARSTORE] ✅ Resampled {symbol} 1d → {interval}: {len(daily)} → {len(hist)} rows")
+                return hist
+        return None
+    
+    @staticmethod
+    def _download_range(
+        symbol: str,
+        interval: str,
+        start: datetime,
+        end: datetime,
+        max_retries: int = 3
+    ) -> pd.DataFrame:
+        """
+        Download bars for an explicit [start, end] range
+        
+        The start is moved back by one bar so the latest (possibly partial) bar
+        already held in the store gets refreshed.
+        """
+        bar = INTERVAL_DELTAS.get(interval, timedelta(days=1))
+        fetch_start = start - bar
+        fetch_end = end + bar
+        if bar >= timedelta(days=1):
+            # 일봉 이상은 날짜 단위로 요청 (end는 exclusive)
+            fetch_start = fetch_start.date()
+            fetch_end = fetch_end.date()
+        
+        last_error = None
+        for attempt in range(max_retries):
+            try:
+                # 재시도 간격은 upstream_limiter가 결정 (429 시 전체 호출자 backoff)
+                hist = get_provider().download(
+                    symbol,
+                    start=fetch_start,
+                    end=fetch_end,
+                    interval=interval
+                )
+                return MarketDataService._flatten_columns(hist)
+            except RateLimitTimeout:
+                raise
+            except Exception as e:
+                last_error = e
+                print(f"[YFINANCE] ⚠️ Range download failed ({type(e).__name__}): {e}")
+        
+        raise ValueError(f"Range download failed for {symbol}: {last_error}")
+    
+    @staticmethod
+    def _download_history(symbol: str, period: str, interval: str, probed: bool = False) -> Optional[pd.DataFrame]:
+        """
+        Download a full period with retries and fallback periods
+        
+        An empty first response is checked with one probe before retrying, so
+        unknown symbols do not walk every retry and fallback period.
+        
+        Args:
+            probed: The symbol was already probed by the caller
+        
+        Returns:
+            Flattened DataFrame, or None/empty if every attempt failed
+        
+        Raises:
+            InvalidSymbolError: if the probe confirms the symbol has no data
+        """
+        print(f"[YFINANCE] Using yf.download() (more stable)")
+        
+        # 요청 간격은 고정 sleep 대신 공유 token bucket(upstream_limiter)으로 제어
+        max_retries = 3
+        hist = None
+        
+        # yf.download()로 시도 (더 안정적)
+        # 원하는 period를 먼저 시도하고, 실패하면 fallback
+        test_periods = [period]
+        
+        # period가 1mo 이상이면 5d도 시도 (더 안정적)
+        if period not in ["5d", "1d"]:
+            # 5d period에 맞는 interval로 조정
+            test_period_5d, test_interval_5d = MarketDataService._validate_period_interval("5d", interval)
+            test_periods.append(("5d", test_interval_5d))
+        
+        for test_period_info in test_periods:
+            # test_period_info가 튜플이면 (period, interval), 아니면 period만
+            if isinstance(test_period_info, tuple):
+                test_period, test_interval = test_period_info
+            else:
+                test_period = test_period_info
+                test_interval = interval
+            
+            print(f"[YFINANCE] Trying period: {test_period}, interval: {test_interval}")
+            for attempt in range(max_retries):
+                try:
+                    print(f"[YFINANCE] Attempt {attempt + 1}/{max_retries}: yf.download('{symbol}', period='{test_period}', interval='{test_interval}')...")
+                    
+                    # yf.download() 사용 (더 안정적)
+                    hist = get_provider().download(
+                        symbol,
+                        period=test_period,
+                        interval=test_interval
+                    )
+                    
+                    print(f"[YFINANCE] ✅ yf.download() completed")
+                    print(f"[YFINANCE] Raw data shape: {hist.shape if hist is not None else 'None'}")
+                    print(f"[YFINANCE] Raw columns: {list(hist.columns) if hist is not None and not hist.empty else 'None'}")
+                    
+                    # MultiIndex 컬럼 처리
+                    if hist is not None and not hist.empty:
+                        hist = MarketDataService._flatten_columns(hist)
+                        
+                        print(f"[YFINANCE] Processed columns: {list(hist.columns)}")
+                        print(f"[YFINANCE] History rows: {len(hist)}")
+                        
+                        if not hist.empty:
+                            # 성공하면 원하는 기간으로 다시 가져오기 (rate limit 피하기 위해 조건부)
+                            if test_period != period and attempt == 0:  # 첫 시도에서만
+                                try:
+                                    print(f"[YFINANCE] Fetching full period: {period}...")
+                                    hist_full = get_provider().download(
+                                        symbol,
+                                        period=period,
+                                        interval=interval
+                                    )
+                                    hist_full = MarketDataService._flatten_columns(hist_full)
+                                    
+                                    if not hist_full.empty:
+                                        hist = hist_full
+                                        print(f"[YFINANCE] ✅ Full period data received: {len(hist)} rows")
+                                except RateLimitTimeout:
+                                    raise
+                                except Exception as e:
+                                    print(f"[YFINANCE] ⚠️ Full period fetch failed: {e}, using test period data")
+                            
+                            break
+                    
+                    if hist is None or hist.empty:
+                        # 빈 응답이 존재하지 않는 심볼 때문인지 한 번만 확인
+                        if not probed and attempt == 0:
+                            probed = True
+                            if MarketDataService._probe_symbol(symbol) is False:
+                                raise unknown_symbol_error(symbol)
+                        print(f"[YFINANCE] ⚠️ Empty data, retrying...")
+                        continue
+                        
+                except (RateLimitTimeout, InvalidSymbolError):
+                    # 공유 예산이 오래 막혀 있거나 없는 심볼이면 재시도/fallback 없이 바로 실패
+                    raise
+                except Exception as e:
+                    error_msg = str(e)
+                    error_type = type(e).__name__
+                    print(f"[YFINANCE] ⚠️ Exception ({error_type}): {error_msg}")
+                    
+                    # Rate limit 에러면 upstream_limiter가 모든 호출자에 backoff 적용 → 다음 시도에서 대기
+                    if is_rate_limit_error(e):
+                        if attempt < max_retries - 1:
+                            print(f"[YFINANCE] Rate limit detected. Retrying after shared backoff...")
+                            continue
+                        else:
+                            print(f"[YFINANCE] ❌ Rate limit: All attempts failed for period {test_period}")
+                            # Rate limit이면 바로 fallback으로 넘어가기
+                            break
+                    elif attempt < max_retries - 1:
+                        print(f"[YFINANCE] Retrying...")
+                        continue
+                    else:
+                        print(f"[YFINANCE] ❌ All attempts failed for period {test_period}")
+            
+            if hist is not None and not hist.empty:
+                break
+        
+        # 히스토리가 없으면 fallback
+        if hist is None or hist.empty:
+            print(f"[YFINANCE] No data, trying fallback periods...")
+            fallback_periods = ["5d", "1d", "1y", "6mo", "3mo", "1mo"]
+            for fallback_period in fallback_periods:
+                try:
+                    print(f"[YFINANCE] Fallback: {fallback_period}...")
+                    test_hist = get_provider().download(
+                        symbol,
+                        period=fallback_period,
+                        interval=interval
+                    )
+                    test_hist = MarketDataService._flatten_columns(test_hist)
+                    
+                    if not test_hist.empty:
+                        print(f"[YFINANCE] ✅ Fallback success: {len(test_hist)} rows")
+                        hist = test_hist
+                        break
+                except RateLimitTimeout:
+                    raise
+                except Exception as e:
+                    print(f"[YFINANCE] ⚠️ Fallback error: {e}")
+                    continue
+        
+        return hist
+    
+    @staticmethod
+    def _build_result(
+        symbol: str,
+        hist: pd.DataFrame,
+        info: Dict[str, Any],
+        layout: str = "rows",
+        since: Optional[pd.Timestamp] = None
+    ) -> Dict[str, Any]:
+        """
+        Build the market data response dictionary from a flattened history DataFrame
+        
+        Args:
+            symbol: Stock or crypto symbol
+            hist: Single-symbol OHLCV DataFrame
+            info: Cached ticker metadata (may be empty)
+            layout: History layout - 'rows' (list of bars) or 'columns' (dict of lists)
+            since: Only include bars newer than this in `history` (price/change use all bars)
+        
+        Returns:
+            Dictionary containing market data
+        """
+        # 데이터 파싱
+        print(f"[YFINANCE] Parsing data...")
+        print(f"[YFINANCE] Available columns: {list(hist.columns)}")
+        
+        # 컬럼 이름 확인 및 정규화
+        open_col, high_col, low_col, close_col, volume_col = find_ohlcv_columns(hist)
+        
+        print(f"[YFINANCE] Using columns - Close: {close_col}, Open: {open_col}, High: {high_col}, Low: {low_col}, Volume: {volume_col}")
+        
+        # 현재 가격
+        current_price = float(hist[close_col].iloc[-1])
+        
+        # 변화량 계산
+        if len(hist) > 1:
+            prev_close = float(hist[close_col].iloc[-2])
+            change = current_price - prev_close
+            change_percent = (change / prev_close) * 100
+        else:
+            change = 0
+            change_percent = 0
+        
+        # 히스토리 데이터 변환 (컬럼 단위 벡터화)
+        history = serialize_history(filter_since(hist, since), layout=layout)
+        
+        return {
+            "symbol": symbol,
+            "current_price": current_price,
+            "change": change,
+            "change_percent": change_percent,
+            "volume": int(hist[volume_col].iloc[-1]) if volume_col and pd.notna(hist[volume_col].iloc[-1]) else 0,
+            "timestamp": datetime.now().isoformat(),
+            "as_of": hist.index[-1].isoformat() if hasattr(hist.index[-1], "isoformat") else str(hist.index[-1]),
+            "stale": bool(hist.attrs.get("stale", False)),
+            "history": history,
+            "info": {
+                "name": info.get('longName', symbol),
+                "sector": info.get('sector'),
+                "industry": info.get('industry'),
+                "market_cap": info.get('marketCap'),
+            }
+        }
+    
+    @staticmethod
+    def _flight_key(
+        symbol: str,
+        period: str,
+        interval: str,
+        layout: str = "rows",
+        since: Optional[pd.Timestamp] = None
+    ) -> tuple:
+        """Normalized single-flight key: (SYMBOL, validated period, validated interval, layout, since)"""
+        period, interval = MarketDataService._validate_period_interval(period, interval)
+        return symbol.strip().upper(), period, interval, layout, since
+    
+    @staticmethod
+    def _cached_result(key: tuple) -> Optional[Dict[str, Any]]:
+        """Result from the shared cache (in-process LRU, then the cross-worker backend)"""
+        if not cache_enabled():
+            return None
+        return get_cache("market_data").get(key)
+    
+    @staticmethod
+    def _cache_result(key: tuple, result: Dict[str, Any]) -> None:
+        """Share a fresh (non-stale) result with other workers for CACHE_MARKET_DATA_TTL"""
+        if cache_enabled():
+            get_cache("market_data").set(key, result, settings.CACHE_MARKET_DATA_TTL if settings else 15.0)
+    
     @staticmethod
     def get_market_data(
         symbol: str = "AAPL",
         period: str = "1mo",
-        interval: str = "1d"
+        interval: str = "1d",
+        layout: str = "rows",
+        since: Optional[pd.Timestamp] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch market data, coalescing concurrent identical requests
+        
+        Recent results are served from the shared cache (all workers); callers
+        share the returned dictionary - treat it as read-only.
+        
+        Args:
+            symbol: Stock or crypto symbol (e.g., 'AAPL', 'TSLA', 'BTC-USD')
+            period: Period to fetch (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
+            interval: Data interval (1m, 2m, 5m, 15m, 30m, 60m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
+            layout: History layout - 'rows' (default) or 'columns'
+            since: Only return bars newer than this timestamp (incremental refresh)
+        
+        Returns:
+            Dictionary containing market data
+        """
+        key = MarketDataService._flight_key(symbol, period, interval, layout, since)
+        cached = MarketDataService._cached_result(key)
+        if cached is not None:
+            return cached
+        return _market_data_flight.do(
+            key,
+            lambda: MarketDataService._fetch_market_data(symbol, period, interval, layout, since)
+        )
+    
+    @staticmethod
+    async def get_market_data_async(
+        symbol: str = "AAPL",
+        period: str = "1mo",
+        interval: str = "1d",
+        layout: str = "rows",
+        since: Optional[pd.Timestamp] = None
+    ) -> Dict[str, Any]:
+        """
+        Async variant of get_market_data for endpoints
+        
+        The fetch runs on the upstream executor; concurrent callers with the same
+        key await the in-flight fetch without occupying a worker thread.
+        """
+        from app.core.executor import run_upstream
+        
+        key = MarketDataService._flight_key(symbol, period, interval, layout, since)
+        cached = MarketDataService._cached_result(key)
+        if cached is not None:
+            return cached
+        return await _market_data_flight.do_async(
+            key,
+            lambda: run_upstream(MarketDataService._fetch_market_data, symbol, period, interval, layout, since)
+        )
+    
+    @staticmethod
+    def _fetch_market_data(
+        symbol: str = "AAPL",
+        period: str = "1mo",
+        interval: str = "1d",
+        layout: str = "rows",
+        since: Optional[pd.Timestamp] = None
     ) -> Dict[str, Any]:
         """
         Fetch market data using yf.download() - more stable than ticker.history()
@@ -75,12 +635,16 @@ class MarketDataService:
             symbol: Stock or crypto symbol (e.g., 'AAPL', 'TSLA', 'BTC-USD')
             period: Period to fetch (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
             interval: Data interval (1m, 2m, 5m, 15m, 30m, 60m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
+            layout: History layout - 'rows' (default) or 'columns'
+            since: Only return bars newer than this timestamp (incremental refresh)
         
         Returns:
             Dictionary containing market data
         """
         if settings and not settings.YFINANCE_ENABLED:
             raise ValueError("YFinance is not enabled in settings")
+        # 형식이 잘못됐거나 없는 것으로 확인된 심볼은 upstream 호출 없이 바로 실패
+        check_symbol(symbol)
         
         try:
             print(f"[YFINANCE] ========== START get_market_data ==========")
@@ -90,170 +654,33 @@ class MarketDataService:
             # Period와 Interval 조합 검증 및 조정
             period, interval = MarketDataService._validate_period_interval(period, interval)
             print(f"[YFINANCE] Using period={period}, interval={interval}")
-            print(f"[YFINANCE] Using yf.download() (more stable)")
-            
-            # Rate limiting 방지 - 더 긴 대기 시간
-            time.sleep(0.5)
+            MarketDataService._note_request(symbol, period, interval)
             
-            max_retries = 3
             hist = None
-            info = {}
+            probed = False
             
-            # yf.download()로 시도 (더 안정적)
-            # 원하는 period를 먼저 시도하고, 실패하면 fallback
-            test_periods = [period]
-            
-            # period가 1mo 이상이면 5d도 시도 (더 안정적)
-            if period not in ["5d", "1d"]:
-                # 5d period에 맞는 interval로 조정
-                test_period_5d, test_interval_5d = MarketDataService._validate_period_interval("5d", interval)
-                test_periods.append(("5d", test_interval_5d))
-            
-            for test_period_info in test_periods:
-                # test_period_info가 튜플이면 (period, interval), 아니면 period만
-                if isinstance(test_period_info, tuple):
-                    test_period, test_interval = test_period_info
-                else:
-                    test_period = test_period_info
-                    test_interval = interval
-                
-                print(f"[YFINANCE] Trying period: {test_period}, interval: {test_interval}")
-                for attempt in range(max_retries):
-                    try:
-                        print(f"[YFINANCE] Attempt {attempt + 1}/{max_retries}: yf.download('{symbol}', period='{test_period}', interval='{test_interval}')...")
-                        
-                        # Rate limit 방지를 위한 추가 대기
-                        if attempt > 0:
-                            wait_time = min(2 * attempt, 5)  # 최대 5초
-                            print(f"[YFINANCE] Waiting {wait_time}s before retry...")
-                            time.sleep(wait_time)
-                        
-                        # yf.download() 사용 (더 안정적)
-                        hist = yf.download(
-                            symbol,
-                            period=test_period,
-                            interval=test_interval,
-                            progress=False,
-                            threads=True
-                        )
-                        
-                        print(f"[YFINANCE] ✅ yf.download() completed")
-                        print(f"[YFINANCE] Raw data shape: {hist.shape if hist is not None else 'None'}")
-                        print(f"[YFINANCE] Raw columns: {list(hist.columns) if hist is not None and not hist.empty else 'None'}")
-                        
-                        # MultiIndex 컬럼 처리
-                        if hist is not None and not hist.empty:
-                            if isinstance(hist.columns, pd.MultiIndex):
-                                print(f"[YFINANCE] MultiIndex detected, processing...")
-                                # 여러 심볼이 있을 수 있음
-                                if len(hist.columns.levels[1]) == 1:
-                                    # 단일 심볼인 경우
-                                    symbol_name = hist.columns.levels[1][0]
-                                    hist = hist.xs(symbol_name, axis=1, level=1, drop_level=True)
-                                    print(f"[YFINANCE] Extracted single symbol: {symbol_name}")
-                                else:
-                                    # 여러 심볼인 경우 첫 번째 레벨만 사용
-                                    hist.columns = hist.columns.get_level_values(0)
-                                    print(f"[YFINANCE] Using first level columns")
-                            
-                            print(f"[YFINANCE] Processed columns: {list(hist.columns)}")
-                            print(f"[YFINANCE] History rows: {len(hist)}")
-                            
-                            if not hist.empty:
-                                # 성공하면 원하는 기간으로 다시 가져오기 (rate limit 피하기 위해 조건부)
-                                if test_period != period and attempt == 0:  # 첫 시도에서만
-                                    try:
-                                        print(f"[YFINANCE] Fetching full period: {period}...")
-                                        time.sleep(0.5)  # Rate limit 방지
-                                        hist_full = yf.download(
-                                            symbol,
-                                            period=period,
-                                            interval=interval,
-                                            progress=False,
-                                            threads=True
-                                        )
-                                        
-                                        # MultiIndex 처리
-                                        if isinstance(hist_full.columns, pd.MultiIndex):
-                                            if len(hist_full.columns.levels[1]) == 1:
-                                                symbol_name = hist_full.columns.levels[1][0]
-                                                hist_full = hist_full.xs(symbol_name, axis=1, level=1, drop_level=True)
-                                            else:
-                                                hist_full.columns = hist_full.columns.get_level_values(0)
-                                        
-                                        if not hist_full.empty:
-                                            hist = hist_full
-                                            print(f"[YFINANCE] ✅ Full period data received: {len(hist)} rows")
-                                    except Exception as e:
-                                        print(f"[YFINANCE] ⚠️ Full period fetch failed: {e}, using test period data")
-                                
-                                break
-                        
-                        if hist is None or hist.empty:
-                            print(f"[YFINANCE] ⚠️ Empty data, retrying...")
-                            if attempt < max_retries - 1:
-                                time.sleep(1)
-                            continue
-                            
-                    except Exception as e:
-                        error_msg = str(e)
-                        error_type = type(e).__name__
-                        print(f"[YFINANCE] ⚠️ Exception ({error_type}): {error_msg}")
-                        
-                        # Rate limit 에러인 경우 더 긴 대기
-                        if "rate limit" in error_msg.lower() or "429" in error_msg or "YFRateLimitError" in error_type:
-                            if attempt < max_retries - 1:
-                                wait_time = min((attempt + 1) * 3, 10)  # 최대 10초
-                                print(f"[YFINANCE] Rate limit detected. Waiting {wait_time}s before retry...")
-                                time.sleep(wait_time)
-                                continue
-                            else:
-                                print(f"[YFINANCE] ❌ Rate limit: All attempts failed for period {test_period}")
-                                # Rate limit이면 바로 fallback으로 넘어가기
-                                break
-                        elif attempt < max_retries - 1:
-                            wait_time = (attempt + 1) * 1
-                            print(f"[YFINANCE] Retrying in {wait_time}s...")
-                            time.sleep(wait_time)
-                            continue
-                        else:
-                            print(f"[YFINANCE] ❌ All attempts failed for period {test_period}")
-                
-                if hist is not None and not hist.empty:
-                    break
-                
-                if test_period != test_periods[-1]:
-                    time.sleep(0.5)
+            # 로컬 bar store에서 먼저 조회하고, 빠진 구간(tail/gap)만 upstream에서 가져오기
+            if MarketDataService._bar_store_enabled() and period in STORE_PERIODS:
+                try:
+                    # 더 작은 interval을 이미 가지고 있으면 재집계 (1wk/1mo/3mo는 일봉에서)
+                    if can_resample(interval):
+                        hist = MarketDataService._fetch_resampled(symbol, period, interval)
+                    if hist is None or hist.empty:
+                        hist = MarketDataService._fetch_via_store(symbol, period, interval)
+                    if hist is None or hist.empty:
+                        # 구간 다운로드가 비었으면 전체 다운로드(재시도/fallback) 전에 심볼 존재 확인
+                        probed = True
+                        if MarketDataService._probe_symbol(symbol) is False:
+                            raise unknown_symbol_error(symbol)
+                except (RateLimitTimeout, InvalidSymbolError):
+                    # 전체 다운로드로 넘어가도 같은 upstream이므로 바로 실패 (→ stale 응답)
+                    raise
+                except Exception as e:
+                    print(f"[BARSTORE] ⚠️ Store path failed: {e}, falling back to full download")
+                    hist = None
             
-            # 히스토리가 없으면 fallback
             if hist is None or hist.empty:
-                print(f"[YFINANCE] No data, trying fallback periods...")
-                fallback_periods = ["5d", "1d", "1y", "6mo", "3mo", "1mo"]
-                for fallback_period in fallback_periods:
-                    try:
-                        print(f"[YFINANCE] Fallback: {fallback_period}...")
-                        test_hist = yf.download(
-                            symbol,
-                            period=fallback_period,
-                            interval=interval,
-                            progress=False,
-                            threads=True
-                        )
-                        
-                        # MultiIndex 처리
-                        if isinstance(test_hist.columns, pd.MultiIndex):
-                            if len(test_hist.columns.levels[1]) == 1:
-                                test_hist = test_hist.xs(test_hist.columns.levels[1][0], axis=1, level=1, drop_level=True)
-                            else:
-                                test_hist.columns = test_hist.columns.get_level_values(0)
-                        
-                        if not test_hist.empty:
-                            print(f"[YFINANCE] ✅ Fallback success: {len(test_hist)} rows")
-                            hist = test_hist
-                            break
-                    except Exception as e:
-                        print(f"[YFINANCE] ⚠️ Fallback error: {e}")
-                        continue
+                hist = MarketDataService._download_history(symbol, period, interval, probed=probed)
             
             if hist is None or hist.empty:
                 raise ValueError(
@@ -261,103 +688,529 @@ class MarketDataService:
                     f"Please check symbol format and try again."
                 )
             
-            # info 가져오기
-            print(f"[YFINANCE] Fetching ticker.info...")
-            try:
-                ticker = yf.Ticker(symbol)
-                info = ticker.info
-                if not info:
-                    info = {}
-            except Exception as e:
-                print(f"[YFINANCE] ⚠️ Info fetch failed: {e}")
-                info = {}
-            
-            # 데이터 파싱
-            print(f"[YFINANCE] Parsing data...")
-            print(f"[YFINANCE] Available columns: {list(hist.columns)}")
-            
-            # 컬럼 이름 확인 및 정규화
-            close_col = None
-            open_col = None
-            high_col = None
-            low_col = None
-            volume_col = None
-            
-            for col in hist.columns:
-                col_lower = str(col).lower()
-                if 'close' in col_lower and close_col is None:
-                    close_col = col
-                elif 'open' in col_lower and open_col is None:
-                    open_col = col
-                elif 'high' in col_lower and high_col is None:
-                    high_col = col
-                elif 'low' in col_lower and low_col is None:
-                    low_col = col
-                elif 'volume' in col_lower and volume_col is None:
-                    volume_col = col
+            # info는 메타데이터 캐시에서 (가격 응답이 .info 호출을 기다리지 않도록, 없으면 백그라운드 갱신)
+            info = get_cached_info(symbol)
             
-            # 기본값 설정
-            if close_col is None:
-                close_col = 'Close' if 'Close' in hist.columns else hist.columns[0]
-            if open_col is None:
-                open_col = 'Open' if 'Open' in hist.columns else close_col
-            if high_col is None:
-                high_col = 'High' if 'High' in hist.columns else close_col
-            if low_col is None:
-                low_col = 'Low' if 'Low' in hist.columns else close_col
-            if volume_col is None:
-                volume_col = 'Volume' if 'Volume' in hist.columns else None
-            
-            print(f"[YFINANCE] Using columns - Close: {close_col}, Open: {open_col}, High: {high_col}, Low: {low_col}, Volume: {volume_col}")
-            
-            # 현재 가격
-            current_price = float(hist[close_col].iloc[-1])
-            
-            # 변화량 계산
-            if len(hist) > 1:
-                prev_close = float(hist[close_col].iloc[-2])
-                change = current_price - prev_close
-                change_percent = (change / prev_close) * 100
+            result = MarketDataService._build_result(symbol, hist, info, layout=layout, since=since)
+            if result["stale"]:
+                MarketDataService._schedule_revalidate(symbol, period, interval, layout)
             else:
-                change = 0
-                change_percent = 0
-            
-            # 히스토리 데이터 변환
-            history = []
-            for idx, row in hist.iterrows():
-                history.append({
-                    "date": idx.isoformat() if hasattr(idx, 'isoformat') else str(idx),
-                    "open": float(row[open_col]),
-                    "high": float(row[high_col]),
-                    "low": float(row[low_col]),
-                    "close": float(row[close_col]),
-                    "volume": int(row[volume_col]) if volume_col and pd.notna(row[volume_col]) else 0
-                })
-            
-            result = {
-                "symbol": symbol,
-                "current_price": current_price,
-                "change": change,
-                "change_percent": change_percent,
-                "volume": int(hist[volume_col].iloc[-1]) if volume_col and pd.notna(hist[volume_col].iloc[-1]) else 0,
-                "timestamp": datetime.now().isoformat(),
-                "history": history,
-                "info": {
-                    "name": info.get('longName', symbol),
-                    "sector": info.get('sector'),
-                    "industry": info.get('industry'),
-                    "market_cap": info.get('marketCap'),
-                }
-            }
+                MarketDataService._remember_good(symbol, period, interval, layout, result, since)
+                MarketDataService._cache_result(
+                    MarketDataService._flight_key(symbol, period, interval, layout, since), result
+                )
             
-            print(f"[YFINANCE] ✅ Returning result with {len(history)} history points")
+            print(f"[YFINANCE] ✅ Returning result with {len(hist)} history points")
             print(f"[YFINANCE] ========== END get_market_data ==========")
             return result
             
+        except RateLimitTimeout as e:
+            # circuit open / 한도 초과: 마지막 정상 응답이 있으면 재시도 없이 바로 stale 응답
+            stale = MarketDataService._serve_stale(symbol, period, interval, layout, e, since)
+            if stale is None:
+                raise
+            return stale
         except ValueError:
             raise
         except Exception as e:
             error_msg = str(e)
             print(f"[YFINANCE] ❌ Error: {error_msg}")
             raise ValueError(f"Error fetching market data for {symbol}: {error_msg}")
-
+    
+    @staticmethod
+    def _probe_symbol(symbol: str) -> Optional[bool]:
+        """
+        Check with one 5d/1d download whether a symbol has any data
+        
+        Symbols the bar store or metadata cache already know are not probed.
+        Bars from a successful probe are kept in the store.
+        
+        Returns:
+            True if the symbol has data, False if it was confirmed unknown
+            (and negatively cached), None if it could not be decided
+        """
+        if has_local_data(symbol):
+            return True
+        print(f"[SYMBOL] Probing {symbol} (5d/1d)...")
+        try:
+            hist = MarketDataService._flatten_columns(get_provider().download(symbol, period="5d", interval="1d"))
+        except RateLimitTimeout:
+            raise
+        except Exception as e:
+            # 네트워크 오류 등은 "없는 심볼"의 근거가 아님
+            print(f"[SYMBOL] ⚠️ Probe failed for {symbol}: {e}")
+            return None
+        
+        if hist is None or hist.empty:
+            get_negative_cache().add(symbol, "no bars in 5d/1d probe")
+            return False
+        if MarketDataService._bar_store_enabled():
+            end = datetime.now(timezone.utc)
+            # 5d는 세션 수 기준이므로 실제로 받은 첫 바부터 커버리지로 기록
+            start = pd.Timestamp(hist.index[0]).to_pydatetime()
+            MarketDataService._store_bars(symbol.strip().upper(), "1d", hist, start, end)
+        return True
+    
+    @staticmethod
+    def validate_symbol(symbol: str) -> bool:
+        """
+        Check whether a symbol exists, cheapest source first
+        
+        Format check and negative cache, then local bar store / metadata cache,
+        and only then one 5d/1d probe upstream (whose result is cached either way).
+        
+        Raises:
+            RateLimitTimeout: if the probe is needed but upstream is unavailable
+        """
+        try:
+            check_symbol(symbol)
+        except InvalidSymbolError:
+            return False
+        # 확인할 수 없는 경우(None)는 존재하는 것으로 간주 - 실제 조회에서 판단
+        return MarketDataService._probe_symbol(symbol) is not False
+    
+    @staticmethod
+    def _note_request(symbol: str, period: str, interval: str) -> None:
+        """Record a user-facing request (validated period/interval) for prefetching"""
+        key = (symbol.strip().upper(), period, interval)
+        with _recent_requests_lock:
+            _recent_requests[key] = time.time()
+            _recent_requests.move_to_end(key)
+            while len(_recent_requests) > _RECENT_REQUESTS_MAX:
+                _recent_requests.popitem(last=False)
+    
+    @staticmethod
+    def recent_requests(max_age: float, limit: int) -> List[tuple[str, str, str]]:
+        """
+        Most recently requested (symbol, period, interval) keys
+        
+        Args:
+            max_age: Ignore keys not requested within this many seconds
+            limit: Maximum number of keys (newest first)
+        """
+        cutoff = time.time() - max_age
+        with _recent_requests_lock:
+            keys = [key for key, at in reversed(_recent_requests.items()) if at >= cutoff]
+        return keys[:limit]
+    
+    @staticmethod
+    def warm(symbol: str, period: str = "1mo", interval: str = "1d") -> bool:
+        """
+        Refresh the bar store for a key ahead of demand (no response is built)
+        
+        Fetches only the missing/expired ranges, so a warm key costs at most one
+        tail request. Returns False if the key is not served from the store.
+        """
+        period, interval = MarketDataService._validate_period_interval(period, interval)
+        if not MarketDataService._bar_store_enabled() or period not in STORE_PERIODS:
+            return False
+        symbol = symbol.strip().upper()
+        hist = None
+        if can_resample(interval):
+            hist = MarketDataService._fetch_resampled(symbol, period, interval)
+        if hist is None or hist.empty:
+            hist = MarketDataService._fetch_via_store(symbol, period, interval)
+        return hist is not None and not hist.empty and not hist.attrs.get("stale", False)
+    
+    @staticmethod
+    def _remember_good(
+        symbol: str,
+        period: str,
+        interval: str,
+        layout: str,
+        result: Dict[str, Any],
+        since: Optional[pd.Timestamp] = None
+    ) -> None:
+        """Keep the latest successful result per key (bounded LRU) for stale responses"""
+        key = MarketDataService._flight_key(symbol, period, interval, layout, since)
+        limit = settings.MARKET_DATA_STALE_ENTRIES if settings else 512
+        with _last_good_lock:
+            _last_good[key] = (result, time.time())
+            _last_good.move_to_end(key)
+            while len(_last_good) > limit:
+                _last_good.popitem(last=False)
+    
+    @staticmethod
+    def _serve_stale(
+        symbol: str,
+        period: str,
+        interval: str,
+        layout: str,
+        error: Exception,
+        since: Optional[pd.Timestamp] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Return the last good result flagged as stale (and schedule a recovery probe), or None"""
+        key = MarketDataService._flight_key(symbol, period, interval, layout, since)
+        with _last_good_lock:
+            entry = _last_good.get(key)
+        if entry is None:
+            return None
+        result, stored_at = entry
+        print(f"[YFINANCE] ⚠️ Upstream unavailable ({error}), serving stale result for {symbol}")
+        MarketDataService._schedule_revalidate(symbol, period, interval, layout)
+        return {
+            **result,
+            "stale": True,
+            "stale_age_sec": round(time.time() - stored_at, 1),
+        }
+    
+    @staticmethod
+    def _schedule_revalidate(symbol: str, period: str, interval: str, layout: str) -> None:
+        """
+        Refresh one key in the background once the circuit allows a probe
+        
+        Only one refresh is pending per process; when it succeeds the circuit
+        closes and later requests go upstream again normally.
+        """
+        global _revalidate_pending
+        with _revalidate_lock:
+            if _revalidate_pending:
+                return
+            _revalidate_pending = True
+        
+        def revalidate():
+            global _revalidate_pending
+            try:
+                MarketDataService.get_market_data(symbol, period, interval, layout)
+            except Exception as e:
+                print(f"[YFINANCE] ⚠️ Background revalidation failed for {symbol}: {e}")
+            finally:
+                with _revalidate_lock:
+                    _revalidate_pending = False
+        
+        timer = threading.Timer(upstream_breaker.retry_in() + 0.1, revalidate)
+        timer.daemon = True
+        timer.start()
+    
+    @staticmethod
+    def _split_batch_frame(hist: pd.DataFrame, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+        """
+        Split a multi-ticker yf.download() frame into per-symbol DataFrames
+        
+        Rows where a symbol has no bar at all (e.g. holidays on one exchange only)
+        are dropped from that symbol's frame.
+        """
+        frames = {}
+        if hist is None or hist.empty:
+            return frames
+        
+        if not isinstance(hist.columns, pd.MultiIndex):
+            # 심볼이 하나면 yfinance 버전에 따라 단일 레벨 컬럼으로 반환됨
+            if len(symbols) == 1:
+                frames[symbols[0]] = hist.dropna(how='all')
+            return frames
+        
+        tickers = set(hist.columns.get_level_values(1))
+        for symbol in symbols:
+            if symbol not in tickers:
+                continue
+            frame = hist.xs(symbol, axis=1, level=1, drop_level=True).dropna(how='all')
+            if not frame.empty:
+                frames[symbol] = frame
+        return frames
+    
+    @staticmethod
+    def _refresh_tails(
+        tails: Dict[str, datetime],
+        interval: str,
+        start: datetime,
+        end: datetime
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch the missing tails of several stored symbols with one range download
+        
+        Args:
+            tails: Symbol -> start of the range the store is missing
+        
+        Returns:
+            Store frames for [start, end] of the symbols that could be refreshed
+            (the rest need a full download)
+        """
+        symbols = list(tails)
+        # _download_range()와 같이 마지막 (진행 중일 수 있는) 바부터 다시 조회
+        bar = INTERVAL_DELTAS.get(interval, timedelta(days=1))
+        fetch_start = min(tails.values()) - bar
+        fetch_end = end + bar
+        if bar >= timedelta(days=1):
+            fetch_start = fetch_start.date()
+            fetch_end = fetch_end.date()
+        
+        store = get_bar_store()
+        stale = False
+        fetched: Dict[str, pd.DataFrame] = {}
+        try:
+            print(f"[BARSTORE] Fetching tails: {len(symbols)} symbols {interval} from {fetch_start}")
+            hist = get_provider().download(
+                symbols,
+                start=fetch_start,
+                end=fetch_end,
+                interval=interval,
+                group_by='column'
+            )
+            fetched = MarketDataService._split_batch_frame(hist, symbols)
+        except RateLimitTimeout as e:
+            # upstream 장애/한도 초과: 저장된 bar를 stale로 응답 (_fetch_via_store와 동일)
+            print(f"[BARSTORE] ⚠️ Upstream unavailable ({e}), serving stale bars")
+            stale = True
+        except Exception as e:
+            print(f"[BARSTORE] ⚠️ Tail download failed ({type(e).__name__}): {e}")
+            return {}
+        
+        frames: Dict[str, pd.DataFrame] = {}
+        for symbol, gap_start in tails.items():
+            if not stale:
+                frame = fetched.get(symbol)
+                if frame is not None:
+                    MarketDataService._store_bars(symbol, interval, frame, gap_start, end)
+                else:
+                    # 새 바가 없는 구간(주말/휴장)도 조회한 것으로 기록
+                    store.merge(symbol, interval, None, gap_start, end)
+            hist = store.read(symbol, interval, start, end)
+            if hist is not None and not hist.empty:
+                hist.attrs["stale"] = stale
+                frames[symbol] = hist
+        return frames
+    
+    @staticmethod
+    def get_market_data_batch(
+        symbols: List[str],
+        period: str = "1mo",
+        interval: str = "1d",
+        layout: str = "rows",
+        max_retries: int = 3
+    ) -> Dict[str, Any]:
+        """
+        Fetch market data for several symbols with a single yf.download() call
+        
+        Symbols already fully covered by the local bar store are served from it;
+        the rest are downloaded together in one upstream round trip.
+        
+        Args:
+            symbols: List of stock or crypto symbols
+            period: Period to fetch (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
+            interval: Data interval (1m, 2m, 5m, 15m, 30m, 60m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
+            layout: History layout - 'rows' (default) or 'columns'
+            max_retries: Attempts for the batch download
+        
+        Returns:
+            Dictionary with per-symbol results and per-symbol errors
+        """
+        period, interval = MarketDataService._validate_period_interval(period, interval)
+        print(f"[YFINANCE] ========== START get_market_data_batch ==========")
+        frames, errors = MarketDataService.get_history_frames_batch(symbols, period, interval, max_retries)
+        
+        results = {}
+        for symbol, frame in frames.items():
+            try:
+                results[symbol] = MarketDataService._build_result(symbol, frame, get_cached_info(symbol), layout=layout)
+            except Exception as e:
+                errors[symbol] = f"Error parsing market data for {symbol}: {e}"
+        
+        print(f"[YFINANCE] ✅ Batch result: {len(results)} ok, {len(errors)} failed")
+        print(f"[YFINANCE] ========== END get_market_data_batch ==========")
+        return {
+            "period": period,
+            "interval": interval,
+            "results": results,
+            "errors": errors,
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    @staticmethod
+    def get_history_frames_batch(
+        symbols: List[str],
+        period: str = "1mo",
+        interval: str = "1d",
+        max_retries: int = 3
+    ) -> Tuple[Dict[str, pd.DataFrame], Dict[str, str]]:
+        """
+        OHLCV DataFrames for several symbols (bar store first, then one yf.download())
+        
+        Stored symbols that only miss their latest bars are refreshed together
+        with one range download; only symbols without stored history download
+        the whole period.
+        
+        Returns:
+            (frames, errors) - frames in input order keyed by normalized symbol,
+            errors for symbols that were rejected or returned no data
+        """
+        if settings and not settings.YFINANCE_ENABLED:
+            raise ValueError("YFinance is not enabled in settings")
+        
+        # 중복 제거 + 대문자 정규화 (yf.download()도 대문자 티커로 반환)
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s and s.strip()))
+        if not symbols:
+            raise ValueError("No symbols given")
+        
+        period, interval = MarketDataService._validate_period_interval(period, interval)
+        print(f"[YFINANCE] Symbols ({len(symbols)}): {', '.join(symbols)}")
+        print(f"[YFINANCE] Using period={period}, interval={interval}")
+        # 형식 오류/없는 것으로 확인된 심볼은 다운로드 대상에서 제외
+        rejected: Dict[str, str] = {}
+        for symbol in symbols:
+            try:
+                check_symbol(symbol)
+            except InvalidSymbolError as e:
+                rejected[symbol] = str(e)
+        for symbol in symbols:
+            if symbol not in rejected:
+                MarketDataService._note_request(symbol, period, interval)
+        
+        frames: Dict[str, pd.DataFrame] = {}
+        pending = [symbol for symbol in symbols if symbol not in rejected]
+        use_store = MarketDataService._bar_store_enabled() and period in STORE_PERIODS
+        end = datetime.now(timezone.utc)
+        start = period_start(period, end) if use_store else None
+        
+        if use_store:
+            store = get_bar_store()
+            candidates, pending = pending, []
+            tails: Dict[str, datetime] = {}
+            for symbol in candidates:
+                hist = None
+                MarketDataService._seed_store(symbol, interval)
+                missing = store.missing_ranges(symbol, interval, start, end)
+                if not missing:
+                    hist = store.read(symbol, interval, start, end)
+                elif can_resample(interval):
+                    hist = MarketDataService._read_resampled(symbol, interval, start, end, period)
+                if hist is not None and not hist.empty:
+                    frames[symbol] = hist
+                elif len(missing) == 1 and missing[0][0] > start:
+                    # 앞쪽은 저장돼 있고 최근 구간만 빠짐 → 전체 기간 대신 꼬리만 조회
+                    tails[symbol] = missing[0][0]
+                else:
+                    pending.append(symbol)
+            if tails:
+                frames.update(MarketDataService._refresh_tails(tails, interval, start, end))
+                pending.extend(symbol for symbol in tails if symbol not in frames)
+            print(f"[BARSTORE] Batch: {len(frames)} served from store, {len(pending)} to download")
+        
+        if pending:
+            hist = None
+            last_error = None
+            for attempt in range(max_retries):
+                try:
+                    print(f"[YFINANCE] Attempt {attempt + 1}/{max_retries}: yf.download({len(pending)} symbols, period='{period}', interval='{interval}')...")
+                    hist = get_provider().download(
+                        pending,
+                        period=period,
+                        interval=interval,
+                        group_by='column'
+                    )
+                    break
+                except RateLimitTimeout:
+                    raise
+                except Exception as e:
+                    last_error = e
+                    print(f"[YFINANCE] ⚠️ Batch download failed ({type(e).__name__}): {e}")
+            
+            if hist is None and last_error is not None:
+                raise ValueError(f"Error fetching batch market data: {last_error}")
+            
+            fetched = MarketDataService._split_batch_frame(hist, pending)
+            for symbol, frame in fetched.items():
+                frames[symbol] = frame
+                if use_store:
+                    # 세션 period(1d/5d)는 넓힌 창 전체가 아니라 실제로 받은 첫 바부터 커버리지로 기록
+                    covered_from = pd.Timestamp(frame.index[0]).to_pydatetime() if period in SESSION_PERIODS else start
+                    try:
+                        MarketDataService._store_bars(symbol, interval, frame, covered_from, end)
+                    except Exception as e:
+                        print(f"[BARSTORE] ⚠️ Failed to store {symbol}: {e}")
+        
+        ordered: Dict[str, pd.DataFrame] = {}
+        errors: Dict[str, str] = {}
+        for symbol in symbols:
+            if symbol in rejected:
+                errors[symbol] = rejected[symbol]
+                continue
+            frame = frames.get(symbol)
+            frame = trim_sessions(frame, period, interval)
+            if frame is None or frame.empty:
+                errors[symbol] = f"No data found for symbol: {symbol}"
+                continue
+            ordered[symbol] = frame
+        return ordered, errors
+    
+    @staticmethod
+    def get_current_price(symbol: str) -> float:
+        """
+        Get the latest close price for a symbol
+        
+        Served from the bar store when its daily bars are fresh.
+        
+        Args:
+            symbol: Stock or crypto symbol
+        
+        Returns:
+            Current price
+        """
+        check_symbol(symbol)
+        hist = None
+        if MarketDataService._bar_store_enabled():
+            try:
+                hist = MarketDataService._fetch_via_store(symbol, "5d", "1d")
+            except RateLimitTimeout:
+                raise
+            except Exception as e:
+                print(f"[BARSTORE] ⚠️ Store path failed: {e}")
+        
+        try:
+            if hist is None or hist.empty:
+                hist = MarketDataService._flatten_columns(get_provider().download(
+                    symbol,
+                    period="5d",
+                    interval="1d"
+                ))
+        except RateLimitTimeout:
+            raise
+        except Exception as e:
+            raise ValueError(f"Error fetching current price for {symbol}: {str(e)}")
+        
+        if hist is None or hist.empty:
+            raise ValueError(f"No price data available for {symbol}")
+        
+        _, _, _, close_col, _ = find_ohlcv_columns(hist)
+        closes = hist[close_col].dropna()
+        if closes.empty:
+            raise ValueError(f"No price data available for {symbol}")
+        return float(closes.iloc[-1])
+    
+    @staticmethod
+    def get_historical_price(symbol: str, date: datetime) -> Optional[float]:
+        """
+        Get the close price on (or the last trading day before) a specific date
+        
+        Args:
+            symbol: Stock or crypto symbol
+            date: Target date
+        
+        Returns:
+            Close price for the date, or None if not available
+        """
+        try:
+            target = pd.Timestamp(date)
+            if target.tzinfo is None:
+                target = target.tz_localize("UTC")
+            # 주말/휴장일을 고려해 1주일 구간을 조회한 뒤 target 이전 마지막 종가 사용
+            hist = MarketDataService._download_range(
+                symbol,
+                "1d",
+                (target - pd.Timedelta(days=7)).to_pydatetime(),
+                target.to_pydatetime()
+            )
+            if hist is None or hist.empty:
+                return None
+            
+            _, _, _, close_col, _ = find_ohlcv_columns(hist)
+            closes = hist[close_col].dropna()
+            closes = closes[closes.index.date <= target.date()]
+            if closes.empty:
+                return None
+            return float(closes.iloc[-1])
+        except RateLimitTimeout:
+            raise
+        except Exception as e:
+            print(f"Error fetching historical price for {symbol} on {date}: {str(e)}")
+            return None
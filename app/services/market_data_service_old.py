@@ -1,11 +1,11 @@
 """
 Market data service for fetching stock/crypto market data using yfinance
 """
-import yfinance as yf
 import pandas as pd
 import time
 from datetime import datetime
 from typing import Optional, Dict, Any
+from app.services.providers import get_provider
 
 try:
     from app.core.config import settings
@@ -83,12 +83,10 @@ class MarketDataService:
                         
                         # yf.download() 사용 (더 안정적)
                         try:
-                            hist = yf.download(
-                                symbol, 
-                                period=test_period, 
-                                interval=interval,
-                                progress=False,
-                                show_errors=False
+                            hist = get_provider().download(
+                                symbol,
+                                period=test_period,
+                                interval=interval
                             )
                             print(f"[YFINANCE] ✅ yf.download() completed successfully")
                             
@@ -109,20 +107,17 @@ class MarketDataService:
                             print(f"[YFINANCE] ⚠️ yf.download() failed: {download_err}")
                             # Fallback: ticker.history() 시도
                             print(f"[YFINANCE] Falling back to ticker.history()...")
-                            ticker = yf.Ticker(symbol)
-                            hist = ticker.history(period=test_period, interval=interval)
+                            hist = get_provider().history(symbol, period=test_period, interval=interval)
                             print(f"[YFINANCE] ✅ ticker.history() fallback successful")
                         
                         if hist is not None and not hist.empty:
                             # 성공하면 원하는 기간으로 다시 가져오기
                             if test_period != period:
                                 try:
-                                    hist_full = yf.download(
+                                    hist_full = get_provider().download(
                                         symbol,
                                         period=period,
-                                        interval=interval,
-                                        progress=False,
-                                        show_errors=False
+                                        interval=interval
                                     )
                                     # MultiIndex 처리
                                     if isinstance(hist_full.columns, pd.MultiIndex):
@@ -199,7 +194,7 @@ class MarketDataService:
                             pass
                         
                         try:
-                            test_hist = ticker.history(period=fallback_period, interval=interval)
+                            test_hist = get_provider().history(symbol, period=fallback_period, interval=interval)
                         finally:
                             try:
                                 signal.alarm(0)
@@ -240,7 +235,7 @@ class MarketDataService:
             # info 가져오기 (실패해도 계속 진행)
             print(f"[YFINANCE] Fetching ticker.info...")
             try:
-                info = ticker.info
+                info = get_provider().info(symbol)
                 print(f"[YFINANCE] ✅ Info received: {len(info) if info else 0} keys")
                 if not info:
                     info = {}
@@ -321,13 +316,12 @@ class MarketDataService:
             Current price
         """
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            info = get_provider().info(symbol)
             current_price = info.get('currentPrice')
             
             if current_price is None:
                 # Fallback to latest close price
-                hist = ticker.history(period="1d", interval="1d")
+                hist = get_provider().history(symbol, period="1d", interval="1d")
                 if not hist.empty:
                     current_price = float(hist['Close'].iloc[-1])
                 else:
@@ -350,9 +344,8 @@ class MarketDataService:
             Close price for the date, or None if not available
         """
         try:
-            ticker = yf.Ticker(symbol)
             # Fetch data around the target date
-            hist = ticker.history(start=date, end=date, interval="1d")
+            hist = get_provider().history(symbol, start=date, end=date, interval="1d")
             
             if not hist.empty:
                 return float(hist['Close'].iloc[0])
@@ -365,8 +358,7 @@ class MarketDataService:
     def validate_symbol(symbol: str) -> bool:
         """Validate if a symbol exists"""
         try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="5d", interval="1d")
+            hist = get_provider().history(symbol, period="5d", interval="1d")
             return not hist.empty
         except:
             return False
@@ -1,11 +1,12 @@
 """
 Market data service using yf.download() - more stable than ticker.history()
 """
-import yfinance as yf
 import pandas as pd
 import time
 from datetime import datetime
 from typing import Optional, Dict, Any
+from app.services.history_serializer import find_ohlcv_columns, serialize_history
+from app.services.providers import get_provider
 
 try:
     from app.core.config import settings
@@ -59,13 +60,10 @@ class MarketDataService:
                         print(f"[YFINANCE] Attempt {attempt + 1}/{max_retries}: yf.download('{symbol}', period='{test_period}', interval='{interval}')...")
                         
                         # yf.download() 사용 (더 안정적)
-                        hist = yf.download(
+                        hist = get_provider().download(
                             symbol,
                             period=test_period,
-                            interval=interval,
-                            progress=False,
-                            show_errors=False,
-                            threads=True
+                            interval=interval
                         )
                         
                         print(f"[YFINANCE] ✅ yf.download() completed")
@@ -95,13 +93,10 @@ class MarketDataService:
                                 if test_period != period:
                                     try:
                                         print(f"[YFINANCE] Fetching full period: {period}...")
-                                        hist_full = yf.download(
+                                        hist_full = get_provider().download(
                                             symbol,
                                             period=period,
-                                            interval=interval,
-                                            progress=False,
-                                            show_errors=False,
-                                            threads=True
+                                            interval=interval
                                         )
                                         
                                         # MultiIndex 처리
@@ -152,13 +147,10 @@ class MarketDataService:
                 for fallback_period in fallback_periods:
                     try:
                         print(f"[YFINANCE] Fallback: {fallback_period}...")
-                        test_hist = yf.download(
+                        test_hist = get_provider().download(
                             symbol,
                             period=fallback_period,
-                            interval=interval,
-                            progress=False,
-                            show_errors=False,
-                            threads=True
+                            interval=interval
                         )
                         
                         # MultiIndex 처리
@@ -185,8 +177,7 @@ class MarketDataService:
             # info 가져오기
             print(f"[YFINANCE] Fetching ticker.info...")
             try:
-                ticker = yf.Ticker(symbol)
-                info = ticker.info
+                info = get_provider().info(symbol)
                 if not info:
                     info = {}
             except Exception as e:
@@ -198,36 +189,7 @@ class MarketDataService:
             print(f"[YFINANCE] Available columns: {list(hist.columns)}")
             
             # 컬럼 이름 확인 및 정규화
-            close_col = None
-            open_col = None
-            high_col = None
-            low_col = None
-            volume_col = None
-            
-            for col in hist.columns:
-                col_lower = str(col).lower()
-                if 'close' in col_lower and close_col is None:
-                    close_col = col
-                elif 'open' in col_lower and open_col is None:
-                    open_col = col
-                elif 'high' in col_lower and high_col is None:
-                    high_col = col
-                elif 'low' in col_lower and low_col is None:
-                    low_col = col
-                elif 'volume' in col_lower and volume_col is None:
-                    volume_col = col
-            
-            # 기본값 설정
-            if close_col is None:
-                close_col = 'Close' if 'Close' in hist.columns else hist.columns[0]
-            if open_col is None:
-                open_col = 'Open' if 'Open' in hist.columns else close_col
-            if high_col is None:
-                high_col = 'High' if 'High' in hist.columns else close_col
-            if low_col is None:
-                low_col = 'Low' if 'Low' in hist.columns else close_col
-            if volume_col is None:
-                volume_col = 'Volume' if 'Volume' in hist.columns else None
+            open_col, high_col, low_col, close_col, volume_col = find_ohlcv_columns(hist)
             
             print(f"[YFINANCE] Using columns - Close: {close_col}, Open: {open_col}, High: {high_col}, Low: {low_col}, Volume: {volume_col}")
             
@@ -243,17 +205,8 @@ class MarketDataService:
                 change = 0
                 change_percent = 0
             
-            # 히스토리 데이터 변환
-            history = []
-            for idx, row in hist.iterrows():
-                history.append({
-                    "date": idx.isoformat() if hasattr(idx, 'isoformat') else str(idx),
-                    "open": float(row[open_col]),
-                    "high": float(row[high_col]),
-                    "low": float(row[low_col]),
-                    "close": float(row[close_col]),
-                    "volume": int(row[volume_col]) if volume_col and pd.notna(row[volume_col]) else 0
-                })
+            # 히스토리 데이터 변환 (컬럼 단위 벡터화)
+            history = serialize_history(hist)
             
             result = {
                 "symbol": symbol,
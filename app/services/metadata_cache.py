@@ -0,0 +1,179 @@
+"""
+Long-TTL cache for ticker metadata (Ticker.info)
+
+`.info` is a separate, slow Yahoo call that only feeds name/sector/industry/
+market cap - values that rarely change. Price paths read this cache and never
+wait for `.info`: a miss or stale entry returns what is cached (possibly nothing)
+immediately and schedules one background refresh for the symbol.
+
+Entries are persisted to a JSON file so restarts start warm.
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from app.services.providers import get_provider
+
+try:
+    from app.core.config import settings
+except ImportError:
+    settings = None
+
+# 응답에 쓰이는 키만 저장 (.info 전체는 수백 개 키)
+METADATA_KEYS = ("longName", "shortName", "sector", "industry", "marketCap", "quoteType", "currency", "exchange")
+
+
+class MetadataCache:
+    """
+    Symbol -> metadata cache with a long TTL and background refresh
+
+    Args:
+        path: JSON file used to persist entries
+        ttl: Seconds before an entry is refreshed (stale entries are still served)
+        retry_after: Seconds to wait before retrying a failed refresh
+        workers: Background refresh threads
+    """
+
+    def __init__(self, path: str, ttl: float, retry_after: float = 300.0, workers: int = 2):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._refreshing: set = set()
+        self._failed_at: Dict[str, float] = {}
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="metadata-refresh")
+        self._hits = 0
+        self._stale = 0
+        self._misses = 0
+        self._refreshes = 0
+        self._failures = 0
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+            print(f"[METADATA] Loaded {len(self._entries)} cached entries from {self.path}")
+        except Exception as e:
+            print(f"[METADATA] ⚠️ Failed to load {self.path}: {e}")
+            self._entries = {}
+
+    def _save(self) -> None:
+        with self._lock:
+            snapshot = dict(self._entries)
+        with self._save_lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+
+    def get(self, symbol: str) -> Dict[str, Any]:
+        """
+        Return cached metadata without blocking
+
+        Missing or stale entries trigger a background refresh; the returned dict
+        is empty until the first refresh has completed.
+        """
+        symbol = symbol.strip().upper()
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is None:
+                self._misses += 1
+            elif now - entry["fetched_at"] > self.ttl:
+                self._stale += 1
+            else:
+                self._hits += 1
+                return entry["info"]
+            self._schedule(symbol, now)
+        return entry["info"] if entry else {}
+
+    def peek(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Cached metadata (even if expired) without counting a lookup or scheduling a refresh"""
+        with self._lock:
+            entry = self._entries.get(symbol.strip().upper())
+        return entry["info"] if entry else None
+
+    def _schedule(self, symbol: str, now: float) -> None:
+        """Queue a refresh unless one is running or the last one failed recently (lock held)"""
+        if symbol in self._refreshing:
+            return
+        if now - self._failed_at.get(symbol, 0.0) < self.retry_after:
+            return
+        self._refreshing.add(symbol)
+        try:
+            self._pool.submit(self._refresh, symbol)
+        except RuntimeError:
+            # 종료 중이면 갱신 생략
+            self._refreshing.discard(symbol)
+
+    def refresh(self, symbol: str) -> Dict[str, Any]:
+        """Fetch metadata now (blocking) and store it"""
+        info = get_provider().info(symbol) or {}
+        metadata = {key: info.get(key) for key in METADATA_KEYS if info.get(key) is not None}
+        with self._lock:
+            self._entries[symbol.strip().upper()] = {"info": metadata, "fetched_at": time.time()}
+            self._refreshes += 1
+        self._save()
+        return metadata
+
+    def _refresh(self, symbol: str) -> None:
+        try:
+            self.refresh(symbol)
+            with self._lock:
+                self._failed_at.pop(symbol, None)
+        except Exception as e:
+            print(f"[METADATA] ⚠️ Refresh failed for {symbol}: {e}")
+            with self._lock:
+                self._failures += 1
+                self._failed_at[symbol] = time.time()
+        finally:
+            with self._lock:
+                self._refreshing.discard(symbol)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "ttl_sec": self.ttl,
+                "hits": self._hits,
+                "stale": self._stale,
+                "misses": self._misses,
+                "refreshing": len(self._refreshing),
+                "refreshes": self._refreshes,
+                "failures": self._failures,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+_metadata_cache: Optional[MetadataCache] = None
+_metadata_cache_guard = threading.Lock()
+
+
+def get_metadata_cache() -> MetadataCache:
+    """Return the process-wide metadata cache"""
+    global _metadata_cache
+    with _metadata_cache_guard:
+        if _metadata_cache is None:
+            _metadata_cache = MetadataCache(
+                settings.METADATA_CACHE_PATH if settings else "./data/metadata.json",
+                ttl=settings.METADATA_TTL if settings else 86400,
+                retry_after=settings.METADATA_RETRY_AFTER if settings else 300,
+            )
+        return _metadata_cache
+
+
+def get_cached_info(symbol: str) -> Dict[str, Any]:
+    """Non-blocking metadata lookup used by price paths"""
+    return get_metadata_cache().get(symbol)
@@ -8,6 +8,12 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from urllib.parse import urlparse
 import re
+from app.core.cache import cache_enabled, get_cache
+
+try:
+    from app.core.config import settings
+except ImportError:
+    settings = None
 
 
 class NewsService:
@@ -194,19 +200,29 @@ class NewsService:
         self,
         symbol: str,
         limit: int = 10,
-        days_back: int = 7
+        days_back: int = 7,
+        use_cache: bool = True
     ) -> List[Dict[str, Any]]:
         """
         Get latest news for a symbol with sentiment analysis
         
+        Results are shared between workers for CACHE_NEWS_TTL seconds.
+        
         Args:
             symbol: Stock or crypto symbol
             limit: Maximum number of articles
             days_back: Number of days to look back
+            use_cache: Read from the shared cache (False always fetches, then refreshes the cache)
         
         Returns:
-            List of news articles with sentiment analysis
+            List of news articles with sentiment analysis (shared - treat as read-only)
         """
+        cache_key = (symbol.strip().upper(), limit, days_back)
+        if use_cache and cache_enabled():
+            cached = get_cache("news").get(cache_key)
+            if cached is not None:
+                return cached
+        
         news_list = self.fetch_news_from_rss(symbol, limit=limit * 2)
         
         # Filter by date and add sentiment
@@ -224,5 +240,7 @@ class NewsService:
                 if len(filtered_news) >= limit:
                     break
         
+        if cache_enabled():
+            get_cache("news").set(cache_key, filtered_news, settings.CACHE_NEWS_TTL if settings else 300.0)
         return filtered_news
 
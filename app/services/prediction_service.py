@@ -1,12 +1,18 @@
 """
 Prediction service for managing AI predictions
 """
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
+from app.core.cache import cache_enabled, get_cache
+from app.core.config import settings
+from app.core.singleflight import SingleFlight
 from app.db.models import Prediction, PredictionLog
-from app.schemas.prediction import PredictionCreate, PredictionRequest
-from app.ml_models.predictor import StockPredictor
+from app.schemas.prediction import BatchPredictionRequest, PredictionCreate, PredictionRequest
+from app.ml_models.predictor import get_stock_predictor
+
+# 같은 입력의 동시 요청은 한 번만 계산/저장
+_prediction_flight = SingleFlight("prediction")
 
 
 class PredictionService:
@@ -14,7 +20,8 @@ class PredictionService:
     
     def __init__(self, db: Session):
         self.db = db
-        self.predictor = StockPredictor()
+        # 요청마다 새로 만들지 않고 프로세스 전체에서 공유 (로드된 모델 재사용)
+        self.predictor = get_stock_predictor()
     
     def create_prediction(
         self,
@@ -46,18 +53,59 @@ class PredictionService:
         """
         Generate a new prediction using ML models
         
+        Results are cached on (symbol, model, model version, days_ahead, last
+        bar timestamp and close): until new data arrives or the model file
+        changes, the earlier result - with its existing DB ids - is returned
+        without recomputing or inserting duplicate rows.
+        
         Args:
             request: Prediction request with symbol and parameters
         
         Returns:
             Dictionary containing prediction results
         """
+        # 캐시 키/DB 행/응답 모두 같은 심볼 사용 (배치 경로와 같이 대문자)
+        request = request.model_copy(update={"symbol": request.symbol.strip().upper()})
+        prepared = self.predictor.prepare(request.symbol, request.model_name)
+        if not (cache_enabled() and settings.PREDICTION_CACHE_TTL > 0):
+            return self._generate_prediction(request, prepared)
+        
+        key = (
+            request.symbol,
+            prepared["model_name"],
+            prepared["model_version"],
+            request.days_ahead,
+            prepared["last_bar_ts"],
+            prepared["last_close"],
+        )
+        cache = get_cache("predictions")
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        
+        def generate() -> Dict[str, Any]:
+            # 기다리는 동안 다른 worker가 저장했을 수 있음
+            result = cache.get(key)
+            if result is None:
+                result = self._generate_prediction(request, prepared)
+                cache.set(key, result, ttl=settings.PREDICTION_CACHE_TTL)
+            return result
+        
+        return _prediction_flight.do(key, generate)
+    
+    def _generate_prediction(
+        self,
+        request: PredictionRequest,
+        prepared: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Run the model and save the Prediction/PredictionLog rows"""
         try:
             # Use the predictor to generate prediction
             result = self.predictor.predict(
                 symbol=request.symbol,
                 days_ahead=request.days_ahead,
-                model_name=request.model_name
+                model_name=request.model_name,
+                prepared=prepared
             )
             
             # Save to database
@@ -96,4 +144,96 @@ class PredictionService:
             }
         except Exception as e:
             raise ValueError(f"Error generating prediction: {str(e)}")
-
+    
+    def generate_predictions_batch(
+        self,
+        request: BatchPredictionRequest
+    ) -> Dict[str, Any]:
+        """
+        Generate predictions for many symbols × horizons
+        
+        Histories are fetched in bulk, the latest feature rows of all symbols
+        are scored through one batch hook (StockPredictor._predict_batch_with_model),
+        and every Prediction/PredictionLog row is written in a single
+        transaction (one flush for the ids, one commit).
+        
+        Args:
+            request: Symbols, horizons and optional model name
+        
+        Returns:
+            Dictionary with saved predictions and per-symbol errors
+        """
+        # 중복 제거 + 대문자 정규화
+        symbols = list(dict.fromkeys(s.strip().upper() for s in request.symbols if s and s.strip()))
+        if not symbols:
+            raise ValueError("At least one symbol is required")
+        
+        try:
+            result = self.predictor.predict_batch(symbols, request.horizons, model_name=request.model_name)
+        except ValueError:
+            raise
+        except Exception as e:
+            raise ValueError(f"Error generating predictions: {str(e)}")
+        
+        items = result["predictions"]
+        if not items:
+            return {"count": 0, "predictions": [], "errors": result["errors"]}
+        
+        # server_default(now()) 대신 직접 지정 - 커밋 후 행마다 refresh하지 않도록
+        # (now()와 같이 naive UTC로 저장해야 단건 예측 행과 정렬/필터가 일치)
+        created_at = datetime.now(timezone.utc).replace(tzinfo=None)
+        try:
+            db_predictions = [
+                Prediction(
+                    symbol=item["symbol"],
+                    model_name=item["model_name"],
+                    predicted_price=item["predicted_price"],
+                    confidence=item["confidence"],
+                    prediction_date=datetime.fromisoformat(item["prediction_date"]),
+                    created_at=created_at
+                )
+                for item in items
+            ]
+            self.db.add_all(db_predictions)
+            # id 확보 (다중 행 INSERT)
+            self.db.flush()
+            
+            prediction_logs = [
+                PredictionLog(
+                    symbol=db_prediction.symbol,
+                    model_name=db_prediction.model_name,
+                    prediction_id=db_prediction.id,
+                    predicted_price=db_prediction.predicted_price,
+                    prediction_date=db_prediction.prediction_date,
+                    is_evaluated=False,
+                    created_at=created_at
+                )
+                for db_prediction in db_predictions
+            ]
+            self.db.add_all(prediction_logs)
+            self.db.flush()
+            
+            # 커밋하면 속성이 만료되므로 응답은 커밋 전에 구성
+            predictions = [
+                {
+                    "id": db_prediction.id,
+                    "symbol": db_prediction.symbol,
+                    "predicted_price": db_prediction.predicted_price,
+                    "confidence": db_prediction.confidence,
+                    "prediction_date": db_prediction.prediction_date.isoformat(),
+                    "model_name": db_prediction.model_name,
+                    "days_ahead": item["days_ahead"],
+                    "current_price": item["current_price"],
+                    "created_at": created_at.isoformat(),
+                    "prediction_log_id": prediction_log.id
+                }
+                for db_prediction, prediction_log, item in zip(db_predictions, prediction_logs, items)
+            ]
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            raise ValueError(f"Error saving predictions: {str(e)}")
+        
+        print(f"[PREDICT] ✅ Batch: {len(predictions)} predictions for {len(symbols)} symbols saved, "
+              f"{len(result['errors'])} failed")
+        return {"count": len(predictions), "predictions": predictions, "errors": result["errors"]}
@@ -0,0 +1,191 @@
+"""
+Background market data prefetch (watchlist warm-up)
+
+A daemon thread periodically refreshes the bar store for
+
+    1. the configured watchlist (PREFETCH_WATCHLIST, "SYMBOL[:period[:interval]]")
+    2. recently requested (symbol, period, interval) keys
+
+so dashboard requests find fresh bars in the store (and its in-memory hot
+layer) instead of paying Yahoo latency inline.
+
+Prefetching only spends spare upstream budget: it runs while the circuit is
+closed and the shared token bucket holds more than PREFETCH_MIN_TOKENS, leaving
+the rest for user-facing requests.
+"""
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.core.circuit_breaker import upstream_breaker
+from app.core.rate_limiter import RateLimitTimeout, upstream_limiter
+from app.services.market_data_service import MarketDataService
+
+try:
+    from app.core.config import settings
+except ImportError:
+    settings = None
+
+PrefetchKey = Tuple[str, str, str]
+
+
+def parse_watchlist(entries: Iterable[str]) -> List[PrefetchKey]:
+    """
+    Parse "SYMBOL[:period[:interval]]" entries (defaults: 1mo, 1d)
+
+    e.g. ["AAPL", "BTC-USD:5d:15m"] -> [("AAPL", "1mo", "1d"), ("BTC-USD", "5d", "15m")]
+    """
+    keys = []
+    for entry in entries:
+        parts = [part.strip() for part in entry.split(":")]
+        if not parts[0]:
+            continue
+        symbol = parts[0].upper()
+        period = parts[1].lower() if len(parts) > 1 and parts[1] else "1mo"
+        interval = parts[2].lower() if len(parts) > 2 and parts[2] else "1d"
+        keys.append((symbol, period, interval))
+    return list(dict.fromkeys(keys))
+
+
+class PrefetchScheduler:
+    """
+    Periodic bar store refresh for watchlist and recently requested keys
+
+    Args:
+        watchlist: Keys refreshed every cycle
+        interval: Seconds between refreshes of the same key
+        recent_limit: Recently requested keys to include (newest first)
+        recent_ttl: Drop recent keys not requested within this many seconds
+        min_tokens: Token headroom left for user requests
+    """
+
+    def __init__(
+        self,
+        watchlist: List[PrefetchKey],
+        interval: float = 60.0,
+        recent_limit: int = 20,
+        recent_ttl: float = 1800.0,
+        min_tokens: float = 2.0
+    ):
+        self.watchlist = watchlist
+        self.interval = interval
+        self.recent_limit = recent_limit
+        self.recent_ttl = recent_ttl
+        self.min_tokens = min_tokens
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._warmed_at: Dict[PrefetchKey, float] = {}
+
+        self._cycles = 0
+        self._warmed = 0
+        self._skipped_budget = 0
+        self._failures = 0
+
+    def targets(self) -> List[PrefetchKey]:
+        """Watchlist keys first, then recently requested keys"""
+        recent = MarketDataService.recent_requests(self.recent_ttl, self.recent_limit) if self.recent_limit > 0 else []
+        return list(dict.fromkeys(self.watchlist + recent))
+
+    def _has_budget(self) -> bool:
+        return upstream_breaker.retry_in() == 0.0 and upstream_limiter.available() >= self.min_tokens + 1
+
+    def run_once(self) -> int:
+        """
+        Refresh every due key the budget allows (least recently warmed first)
+
+        Returns:
+            Number of keys refreshed
+        """
+        now = time.monotonic()
+        due = [key for key in self.targets() if now - self._warmed_at.get(key, 0.0) >= self.interval]
+        due.sort(key=lambda key: self._warmed_at.get(key, 0.0))
+
+        warmed = 0
+        for key in due:
+            if self._stop.is_set():
+                break
+            if not self._has_budget():
+                # 남은 키는 다음 주기로 (사용자 요청 몫의 토큰은 건드리지 않음)
+                with self._lock:
+                    self._skipped_budget += len(due) - due.index(key)
+                break
+            symbol, period, interval = key
+            try:
+                MarketDataService.warm(symbol, period, interval)
+                warmed += 1
+                with self._lock:
+                    self._warmed += 1
+            except RateLimitTimeout as e:
+                print(f"[PREFETCH] ⚠️ Upstream unavailable ({e}), pausing until next cycle")
+                break
+            except Exception as e:
+                print(f"[PREFETCH] ⚠️ Failed to warm {symbol} {period}/{interval}: {e}")
+                with self._lock:
+                    self._failures += 1
+            # 실패한 키도 interval 동안은 다시 시도하지 않음
+            self._warmed_at[key] = time.monotonic()
+
+        with self._lock:
+            self._cycles += 1
+        # 더 이상 대상이 아닌 키 정리
+        active = set(self.targets())
+        for key in list(self._warmed_at):
+            if key not in active:
+                del self._warmed_at[key]
+        return warmed
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                warmed = self.run_once()
+                if warmed:
+                    print(f"[PREFETCH] ✅ Warmed {warmed} keys")
+            except Exception as e:
+                print(f"[PREFETCH] ⚠️ Cycle failed: {e}")
+            # 예산 부족으로 밀린 키를 빨리 처리하도록 주기를 짧게 나눠 확인
+            self._stop.wait(min(self.interval, 5.0))
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="market-data-prefetch", daemon=True)
+        self._thread.start()
+        print(f"[PREFETCH] Started: {len(self.watchlist)} watchlist keys, every {self.interval:.0f}s")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "watchlist": len(self.watchlist),
+                "targets": len(self.targets()),
+                "interval_sec": self.interval,
+                "cycles": self._cycles,
+                "warmed": self._warmed,
+                "skipped_budget": self._skipped_budget,
+                "failures": self._failures,
+            }
+
+
+_prefetch_scheduler: Optional[PrefetchScheduler] = None
+_prefetch_scheduler_guard = threading.Lock()
+
+
+def get_prefetch_scheduler() -> PrefetchScheduler:
+    """Return the process-wide prefetch scheduler (not started)"""
+    global _prefetch_scheduler
+    with _prefetch_scheduler_guard:
+        if _prefetch_scheduler is None:
+            _prefetch_scheduler = PrefetchScheduler(
+                parse_watchlist(settings.PREFETCH_WATCHLIST if settings else []),
+                interval=settings.PREFETCH_INTERVAL if settings else 60.0,
+                recent_limit=settings.PREFETCH_RECENT_LIMIT if settings else 20,
+                recent_ttl=settings.PREFETCH_RECENT_TTL if settings else 1800.0,
+                min_tokens=settings.PREFETCH_MIN_TOKENS if settings else 2.0,
+            )
+        return _prefetch_scheduler
@@ -0,0 +1,70 @@
+"""
+Market data providers
+
+    from app.services.providers import get_provider
+    hist = get_provider().download("AAPL", period="1mo", interval="1d")
+
+The provider is chosen with MARKET_DATA_PROVIDER: 'yfinance' (live),
+'record' (live + save responses) or 'replay' (saved responses only).
+"""
+import threading
+from typing import Optional
+
+from app.services.providers.base import MarketDataProvider, ProviderStats, get_provider_stats
+from app.services.providers.replay_provider import ReplayProvider, RecordingNotFoundError
+from app.services.providers.yfinance_provider import YFinanceProvider
+
+try:
+    from app.core.config import settings
+except ImportError:
+    settings = None
+
+PROVIDERS = ("yfinance", "record", "replay")
+
+_provider: Optional[MarketDataProvider] = None
+_provider_lock = threading.Lock()
+
+
+def create_provider(name: str) -> MarketDataProvider:
+    """Build a provider by name ('yfinance', 'record' or 'replay')"""
+    name = name.lower()
+    if name == "yfinance":
+        return YFinanceProvider()
+    if name in ("record", "replay"):
+        return ReplayProvider(
+            settings.MARKET_DATA_RECORDINGS_PATH if settings else "./data/recordings",
+            mode=name,
+            upstream=YFinanceProvider() if name == "record" else None,
+            simulate_latency=bool(settings and settings.MARKET_DATA_REPLAY_LATENCY),
+        )
+    raise ValueError(f"Unknown market data provider: {name} (expected one of {', '.join(PROVIDERS)})")
+
+
+def get_provider() -> MarketDataProvider:
+    """Return the process-wide provider selected by MARKET_DATA_PROVIDER"""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = create_provider(settings.MARKET_DATA_PROVIDER if settings else "yfinance")
+    return _provider
+
+
+def set_provider(provider: MarketDataProvider) -> None:
+    """Replace the process-wide provider (benchmarks, scripts)"""
+    global _provider
+    with _provider_lock:
+        _provider = provider
+
+
+__all__ = [
+    "MarketDataProvider",
+    "ProviderStats",
+    "YFinanceProvider",
+    "ReplayProvider",
+    "RecordingNotFoundError",
+    "create_provider",
+    "get_provider",
+    "set_provider",
+    "get_provider_stats",
+]
@@ -0,0 +1,144 @@
+"""
+Market data provider interface
+
+Services never call yfinance directly - they go through a provider so the
+upstream can be swapped (live Yahoo, record/replay fixtures, ...) and every
+provider call gets the same latency metrics.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import date, datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+Symbols = Union[str, Sequence[str]]
+DateLike = Union[str, date, datetime, None]
+
+# 분위수 계산용 최근 지연 시간 샘플 수 (연산별)
+LATENCY_SAMPLES = 1024
+
+
+class ProviderStats:
+    """Per-operation call counts and latency percentiles for a provider"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ops: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, op: str, elapsed: float, failed: bool) -> None:
+        with self._lock:
+            entry = self._ops.get(op)
+            if entry is None:
+                entry = {"calls": 0, "errors": 0, "total": 0.0, "max": 0.0,
+                         "samples": deque(maxlen=LATENCY_SAMPLES)}
+                self._ops[op] = entry
+            entry["calls"] += 1
+            entry["errors"] += int(failed)
+            entry["total"] += elapsed
+            entry["max"] = max(entry["max"], elapsed)
+            entry["samples"].append(elapsed)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for op, entry in self._ops.items():
+                samples: Deque[float] = entry["samples"]
+                p50, p95 = np.percentile(list(samples), [50, 95]) if samples else (0.0, 0.0)
+                result[op] = {
+                    "calls": entry["calls"],
+                    "errors": entry["errors"],
+                    "avg_ms": round(entry["total"] / entry["calls"] * 1000, 2),
+                    "p50_ms": round(float(p50) * 1000, 2),
+                    "p95_ms": round(float(p95) * 1000, 2),
+                    "max_ms": round(entry["max"] * 1000, 2),
+                }
+            return result
+
+
+class MarketDataProvider(ABC):
+    """
+    Base class for market data providers
+
+    Subclasses implement `_download`, `_history` and `_info`; the public methods
+    add latency/error accounting around them.
+    """
+
+    name = "provider"
+
+    def __init__(self):
+        self._stats = ProviderStats()
+        _registry.append(self)
+
+    def _timed(self, op: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            self._stats.record(op, time.perf_counter() - started, failed)
+
+    def download(
+        self,
+        tickers: Symbols,
+        period: Optional[str] = None,
+        interval: str = "1d",
+        start: DateLike = None,
+        end: DateLike = None,
+        group_by: str = "column"
+    ) -> pd.DataFrame:
+        """
+        Download OHLCV bars shaped like yf.download() (columns may be a MultiIndex)
+
+        Args:
+            tickers: Symbol or list of symbols
+            period: Period to fetch (ignored when start/end are given)
+            interval: Data interval
+            start: Range start (inclusive)
+            end: Range end (exclusive)
+            group_by: 'column' (field, ticker) or 'ticker' (ticker, field) for multi-symbol frames
+        """
+        return self._timed("download", self._download, tickers, period, interval, start, end, group_by)
+
+    def history(
+        self,
+        symbol: str,
+        period: Optional[str] = None,
+        interval: str = "1d",
+        start: DateLike = None,
+        end: DateLike = None
+    ) -> pd.DataFrame:
+        """Single-symbol bars shaped like Ticker.history() (flat columns)"""
+        return self._timed("history", self._history, symbol, period, interval, start, end)
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        """Ticker metadata (Ticker.info); may be empty"""
+        return self._timed("info", self._info, symbol) or {}
+
+    @abstractmethod
+    def _download(self, tickers, period, interval, start, end, group_by) -> pd.DataFrame:
+        ...
+
+    @abstractmethod
+    def _history(self, symbol, period, interval, start, end) -> pd.DataFrame:
+        ...
+
+    @abstractmethod
+    def _info(self, symbol) -> Dict[str, Any]:
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        return self._stats.snapshot()
+
+
+_registry: List[MarketDataProvider] = []
+
+
+def get_provider_stats() -> Dict[str, Dict[str, Any]]:
+    """Return latency stats for every provider instance"""
+    return {provider.name: provider.stats() for provider in _registry}
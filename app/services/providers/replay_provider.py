@@ -0,0 +1,277 @@
+"""
+Record/replay provider for offline load tests and benchmarks
+
+    record  - forward calls to a live provider and save every response
+    replay  - serve saved responses only (no network); missing ones raise
+
+Recordings are pickle files under MARKET_DATA_RECORDINGS_PATH, one per distinct
+call. Range requests (start/end) that were never recorded exactly are answered
+by slicing the union of recorded bars for the same symbol and interval, so the
+bar store's gap fills keep replaying after the wall clock has moved on.
+"""
+import hashlib
+import os
+import pickle
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from app.services.providers.base import MarketDataProvider
+
+REPLAY_MODES = ("record", "replay")
+
+
+class RecordingNotFoundError(ValueError):
+    """Raised in replay mode when no recording matches a call"""
+
+
+def _normalize_symbols(tickers) -> Tuple[str, ...]:
+    if isinstance(tickers, str):
+        tickers = tickers.replace(",", " ").split()
+    return tuple(str(t).strip().upper() for t in tickers)
+
+
+def _normalize_date(value) -> Optional[str]:
+    if value is None:
+        return None
+    return pd.Timestamp(value).isoformat()
+
+
+class ReplayProvider(MarketDataProvider):
+    """
+    Record live responses to disk, or replay them deterministically
+
+    Args:
+        root: Directory holding the recordings
+        mode: 'record' or 'replay'
+        upstream: Live provider used in record mode
+        simulate_latency: In replay mode, sleep for the recorded upstream latency
+    """
+
+    def __init__(
+        self,
+        root: str,
+        mode: str = "replay",
+        upstream: Optional[MarketDataProvider] = None,
+        simulate_latency: bool = False
+    ):
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"Invalid replay mode: {mode} (expected one of {', '.join(REPLAY_MODES)})")
+        if mode == "record" and upstream is None:
+            raise ValueError("Record mode needs an upstream provider")
+        self.name = mode
+        super().__init__()
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.mode = mode
+        self.upstream = upstream
+        self.simulate_latency = simulate_latency
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._scanned = False
+        self._hits = 0
+        self._sliced = 0
+        self._misses = 0
+        self._recorded = 0
+
+    # ------------------------------------------------------------------ storage
+
+    @staticmethod
+    def _key(method: str, **params) -> Tuple[str, Dict[str, Any]]:
+        """Return (digest, normalized params) for a call"""
+        digest = hashlib.sha1(repr((method, sorted(params.items()))).encode()).hexdigest()[:16]
+        return digest, params
+
+    def _path(self, method: str, symbols: Tuple[str, ...], digest: str) -> Path:
+        label = symbols[0] if len(symbols) == 1 else f"{len(symbols)}symbols"
+        return self.root / f"{method}-{label}-{digest}.pkl"
+
+    def _save(self, path: Path, record: Dict[str, Any]) -> None:
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def _load(self, digest: str, path: Path) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._cache.get(digest)
+        if record is not None:
+            return record
+        if not path.exists():
+            return None
+        with open(path, "rb") as f:
+            record = pickle.load(f)
+        with self._lock:
+            self._cache[digest] = record
+        return record
+
+    def _scan(self) -> List[Dict[str, Any]]:
+        """Load every recording once (used for range fallback)"""
+        with self._lock:
+            scanned = self._scanned
+        if not scanned:
+            for path in self.root.glob("*.pkl"):
+                digest = path.stem.rsplit("-", 1)[-1]
+                try:
+                    self._load(digest, path)
+                except Exception as e:
+                    print(f"[REPLAY] ⚠️ Unreadable recording {path.name}: {e}")
+            with self._lock:
+                self._scanned = True
+        with self._lock:
+            return list(self._cache.values())
+
+    # ------------------------------------------------------------------ record/replay
+
+    def _call(self, method: str, live, symbols: Tuple[str, ...], **params) -> Any:
+        digest, params = self._key(method, symbols=symbols, **params)
+        path = self._path(method, symbols, digest)
+
+        if self.mode == "record":
+            started = time.perf_counter()
+            result = live()
+            record = {
+                "method": method,
+                "params": params,
+                "result": result,
+                "latency": time.perf_counter() - started,
+                "recorded_at": datetime.now(timezone.utc).isoformat(),
+            }
+            self._save(path, record)
+            with self._lock:
+                self._cache[digest] = record
+                self._scanned = False
+                self._recorded += 1
+            return self._copy(result)
+
+        record = self._load(digest, path)
+        if record is not None:
+            with self._lock:
+                self._hits += 1
+            if self.simulate_latency:
+                time.sleep(record.get("latency", 0.0))
+            return self._copy(record["result"])
+
+        result = self._slice_recorded(method, params)
+        if result is not None:
+            with self._lock:
+                self._sliced += 1
+            return result
+
+        with self._lock:
+            self._misses += 1
+        raise RecordingNotFoundError(
+            f"No recorded response for {method}({', '.join(symbols)}, "
+            f"{', '.join(f'{k}={v}' for k, v in params.items() if k != 'symbols' and v is not None)}) "
+            f"in {self.root}"
+        )
+
+    @staticmethod
+    def _copy(result: Any) -> Any:
+        # 호출자가 컬럼을 바꾸는 경우가 있으므로 (e.g. _flatten_columns) 항상 복사본 반환
+        if isinstance(result, (pd.DataFrame, dict)):
+            return result.copy()
+        return result
+
+    @staticmethod
+    def _flatten(frame: pd.DataFrame, symbol: str) -> pd.DataFrame:
+        if isinstance(frame.columns, pd.MultiIndex):
+            for level in range(frame.columns.nlevels):
+                if symbol in frame.columns.get_level_values(level):
+                    return frame.xs(symbol, axis=1, level=level, drop_level=True)
+            frame = frame.copy()
+            frame.columns = frame.columns.get_level_values(0)
+        return frame
+
+    @staticmethod
+    def _bound(value: Optional[str], index: pd.DatetimeIndex) -> Optional[pd.Timestamp]:
+        if value is None:
+            return None
+        ts = pd.Timestamp(value)
+        if index.tz is not None:
+            return ts.tz_localize(index.tz) if ts.tzinfo is None else ts.tz_convert(index.tz)
+        return ts.tz_convert("UTC").tz_localize(None) if ts.tzinfo is not None else ts
+
+    def _slice_recorded(self, method: str, params: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """Answer a single-symbol range request from the union of recorded bars"""
+        symbols = params["symbols"]
+        if method == "info" or len(symbols) != 1 or (params["start"] is None and params["end"] is None):
+            return None
+        symbol = symbols[0]
+
+        frames = []
+        for record in self._scan():
+            recorded = record["params"]
+            if (
+                record["method"] in ("download", "history")
+                and recorded.get("symbols") == symbols
+                and recorded.get("interval") == params["interval"]
+                and isinstance(record["result"], pd.DataFrame)
+                and not record["result"].empty
+            ):
+                frames.append(self._flatten(record["result"], symbol))
+        if not frames:
+            return None
+
+        # 최근 녹화가 우선 (겹치는 바는 나중 것을 사용)
+        union = pd.concat(frames).sort_index(kind="stable")
+        union = union[~union.index.duplicated(keep="last")]
+        if not isinstance(union.index, pd.DatetimeIndex):
+            return None
+        start = self._bound(params["start"], union.index)
+        end = self._bound(params["end"], union.index)
+        lo = union.index.searchsorted(start, side="left") if start is not None else 0
+        hi = union.index.searchsorted(end, side="left") if end is not None else len(union)
+        return union.iloc[lo:hi].copy()
+
+    # ------------------------------------------------------------------ provider API
+
+    def _download(self, tickers, period, interval, start, end, group_by) -> pd.DataFrame:
+        ranged = start is not None or end is not None
+        return self._call(
+            "download",
+            lambda: self.upstream.download(tickers, period=period, interval=interval,
+                                           start=start, end=end, group_by=group_by),
+            _normalize_symbols(tickers),
+            period=None if ranged else period,
+            interval=interval,
+            start=_normalize_date(start),
+            end=_normalize_date(end),
+            group_by=group_by,
+        )
+
+    def _history(self, symbol, period, interval, start, end) -> pd.DataFrame:
+        ranged = start is not None or end is not None
+        return self._call(
+            "history",
+            lambda: self.upstream.history(symbol, period=period, interval=interval, start=start, end=end),
+            _normalize_symbols([symbol]),
+            period=None if ranged else period,
+            interval=interval,
+            start=_normalize_date(start),
+            end=_normalize_date(end),
+        )
+
+    def _info(self, symbol) -> Dict[str, Any]:
+        return self._call(
+            "info",
+            lambda: self.upstream.info(symbol),
+            _normalize_symbols([symbol]),
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        with self._lock:
+            stats["recordings"] = {
+                "mode": self.mode,
+                "hits": self._hits,
+                "sliced": self._sliced,
+                "misses": self._misses,
+                "recorded": self._recorded,
+                "loaded": len(self._cache),
+            }
+        return stats
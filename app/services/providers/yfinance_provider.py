@@ -0,0 +1,61 @@
+"""
+Live Yahoo Finance provider
+
+All calls go through the upstream circuit breaker (fail fast during incidents)
+and share the process-wide `upstream_limiter` token bucket.
+"""
+from typing import Any, Dict
+
+import pandas as pd
+import yfinance as yf
+
+from app.core.circuit_breaker import upstream_breaker
+from app.core.rate_limiter import upstream_limiter, is_rate_limit_error
+from app.services.providers.base import MarketDataProvider
+
+
+def _download_checked(tickers, **kwargs) -> pd.DataFrame:
+    """
+    yf.download() that raises on rate limiting
+
+    yf.download() swallows per-ticker errors and returns an empty frame; a 429
+    would otherwise look like "no data" and never reach the limiter/breaker.
+    """
+    hist = yf.download(tickers, **kwargs)
+    if hist is None or hist.empty:
+        errors = getattr(getattr(yf, "shared", None), "_ERRORS", None) or {}
+        for message in errors.values():
+            if is_rate_limit_error(Exception(str(message))):
+                raise ValueError(f"Yahoo Finance API rate limit exceeded: {message}")
+    return hist
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Market data from yfinance (yf.download / Ticker.history / Ticker.info)"""
+
+    name = "yfinance"
+
+    @staticmethod
+    def _upstream(func, *args, **kwargs) -> Any:
+        return upstream_breaker.call(upstream_limiter.call, func, *args, **kwargs)
+
+    def _download(self, tickers, period, interval, start, end, group_by) -> pd.DataFrame:
+        kwargs = {"start": start, "end": end} if start is not None or end is not None else {"period": period}
+        return self._upstream(
+            _download_checked,
+            tickers,
+            interval=interval,
+            group_by=group_by,
+            progress=False,
+            threads=True,
+            **kwargs
+        )
+
+    def _history(self, symbol, period, interval, start, end) -> pd.DataFrame:
+        kwargs = {"start": start, "end": end} if start is not None or end is not None else {"period": period}
+        ticker = yf.Ticker(symbol)
+        return self._upstream(ticker.history, interval=interval, **kwargs)
+
+    def _info(self, symbol) -> Dict[str, Any]:
+        ticker = yf.Ticker(symbol)
+        return self._upstream(lambda: ticker.info)
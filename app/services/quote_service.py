@@ -0,0 +1,177 @@
+"""
+Lightweight quote service (current price / change / volume)
+
+A quote never downloads or serializes a full intraday history. Sources, cheapest first:
+
+    1. Short-TTL in-memory cache (QUOTE_CACHE_TTL)
+    2. Latest bar of fresh intraday data already in the bar store
+       (previous close from stored daily bars)
+    3. Daily bars - a tail-only refresh of the daily bar store, or a 5d/1d
+       download (at most ~5 rows) when the store is disabled
+
+Yahoo's `fast_info.last_price` is not used: it downloads a year of daily bars
+behind the scenes.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.core.singleflight import SingleFlight
+from app.services.bar_store import get_bar_store, INTERVAL_DELTAS
+from app.services.history_serializer import find_ohlcv_columns
+from app.services.market_data_service import MarketDataService
+from app.services.providers import get_provider
+from app.services.symbol_validation import check_symbol, get_negative_cache, has_local_data
+
+try:
+    from app.core.config import settings
+except ImportError:
+    settings = None
+
+# 최신 bar를 재사용할 장중 interval (작은 것 우선)
+INTRADAY_INTERVALS = ('1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h')
+
+_quote_flight = SingleFlight("quote")
+_quote_cache: Dict[str, tuple[Dict[str, Any], float]] = {}
+_quote_cache_lock = threading.Lock()
+_quote_stats = {"hits": 0, "intraday": 0, "daily": 0}
+
+
+def _last_two_closes(hist: pd.DataFrame) -> Optional[tuple[float, Optional[float], int, pd.Timestamp]]:
+    """(last close, previous close, last volume, last bar time) from an OHLCV frame"""
+    if hist is None or hist.empty:
+        return None
+    _, _, _, close_col, volume_col = find_ohlcv_columns(hist)
+    closes = hist[close_col].to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = np.flatnonzero(~np.isnan(closes))
+    if len(valid) == 0:
+        return None
+    last = valid[-1]
+    previous = float(closes[valid[-2]]) if len(valid) > 1 else None
+    volume = 0
+    if volume_col is not None:
+        value = hist[volume_col].iloc[last]
+        volume = int(value) if pd.notna(value) else 0
+    return float(closes[last]), previous, volume, hist.index[last]
+
+
+class QuoteService:
+    """Service for current price quotes"""
+
+    @staticmethod
+    def _ttl() -> float:
+        return settings.QUOTE_CACHE_TTL if settings else 5.0
+
+    @staticmethod
+    def _build_quote(symbol: str, price: float, previous: Optional[float], volume: int,
+                     as_of: pd.Timestamp, source: str, stale: bool = False) -> Dict[str, Any]:
+        change = price - previous if previous else 0.0
+        return {
+            "symbol": symbol,
+            "current_price": price,
+            "change": change,
+            "change_percent": (change / previous) * 100 if previous else 0.0,
+            "volume": volume,
+            "timestamp": datetime.now().isoformat(),
+            "as_of": as_of.isoformat() if hasattr(as_of, "isoformat") else str(as_of),
+            "source": source,
+            "stale": stale,
+        }
+
+    @staticmethod
+    def _from_intraday(symbol: str) -> Optional[Dict[str, Any]]:
+        """Quote from the newest bar of intraday data the store holds fresh (no upstream call)"""
+        store = get_bar_store()
+        now = datetime.now(timezone.utc)
+        fresh_after = now - timedelta(seconds=settings.BAR_STORE_TAIL_TTL if settings else 60)
+        for interval in INTRADAY_INTERVALS:
+            bar = INTERVAL_DELTAS[interval]
+            # 커버리지 끝이 tail TTL 이내로 최신인 경우만 사용
+            coverage = store.coverage(symbol, interval)
+            if not coverage or coverage[-1][1] < fresh_after:
+                continue
+            latest = _last_two_closes(store.read(symbol, interval, now - 2 * bar, now))
+            if latest is None:
+                continue
+            price, _, _, as_of = latest
+
+            # 전일 종가 / 당일 거래량은 저장된 일봉에서 (전일 종가는 장중에 바뀌지 않음)
+            daily = store.read(symbol, '1d', now - timedelta(days=10), now)
+            if daily is None or daily.empty:
+                return None
+            _, _, _, close_col, volume_col = find_ohlcv_columns(daily)
+            session_day = as_of.tz_convert(daily.index.tz).normalize() if daily.index.tz is not None else as_of.normalize()
+            before = daily[daily.index < session_day][close_col].dropna()
+            today = daily[daily.index >= session_day]
+            if before.empty:
+                return None
+            volume = int(np.nansum(today[volume_col].to_numpy(dtype=np.float64, na_value=np.nan))) if volume_col is not None and not today.empty else 0
+            return QuoteService._build_quote(symbol, price, float(before.iloc[-1]), volume, as_of, f"intraday:{interval}")
+        return None
+
+    @staticmethod
+    def _from_daily(symbol: str) -> Dict[str, Any]:
+        """Quote from the last two daily bars (tail-only store refresh or a 5d/1d download)"""
+        hist = None
+        if MarketDataService._bar_store_enabled():
+            hist = MarketDataService._fetch_via_store(symbol, "5d", "1d")
+        if hist is None or hist.empty:
+            hist = MarketDataService._flatten_columns(get_provider().download(symbol, period="5d", interval="1d"))
+            if (hist is None or hist.empty) and not has_local_data(symbol):
+                # 5d/1d가 비었으면 없는 심볼 - 이후 요청(스트림 polling 포함)은 upstream 호출 없이 실패
+                get_negative_cache().add(symbol, "no bars in 5d/1d quote")
+
+        latest = _last_two_closes(hist)
+        if latest is None:
+            raise ValueError(f"No price data available for {symbol}")
+        price, previous, volume, as_of = latest
+        return QuoteService._build_quote(
+            symbol, price, previous, volume, as_of, "daily",
+            stale=bool(hist.attrs.get("stale", False))
+        )
+
+    @staticmethod
+    def _fetch_quote(symbol: str) -> Dict[str, Any]:
+        quote = None
+        if MarketDataService._bar_store_enabled():
+            quote = QuoteService._from_intraday(symbol)
+        source = "intraday" if quote is not None else "daily"
+        if quote is None:
+            quote = QuoteService._from_daily(symbol)
+        with _quote_cache_lock:
+            _quote_cache[symbol] = (quote, time.monotonic())
+            _quote_stats[source] += 1
+        return quote
+
+    @staticmethod
+    def get_quote(symbol: str) -> Dict[str, Any]:
+        """
+        Get the current price, change vs previous close and today's volume
+
+        Args:
+            symbol: Stock or crypto symbol
+
+        Returns:
+            Quote dictionary (shared between concurrent callers - treat as read-only)
+        """
+        if settings and not settings.YFINANCE_ENABLED:
+            raise ValueError("YFinance is not enabled in settings")
+
+        symbol = symbol.strip().upper()
+        check_symbol(symbol)
+        with _quote_cache_lock:
+            cached = _quote_cache.get(symbol)
+            if cached is not None and time.monotonic() - cached[1] < QuoteService._ttl():
+                _quote_stats["hits"] += 1
+                return cached[0]
+
+        return _quote_flight.do(symbol, lambda: QuoteService._fetch_quote(symbol))
+
+    @staticmethod
+    def stats() -> Dict[str, Any]:
+        with _quote_cache_lock:
+            return {"ttl_sec": QuoteService._ttl(), "entries": len(_quote_cache), **_quote_stats}
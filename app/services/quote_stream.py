@@ -0,0 +1,141 @@
+"""
+Server-push quote fan-out (one shared poller per symbol)
+
+Every connected client subscribes to a per-symbol queue. The first subscriber
+of a symbol starts a background poller; each poll result is pushed to all of
+the symbol's subscribers, and the poller stops when the last one leaves.
+Upstream load therefore scales with distinct symbols, not with viewers.
+
+    queue = await hub.subscribe("AAPL")
+    try:
+        event = await queue.get()  # {"event": "quote" | "error", "data": {...}}
+    finally:
+        hub.unsubscribe("AAPL", queue)
+"""
+import asyncio
+from typing import Any, Dict, Optional, Set
+
+from app.core.circuit_breaker import upstream_breaker
+from app.core.executor import run_upstream
+from app.core.rate_limiter import RateLimitTimeout
+from app.services.quote_service import QuoteService
+
+try:
+    from app.core.config import settings
+except ImportError:
+    settings = None
+
+# 구독자별 대기 이벤트 수 (느린 클라이언트는 오래된 이벤트를 버리고 최신 값만 받음)
+SUBSCRIBER_QUEUE_SIZE = 8
+
+
+class QuoteStreamHub:
+    """
+    Per-symbol pollers fanning quotes out to subscriber queues
+
+    Must be used from a single event loop (the uvicorn worker loop).
+
+    Args:
+        interval: Seconds between polls of one symbol
+    """
+
+    def __init__(self, interval: float = 5.0):
+        self.interval = interval
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._pollers: Dict[str, asyncio.Task] = {}
+        self._latest: Dict[str, Dict[str, Any]] = {}
+        self._polls = 0
+        self._published = 0
+        self._dropped = 0
+
+    async def subscribe(self, symbol: str) -> asyncio.Queue:
+        """Register a subscriber; the last known quote (if any) is queued immediately"""
+        symbol = symbol.strip().upper()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.setdefault(symbol, set()).add(queue)
+        if symbol in self._latest:
+            queue.put_nowait(self._latest[symbol])
+        if symbol not in self._pollers:
+            self._pollers[symbol] = asyncio.create_task(self._poll(symbol), name=f"quote-poller-{symbol}")
+            print(f"[STREAM] ▶️ Poller started: {symbol}")
+        return queue
+
+    def unsubscribe(self, symbol: str, queue: asyncio.Queue) -> None:
+        """Remove a subscriber; stops the symbol's poller when none are left"""
+        symbol = symbol.strip().upper()
+        subscribers = self._subscribers.get(symbol)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if subscribers:
+            return
+        del self._subscribers[symbol]
+        self._latest.pop(symbol, None)
+        poller = self._pollers.pop(symbol, None)
+        if poller is not None:
+            poller.cancel()
+            print(f"[STREAM] ⏹️ Poller stopped: {symbol} (no subscribers)")
+
+    def _publish(self, symbol: str, event: Dict[str, Any]) -> None:
+        for queue in self._subscribers.get(symbol, ()):
+            if queue.full():
+                # 가장 오래된 이벤트를 버리고 최신 이벤트 유지
+                queue.get_nowait()
+                self._dropped += 1
+            queue.put_nowait(event)
+        self._published += 1
+
+    async def _poll(self, symbol: str) -> None:
+        last_key = None
+        while symbol in self._subscribers:
+            delay = self.interval
+            try:
+                quote = await run_upstream(QuoteService.get_quote, symbol)
+                self._polls += 1
+                # 값이 바뀐 경우에만 push
+                key = (quote["current_price"], quote["volume"], quote["stale"])
+                if key != last_key:
+                    last_key = key
+                    event = {"event": "quote", "data": quote}
+                    self._latest[symbol] = event
+                    self._publish(symbol, event)
+            except asyncio.CancelledError:
+                raise
+            except RateLimitTimeout as e:
+                # 회로가 열려 있으면 재시도 가능 시점까지 대기
+                delay = max(self.interval, upstream_breaker.retry_in())
+                self._publish(symbol, {"event": "error", "data": {"symbol": symbol, "status": 429, "detail": str(e)}})
+            except ValueError as e:
+                self._publish(symbol, {"event": "error", "data": {"symbol": symbol, "status": 404, "detail": str(e)}})
+            except Exception as e:
+                print(f"[STREAM] ⚠️ Poll failed for {symbol}: {e}")
+                self._publish(symbol, {"event": "error", "data": {"symbol": symbol, "status": 500, "detail": str(e)}})
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "symbols": len(self._pollers),
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            "interval_sec": self.interval,
+            "polls": self._polls,
+            "published": self._published,
+            "dropped": self._dropped,
+        }
+
+    def shutdown(self) -> None:
+        for poller in self._pollers.values():
+            poller.cancel()
+        self._pollers.clear()
+        self._subscribers.clear()
+        self._latest.clear()
+
+
+_quote_stream_hub: Optional[QuoteStreamHub] = None
+
+
+def get_quote_stream_hub() -> QuoteStreamHub:
+    """Return the process-wide quote stream hub"""
+    global _quote_stream_hub
+    if _quote_stream_hub is None:
+        _quote_stream_hub = QuoteStreamHub(interval=settings.QUOTE_STREAM_INTERVAL if settings else 5.0)
+    return _quote_stream_hub
@@ -0,0 +1,151 @@
+"""
+Derive coarser OHLCV intervals from finer bars (vectorized)
+
+    open = first, high = max, low = min, close = last, volume = sum
+
+Calendar intervals (1wk/1mo/3mo) are built from daily bars and labelled like
+Yahoo (week starting Monday, month/quarter start). Intraday intervals are built
+from finer intraday bars, with bins anchored at each day's first bar so equity
+sessions starting at 09:30 get 09:30/10:30/... hourly bars.
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.bar_store import MAX_PERIOD_START
+from app.services.history_serializer import find_ohlcv_columns
+
+# 목표 interval → 재집계에 사용할 수 있는 더 작은 interval (우선순위 순)
+RESAMPLE_SOURCES: Dict[str, Tuple[str, ...]] = {
+    '1wk': ('1d',),
+    '1mo': ('1d',),
+    '3mo': ('1d',),
+    '1h': ('30m', '15m', '5m', '2m', '1m'),
+    '60m': ('30m', '15m', '5m', '2m', '1m'),
+    '90m': ('30m', '15m', '5m', '1m'),
+    '30m': ('15m', '5m', '1m'),
+    '15m': ('5m', '1m'),
+    '5m': ('1m',),
+    '2m': ('1m',),
+}
+
+# 달력 기준 interval → pandas period (Yahoo와 같은 라벨: 주 시작 월요일, 월/분기 시작일)
+CALENDAR_PERIODS = {
+    '1wk': 'W-SUN',
+    '1mo': 'M',
+    '3mo': 'Q',
+}
+
+INTRADAY_STEPS = {
+    '2m': timedelta(minutes=2),
+    '5m': timedelta(minutes=5),
+    '15m': timedelta(minutes=15),
+    '30m': timedelta(minutes=30),
+    '60m': timedelta(hours=1),
+    '90m': timedelta(minutes=90),
+    '1h': timedelta(hours=1),
+}
+
+_DAY_NS = 86_400_000_000_000
+
+
+def can_resample(interval: str) -> bool:
+    return interval in RESAMPLE_SOURCES
+
+
+def align_start(start: datetime, interval: str) -> datetime:
+    """
+    Move a window start back to the beginning of its coarse bar
+
+    e.g. a monthly window starting on the 17th needs daily bars from the 1st
+    so the first monthly bar is complete.
+    """
+    ts = pd.Timestamp(start)
+    if interval == '1wk':
+        ts = (ts - pd.Timedelta(days=ts.weekday())).normalize()
+    elif interval == '1mo':
+        ts = ts.normalize().replace(day=1)
+    elif interval == '3mo':
+        ts = ts.normalize().replace(day=1, month=(ts.month - 1) // 3 * 3 + 1)
+    elif interval in INTRADAY_STEPS:
+        ts = ts.normalize()
+    if ts.tzinfo is not None:
+        # 'max' 요청은 1970 이전으로 내려가지 않도록
+        ts = max(ts, pd.Timestamp(MAX_PERIOD_START))
+    return ts.to_pydatetime()
+
+
+def _aggregate(hist: pd.DataFrame, grouper) -> pd.DataFrame:
+    open_col, high_col, low_col, close_col, volume_col = find_ohlcv_columns(hist)
+    grouped = hist.groupby(grouper, sort=True)
+    frame = pd.DataFrame({
+        'Open': grouped[open_col].first(),
+        'High': grouped[high_col].max(),
+        'Low': grouped[low_col].min(),
+        'Close': grouped[close_col].last(),
+        'Volume': grouped[volume_col].sum(min_count=1) if volume_col is not None else np.nan,
+    })
+    # 거래가 없는 구간(빈 bin) 제거
+    return frame[frame['Close'].notna()]
+
+
+def _intraday_bins(index: pd.DatetimeIndex, step: timedelta) -> pd.DatetimeIndex:
+    """Bin start for every bar, anchored at the first bar of each local day"""
+    wall = (index.tz_localize(None) if index.tz is not None else index).as_unit("ns").asi8
+    absolute = (index.tz_convert("UTC").tz_localize(None) if index.tz is not None else index).as_unit("ns").asi8
+    step_ns = int(step / timedelta(microseconds=1)) * 1000
+
+    day = wall - wall % _DAY_NS
+    _, first, inverse = np.unique(day, return_index=True, return_inverse=True)
+    origin = wall[first][inverse]
+    offset = (wall - origin) // step_ns * step_ns
+    # 현지 시각 기준 bin 시작 → 같은 만큼 절대 시각에서 빼서 UTC 라벨 계산
+    bins = absolute - (wall - origin - offset)
+
+    labels = pd.DatetimeIndex(bins.astype("datetime64[ns]"))
+    if index.tz is not None:
+        labels = labels.tz_localize("UTC").tz_convert(index.tz)
+    return labels
+
+
+def resample_ohlcv(hist: pd.DataFrame, interval: str, start: Optional[datetime] = None) -> pd.DataFrame:
+    """
+    Aggregate finer OHLCV bars into `interval` bars
+
+    Args:
+        hist: Finer-grained OHLCV DataFrame indexed by timestamp (sorted)
+        interval: Target interval (1wk, 1mo, 3mo or an intraday interval)
+        start: Drop coarse bars that begin before this time (window start)
+
+    Returns:
+        DataFrame with Open/High/Low/Close/Volume columns
+    """
+    if hist is None or hist.empty:
+        return hist
+
+    if interval in CALENDAR_PERIODS:
+        index = hist.index
+        if not isinstance(index, pd.DatetimeIndex):
+            index = pd.DatetimeIndex(index)
+        # 일봉 날짜(현지 자정) 기준으로 묶기
+        local_days = index.tz_localize(None).normalize() if index.tz is not None else index.normalize()
+        periods = local_days.to_period(CALENDAR_PERIODS[interval])
+        frame = _aggregate(hist, periods.start_time)
+        if index.tz is not None:
+            frame.index = frame.index.tz_localize(index.tz, ambiguous="NaT", nonexistent="shift_forward")
+    elif interval in INTRADAY_STEPS:
+        frame = _aggregate(hist, _intraday_bins(hist.index, INTRADAY_STEPS[interval]))
+    else:
+        raise ValueError(f"Cannot resample to interval: {interval}")
+
+    frame.index.name = hist.index.name
+    if start is not None:
+        bound = pd.Timestamp(align_start(start, interval))
+        if frame.index.tz is not None:
+            bound = bound.tz_localize(frame.index.tz) if bound.tzinfo is None else bound.tz_convert(frame.index.tz)
+        elif bound.tzinfo is not None:
+            bound = bound.tz_convert("UTC").tz_localize(None)
+        frame = frame[frame.index >= bound]
+    return frame
@@ -0,0 +1,284 @@
+"""
+StockData persistence - set-based bulk upsert and indexed range reads of OHLCV bars
+
+Bars are keyed by (symbol, interval, date) with a unique composite index, so
+re-fetched bars (e.g. the partial last bar on every tail refresh) overwrite
+the stored row in one INSERT ... ON CONFLICT DO UPDATE statement, and range
+reads are index seeks. Fetched time ranges are recorded in StockDataCoverage
+so a restarted process can reuse the data without re-downloading it.
+"""
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import delete, func, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.database import engine
+from app.db.models import StockData, StockDataCoverage
+from app.services.history_serializer import find_ohlcv_columns
+
+try:
+    from app.core.config import settings
+except ImportError:
+    settings = None
+
+Range = Tuple[datetime, datetime]
+
+PRICE_COLUMNS = ("open", "high", "low", "close")
+
+
+def _to_utc_naive(value: datetime) -> datetime:
+    """DB DateTime columns hold naive UTC"""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return ts.to_pydatetime()
+
+
+def _nullable(values: np.ndarray, cast=float) -> List[Any]:
+    """float64 array → Python values with NaN as None (DB drivers cannot bind NumPy scalars)"""
+    return [None if value != value else cast(value) for value in values.tolist()]
+
+
+def _merge_ranges(ranges: List[Range]) -> List[Range]:
+    merged: List[Range] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def ensure_stock_data_schema() -> bool:
+    """
+    Bring an existing stock_data table up to the (symbol, interval, date) schema
+
+    The table was never written before the interval column existed, so an old
+    empty table is simply recreated. A non-empty old table is left untouched.
+
+    Returns:
+        True if the table has the current schema
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(StockData.__tablename__):
+        return True
+    columns = {column["name"] for column in inspector.get_columns(StockData.__tablename__)}
+    if "interval" in columns:
+        return True
+
+    with engine.connect() as conn:
+        rows = conn.execute(select(func.count()).select_from(StockData.__table__)).scalar()
+    if rows:
+        print(f"[STOCKDATA] ⚠️ {StockData.__tablename__} has {rows} rows without an interval column - "
+              f"bar persistence disabled until it is migrated")
+        return False
+
+    print(f"[STOCKDATA] Recreating empty {StockData.__tablename__} table with (symbol, interval, date) index")
+    StockData.__table__.drop(bind=engine)
+    StockData.__table__.create(bind=engine)
+    return True
+
+
+_schema_ready: Optional[bool] = None
+_schema_guard = threading.Lock()
+
+
+def persistence_enabled() -> bool:
+    """STOCK_DATA_PERSIST is on and the table schema is current (checked once)"""
+    global _schema_ready
+    if not (settings and settings.STOCK_DATA_PERSIST):
+        return False
+    with _schema_guard:
+        if _schema_ready is None:
+            try:
+                _schema_ready = ensure_stock_data_schema()
+            except Exception as e:
+                print(f"[STOCKDATA] ⚠️ Schema check failed, bar persistence disabled: {e}")
+                _schema_ready = False
+        return _schema_ready
+
+
+class StockDataService:
+    """Service for persisting and reading OHLCV bars in the StockData table"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _insert(self):
+        """Dialect-specific insert construct supporting ON CONFLICT (None if unsupported)"""
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+            return insert
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+            return insert
+        return None
+
+    @staticmethod
+    def _rows(symbol: str, interval: str, hist: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Flattened OHLCV DataFrame → insert parameter dicts (column-wise conversion)"""
+        index = pd.DatetimeIndex(hist.index)
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        open_col, high_col, low_col, close_col, volume_col = find_ohlcv_columns(hist)
+
+        columns = {
+            name: _nullable(hist[col].to_numpy(dtype=np.float64, na_value=np.nan))
+            for name, col in zip(PRICE_COLUMNS, (open_col, high_col, low_col, close_col))
+        }
+        if volume_col is not None:
+            columns["volume"] = _nullable(hist[volume_col].to_numpy(dtype=np.float64, na_value=np.nan), cast=int)
+        else:
+            columns["volume"] = [None] * len(hist)
+
+        dates = index.to_pydatetime().tolist()
+        return [
+            {"symbol": symbol, "interval": interval, "date": date, **dict(zip(columns, values))}
+            for date, *values in zip(dates, *columns.values())
+        ]
+
+    def upsert_bars(
+        self,
+        symbol: str,
+        interval: str,
+        hist: Optional[pd.DataFrame],
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        commit: bool = True
+    ) -> int:
+        """
+        Insert or update bars in one set-based statement
+
+        Args:
+            symbol: Stock or crypto symbol
+            interval: Bar interval (1m ... 3mo)
+            hist: Flattened OHLCV DataFrame indexed by bar time
+            start: Start of the fetched range to record as covered (optional)
+            end: End of the fetched range to record as covered (optional)
+            commit: Commit the transaction (False to join a caller's transaction)
+
+        Returns:
+            Number of bars written
+        """
+        symbol = symbol.strip().upper()
+        rows = self._rows(symbol, interval, hist) if hist is not None and not hist.empty else []
+
+        if rows:
+            insert = self._insert()
+            table = StockData.__table__
+            if insert is not None:
+                stmt = insert(table)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["symbol", "interval", "date"],
+                    set_={col: stmt.excluded[col] for col in PRICE_COLUMNS + ("volume",)}
+                )
+                # executemany - 한 트랜잭션, 한 prepared statement
+                self.db.execute(stmt, rows)
+            else:
+                # ON CONFLICT 미지원 DB: 같은 키 삭제 후 일괄 insert
+                dates = [row["date"] for row in rows]
+                self.db.execute(
+                    delete(table).where(
+                        table.c.symbol == symbol,
+                        table.c.interval == interval,
+                        table.c.date.between(min(dates), max(dates)),
+                        table.c.date.in_(dates)
+                    )
+                )
+                self.db.execute(table.insert(), rows)
+
+        if start is not None and end is not None and (rows or self.coverage(symbol, interval)):
+            # 빈 결과만 있는 심볼(존재하지 않는 심볼 등)은 커버리지로 기록하지 않음
+            tz = "UTC"
+            if hist is not None and getattr(hist.index, "tz", None) is not None:
+                tz = str(hist.index.tz)
+            self._add_coverage(symbol, interval, _to_utc_naive(start), _to_utc_naive(end), tz)
+
+        if commit:
+            self.db.commit()
+        return len(rows)
+
+    def _add_coverage(self, symbol: str, interval: str, start: datetime, end: datetime, tz: str) -> None:
+        """Merge [start, end] into the stored coverage ranges (kept merged: few rows per key)"""
+        existing = self.db.execute(
+            select(StockDataCoverage.start, StockDataCoverage.end, StockDataCoverage.tz).where(
+                StockDataCoverage.symbol == symbol,
+                StockDataCoverage.interval == interval
+            )
+        ).all()
+        if tz == "UTC" and existing:
+            tz = existing[0].tz
+        merged = _merge_ranges([(row.start, row.end) for row in existing] + [(start, end)])
+
+        self.db.execute(
+            delete(StockDataCoverage).where(
+                StockDataCoverage.symbol == symbol,
+                StockDataCoverage.interval == interval
+            )
+        )
+        self.db.execute(
+            StockDataCoverage.__table__.insert(),
+            [{"symbol": symbol, "interval": interval, "start": s, "end": e, "tz": tz} for s, e in merged]
+        )
+
+    def coverage(self, symbol: str, interval: str) -> List[Range]:
+        """Fetched [start, end] ranges (naive UTC) for symbol/interval"""
+        rows = self.db.execute(
+            select(StockDataCoverage.start, StockDataCoverage.end).where(
+                StockDataCoverage.symbol == symbol.strip().upper(),
+                StockDataCoverage.interval == interval
+            )
+        ).all()
+        return _merge_ranges([(row.start, row.end) for row in rows])
+
+    def timezone(self, symbol: str, interval: str) -> str:
+        """Original index timezone recorded for symbol/interval (UTC if unknown)"""
+        tz = self.db.execute(
+            select(StockDataCoverage.tz).where(
+                StockDataCoverage.symbol == symbol.strip().upper(),
+                StockDataCoverage.interval == interval
+            ).limit(1)
+        ).scalar()
+        return tz or "UTC"
+
+    def read_range(
+        self,
+        symbol: str,
+        interval: str = "1d",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> pd.DataFrame:
+        """
+        Read bars in [start, end] (index seek on symbol, interval, date)
+
+        Returns:
+            yfinance-shaped DataFrame (Open/High/Low/Close/Volume) indexed by bar
+            time in the symbol's original timezone; empty if nothing is stored
+        """
+        symbol = symbol.strip().upper()
+        table = StockData.__table__
+        query = select(
+            table.c.date, table.c.open, table.c.high, table.c.low, table.c.close, table.c.volume
+        ).where(table.c.symbol == symbol, table.c.interval == interval)
+        if start is not None:
+            query = query.where(table.c.date >= _to_utc_naive(start))
+        if end is not None:
+            query = query.where(table.c.date <= _to_utc_naive(end))
+        rows = self.db.execute(query.order_by(table.c.date)).all()
+
+        columns = list(zip(*rows)) if rows else [()] * 6
+        index = pd.DatetimeIndex(pd.to_datetime(list(columns[0])), name="Date").tz_localize("UTC")
+        if rows:
+            index = index.tz_convert(self.timezone(symbol, interval))
+        return pd.DataFrame(
+            {
+                name: np.array(values, dtype=np.float64)
+                for name, values in zip(("Open", "High", "Low", "Close", "Volume"), columns[1:])
+            },
+            index=index
+        )
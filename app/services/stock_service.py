@@ -1,10 +1,18 @@
 """
 Stock data service for fetching and managing stock market data
 """
-import yfinance as yf
 from datetime import datetime
 from typing import Optional, Dict, Any
 from app.core.config import settings
+import pandas as pd
+from app.services.history_serializer import serialize_history
+from app.services.conditional import filter_since
+from app.services.providers import get_provider
+from app.services.metadata_cache import get_cached_info
+from app.services.market_data_service import MarketDataService
+from app.services.symbol_validation import check_symbol, unknown_symbol_error
+from app.core.rate_limiter import RateLimitTimeout
+from app.core.cache import cache_enabled, get_cache
 
 
 class StockService:
@@ -14,7 +22,9 @@ class StockService:
     def get_stock_data(
         symbol: str,
         period: str = "1mo",
-        interval: str = "1d"
+        interval: str = "1d",
+        layout: str = "rows",
+        since: Optional[pd.Timestamp] = None
     ) -> Dict[str, Any]:
         """
         Fetch stock data using yfinance
@@ -23,23 +33,35 @@ class StockService:
             symbol: Stock symbol (e.g., 'AAPL', 'TSLA')
             period: Period to fetch (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
             interval: Data interval (1m, 2m, 5m, 15m, 30m, 60m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
+            layout: History layout - 'rows' (default) or 'columns'
+            since: Only return bars newer than this timestamp (incremental refresh)
         
         Returns:
             Dictionary containing stock data
         """
         if not settings.YFINANCE_ENABLED:
             raise ValueError("YFinance is not enabled in settings")
+        check_symbol(symbol)
+        
+        # 다른 worker가 방금 가져온 결과 재사용 (예측 모델 입력 history 포함)
+        cache_key = (symbol.strip().upper(), period, interval, layout, since)
+        if cache_enabled():
+            cached = get_cache("stock_data").get(cache_key)
+            if cached is not None:
+                return cached
         
         try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period=period, interval=interval)
+            hist = get_provider().history(symbol, period=period, interval=interval)
             
             if hist.empty:
+                # 없는 심볼로 확인되면 negative cache에 기록 (이후 요청은 upstream 호출 없이 실패)
+                if MarketDataService._probe_symbol(symbol) is False:
+                    raise unknown_symbol_error(symbol)
                 raise ValueError(f"No data found for symbol: {symbol}")
             
-            # Get current quote
-            info = ticker.info
-            current_price = info.get('currentPrice') or hist['Close'].iloc[-1]
+            # Current price from the latest bar; metadata from the cache (never waits on .info)
+            info = get_cached_info(symbol)
+            current_price = hist['Close'].iloc[-1]
             
             # Calculate change
             if len(hist) > 1:
@@ -50,25 +72,20 @@ class StockService:
                 change = 0
                 change_percent = 0
             
-            # Convert history to list of dictionaries
-            history = []
-            for idx, row in hist.iterrows():
-                history.append({
-                    "date": idx.isoformat(),
-                    "open": float(row['Open']),
-                    "high": float(row['High']),
-                    "low": float(row['Low']),
-                    "close": float(row['Close']),
-                    "volume": int(row['Volume'])
-                })
+            # Convert history column-wise (rows or columns layout)
+            history = serialize_history(filter_since(hist, since), layout=layout)
+            
+            # 거래량이 NaN인 바(암호화폐/진행 중인 바)는 0으로
+            volume = hist['Volume'].iloc[-1]
             
-            return {
+            result = {
                 "symbol": symbol,
                 "current_price": float(current_price),
                 "change": float(change),
                 "change_percent": float(change_percent),
-                "volume": int(hist['Volume'].iloc[-1]),
+                "volume": int(volume) if pd.notna(volume) else 0,
                 "timestamp": datetime.now().isoformat(),
+                "as_of": hist.index[-1].isoformat(),
                 "history": history,
                 "info": {
                     "name": info.get('longName', symbol),
@@ -77,6 +94,11 @@ class StockService:
                     "market_cap": info.get('marketCap'),
                 }
             }
+            if cache_enabled():
+                get_cache("stock_data").set(cache_key, result, settings.CACHE_MARKET_DATA_TTL)
+            return result
+        except RateLimitTimeout:
+            raise
         except Exception as e:
             raise ValueError(f"Error fetching stock data for {symbol}: {str(e)}")
     
@@ -84,7 +106,9 @@ class StockService:
     def get_crypto_data(
         symbol: str,
         period: str = "1mo",
-        interval: str = "1d"
+        interval: str = "1d",
+        layout: str = "rows",
+        since: Optional[pd.Timestamp] = None
     ) -> Dict[str, Any]:
         """
         Fetch cryptocurrency data using yfinance
@@ -93,6 +117,8 @@ class StockService:
             symbol: Cryptocurrency symbol (e.g., 'BTC-USD', 'ETH-USD')
             period: Period to fetch
             interval: Data interval
+            layout: History layout - 'rows' (default) or 'columns'
+            since: Only return bars newer than this timestamp (incremental refresh)
         
         Returns:
             Dictionary containing cryptocurrency data
@@ -101,15 +127,13 @@ class StockService:
         if not symbol.endswith('-USD'):
             symbol = f"{symbol}-USD"
         
-        return StockService.get_stock_data(symbol, period, interval)
+        return StockService.get_stock_data(symbol, period, interval, layout, since)
     
     @staticmethod
     def validate_symbol(symbol: str) -> bool:
-        """Validate if a symbol exists"""
+        """Validate if a symbol exists (local caches first, at most one 5d/1d probe)"""
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
-            return info.get('symbol') is not None
-        except:
+            return MarketDataService.validate_symbol(symbol)
+        except Exception:
             return False
 
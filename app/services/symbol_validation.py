@@ -0,0 +1,137 @@
+"""
+Symbol validation and negative cache for unknown tickers
+
+A mistyped ticker used to walk every retry and fallback period before failing.
+Symbols are now rejected cheaply, in this order:
+
+    1. format check          - no upstream call (e.g. "AAPL!!", "" or 40 chars)
+    2. negative cache        - symbols confirmed unknown within NEGATIVE_CACHE_TTL
+    3. local evidence        - bars in the bar store or cached metadata → known
+    4. one 5d/1d probe       - empty result confirms the symbol is unknown
+
+Step 4 lives in MarketDataService (it may store the probed bars); this module
+only holds the cache and the checks that never go upstream.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from app.services.bar_store import get_bar_store
+from app.services.metadata_cache import get_metadata_cache
+
+try:
+    from app.core.config import settings
+except ImportError:
+    settings = None
+
+# Yahoo 심볼: AAPL, BRK-B, BTC-USD, 005930.KS, ^GSPC, EURUSD=X, GC=F
+SYMBOL_PATTERN = re.compile(r"^\^?[A-Z0-9][A-Z0-9.\-=&]{0,19}$")
+
+
+class InvalidSymbolError(ValueError):
+    """Raised for symbols that are malformed or confirmed unknown (mapped to 404)"""
+
+
+class NegativeCache:
+    """
+    Symbol -> (reason, expiry) cache of symbols confirmed to have no data
+
+    Args:
+        ttl: Seconds a symbol stays rejected (listings and typos both change rarely)
+        max_entries: Oldest entries are evicted beyond this size
+    """
+
+    def __init__(self, ttl: float = 900.0, max_entries: int = 4096):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._added = 0
+
+    def get(self, symbol: str) -> Optional[str]:
+        """Reason the symbol was rejected, or None if it is not (or no longer) cached"""
+        symbol = symbol.strip().upper()
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is None:
+                return None
+            reason, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[symbol]
+                return None
+            self._hits += 1
+            return reason
+
+    def add(self, symbol: str, reason: str) -> None:
+        symbol = symbol.strip().upper()
+        with self._lock:
+            self._entries[symbol] = (reason, time.monotonic() + self.ttl)
+            self._entries.move_to_end(symbol)
+            self._added += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        print(f"[SYMBOL] ⛔ Negative cached for {self.ttl:.0f}s: {symbol} ({reason})")
+
+    def discard(self, symbol: str) -> None:
+        with self._lock:
+            self._entries.pop(symbol.strip().upper(), None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "ttl_sec": self.ttl,
+                "hits": self._hits,
+                "added": self._added,
+            }
+
+
+_negative_cache: Optional[NegativeCache] = None
+_negative_cache_guard = threading.Lock()
+
+
+def get_negative_cache() -> NegativeCache:
+    """Return the process-wide negative symbol cache"""
+    global _negative_cache
+    with _negative_cache_guard:
+        if _negative_cache is None:
+            _negative_cache = NegativeCache(
+                ttl=settings.NEGATIVE_CACHE_TTL if settings else 900.0,
+                max_entries=settings.NEGATIVE_CACHE_MAX_ENTRIES if settings else 4096,
+            )
+        return _negative_cache
+
+
+def is_valid_format(symbol: str) -> bool:
+    return bool(symbol) and SYMBOL_PATTERN.match(symbol.strip().upper()) is not None
+
+
+def check_symbol(symbol: str) -> None:
+    """
+    Reject malformed or known-unknown symbols without any upstream call
+
+    Raises:
+        InvalidSymbolError: if the symbol is malformed or negatively cached
+    """
+    if not is_valid_format(symbol):
+        raise InvalidSymbolError(f"Invalid symbol format: {symbol!r}")
+    if get_negative_cache().get(symbol) is not None:
+        raise unknown_symbol_error(symbol)
+
+
+def unknown_symbol_error(symbol: str) -> InvalidSymbolError:
+    return InvalidSymbolError(
+        f"No data found for symbol: {symbol.strip().upper()}. "
+        f"Please check symbol format and try again."
+    )
+
+
+def has_local_data(symbol: str) -> bool:
+    """True if the bar store or the metadata cache already knows the symbol (no upstream call)"""
+    symbol = symbol.strip().upper()
+    if get_bar_store().has_symbol(symbol):
+        return True
+    return bool(get_metadata_cache().peek(symbol))
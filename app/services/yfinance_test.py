@@ -1,10 +1,10 @@
 """
 Market data service for fetching stock/crypto market data using yfinance
 """
-import yfinance as yf
 import time
 from datetime import datetime
 from typing import Optional, Dict, Any
+from app.services.providers import get_provider
 # from app.core.config import settings
 
 
@@ -32,7 +32,6 @@ class MarketDataService:
         #     raise ValueError("YFinance is not enabled in settings")
         
         try:
-            ticker = yf.Ticker("AAPL")
             
             # Rate limiting 방지를 위한 짧은 딜레이
             time.sleep(0.1)
@@ -48,18 +47,18 @@ class MarketDataService:
             for test_period in test_periods:
                 for attempt in range(max_retries):
                     try:
-                        hist = ticker.history(period=test_period, interval=interval)
+                        hist = get_provider().history("AAPL", period=test_period, interval=interval)
                         if hist is not None and not hist.empty:
                             # 성공하면 원하는 기간으로 다시 가져오기
                             if test_period != period:
                                 try:
-                                    hist = ticker.history(period=period, interval=interval)
+                                    hist = get_provider().history("AAPL", period=period, interval=interval)
                                     if hist.empty:
                                         # 원하는 기간 실패 시 테스트 기간 데이터 사용
-                                        hist = ticker.history(period=test_period, interval=interval)
+                                        hist = get_provider().history("AAPL", period=test_period, interval=interval)
                                 except:
                                     # 원하는 기간 실패 시 테스트 기간 데이터 사용
-                                    hist = ticker.history(period=test_period, interval=interval)
+                                    hist = get_provider().history("AAPL", period=test_period, interval=interval)
                             break
                         if attempt < max_retries - 1:
                             time.sleep(1)
@@ -93,7 +92,7 @@ class MarketDataService:
                 fallback_periods = ["1y", "6mo", "3mo", "1mo", "5d", "1d"]
                 for fallback_period in fallback_periods:
                     try:
-                        test_hist = ticker.history(period=fallback_period, interval=interval)
+                        test_hist = get_provider().history("AAPL", period=fallback_period, interval=interval)
                         if test_hist is not None and not test_hist.empty:
                             hist = test_hist
                             break
@@ -117,7 +116,7 @@ class MarketDataService:
             
             # info 가져오기 (실패해도 계속 진행)
             try:
-                info = ticker.info
+                info = get_provider().info("AAPL")
                 if not info:
                     info = {}
             except Exception as e:
@@ -193,13 +192,12 @@ class MarketDataService:
             Current price
         """
         try:
-            ticker = yf.Ticker(symbol)
-            info = ticker.info
+            info = get_provider().info(symbol)
             current_price = info.get('currentPrice')
             
             if current_price is None:
                 # Fallback to latest close price
-                hist = ticker.history(period="1d", interval="1d")
+                hist = get_provider().history(symbol, period="1d", interval="1d")
                 if not hist.empty:
                     current_price = float(hist['Close'].iloc[-1])
                 else:
@@ -222,9 +220,8 @@ class MarketDataService:
             Close price for the date, or None if not available
         """
         try:
-            ticker = yf.Ticker(symbol)
             # Fetch data around the target date
-            hist = ticker.history(start=date, end=date, interval="1d")
+            hist = get_provider().history(symbol, start=date, end=date, interval="1d")
             
             if not hist.empty:
                 return float(hist['Close'].iloc[0])
@@ -237,8 +234,7 @@ class MarketDataService:
     def validate_symbol(symbol: str) -> bool:
         """Validate if a symbol exists"""
         try:
-            ticker = yf.Ticker(symbol)
-            hist = ticker.history(period="5d", interval="1d")
+            hist = get_provider().history(symbol, period="5d", interval="1d")
             return not hist.empty
         except:
             return False
@@ -106,6 +106,27 @@ export const getStockQuote = async (symbol) => {
   return apiClient.get(`/stocks/quote/${symbol}`);
 };
 
+/**
+ * 실시간 시세 스트림 구독 (Server-Sent Events)
+ * 같은 종목을 보는 모든 클라이언트가 서버의 polling 하나를 공유
+ * @param {string[]} symbols - 주식 심볼 목록 (예: ['AAPL', 'TSLA'])
+ * @param {function} onQuote - 시세 수신 콜백 (getStockQuote 응답과 같은 형태)
+ * @param {function} onError - 에러 콜백 ({ symbol, status, detail })
+ * @returns {function} 구독 해제 함수
+ */
+export const subscribeStockQuotes = (symbols, onQuote, onError = () => {}) => {
+  const url = `${API_BASE_URL}/stocks/stream?symbols=${encodeURIComponent(symbols.join(','))}`;
+  const source = new EventSource(url);
+  source.addEventListener('quote', (event) => onQuote(JSON.parse(event.data)));
+  source.addEventListener('error', (event) => {
+    // 서버가 보낸 error 이벤트만 data가 있음 (연결 끊김은 EventSource가 자동 재연결)
+    if (event.data) {
+      onError(JSON.parse(event.data));
+    }
+  });
+  return () => source.close();
+};
+
 /**
  * 주식 과거 데이터 조회
  * @param {string} symbol - 주식 심볼
@@ -118,6 +139,18 @@ export const getStockHistory = async (symbol, period = '1mo', interval = '1d') =
   });
 };
 
+/**
+ * 여러 종목 과거 데이터 일괄 조회 (업스트림 요청 1회)
+ * @param {string[]} symbols - 주식 심볼 목록 (예: ['AAPL', 'MSFT'])
+ * @param {string} period - 기간 (1d, 5d, 1mo, 3mo, 6mo, 1y, 2y, 5y, 10y, ytd, max)
+ * @param {string} interval - 간격 (1m, 2m, 5m, 15m, 30m, 60m, 1h, 1d, 5d, 1wk, 1mo, 3mo)
+ */
+export const getStockHistoryBatch = async (symbols, period = '1mo', interval = '1d') => {
+  return apiClient.get('/stocks/history', {
+    params: { symbols: symbols.join(','), period, interval },
+  });
+};
+
 /**
  * 암호화폐 데이터 조회
  * @param {string} symbol - 암호화폐 심볼 (예: BTC, ETH)
@@ -0,0 +1,105 @@
+"""
+피처 엔진 벤치마크 - pandas rolling/ewm 기준선 vs 벡터화 NumPy (compute_features),
+그리고 바 하나 추가 시 전체 재계산 vs 증분 업데이트 (FeatureEngine)
+
+사용법:
+    python scripts/benchmark_features.py
+"""
+import sys
+import time
+sys.path.insert(0, '.')
+
+import numpy as np
+import pandas as pd
+
+from app.ml_models.features import FEATURE_NAMES, FeatureEngine, compute_features
+
+
+def make_series(n: int):
+    """합성 종가/거래량 (일봉 기준 타임스탬프)"""
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    volume = rng.integers(1_000, 1_000_000, n).astype(np.float64)
+    ts = np.arange(n, dtype=np.int64) * 86_400 * 10**9
+    return ts, close, volume
+
+
+def pandas_features(close: np.ndarray, volume: np.ndarray) -> pd.DataFrame:
+    """기존 방식: pandas rolling/ewm으로 같은 피처 계산"""
+    c = pd.Series(close)
+    v = pd.Series(volume)
+    out = {"close": c, "return_1": c.pct_change(), "log_return_1": np.log(c / c.shift())}
+    for window in (5, 10, 20, 50):
+        out[f"ma_{window}"] = c.rolling(window).mean()
+    ema_fast = c.ewm(span=12, adjust=False).mean()
+    ema_slow = c.ewm(span=26, adjust=False).mean()
+    macd = ema_fast - ema_slow
+    signal = macd.ewm(span=9, adjust=False).mean()
+    out.update(ema_12=ema_fast, ema_26=ema_slow, macd=macd, macd_signal=signal, macd_hist=macd - signal)
+    change = c.diff()
+    gain = change.clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    loss = (-change).clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    out["rsi_14"] = 100 - 100 / (1 + gain / loss)
+    mid = c.rolling(20).mean()
+    band = 2 * c.rolling(20).std(ddof=0)
+    out.update(
+        bb_upper_20=mid + band,
+        bb_lower_20=mid - band,
+        bb_pct_b_20=(c - (mid - band)) / (2 * band),
+        bb_width_20=2 * band / mid,
+    )
+    out["volatility_20"] = c.pct_change().rolling(20).std()
+    volume_ma = v.rolling(20).mean()
+    out["volume_ma_20"] = volume_ma
+    out["volume_ratio_20"] = v / volume_ma
+    return pd.DataFrame(out)[list(FEATURE_NAMES)]
+
+
+def timed(fn, *args, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def incremental_update(n: int, steps: int = 200) -> float:
+    """바 하나가 추가된 히스토리를 sync() 할 때 평균 시간"""
+    ts, close, volume = make_series(n + steps)
+    engine = FeatureEngine()
+    engine.sync(ts[:n], close[:n], volume[:n])
+    start = time.perf_counter()
+    for i in range(n, n + steps):
+        engine.sync(ts[:i + 1], close[:i + 1], volume[:i + 1])
+    elapsed = (time.perf_counter() - start) / steps
+
+    # 증분 결과가 전체 재계산과 같은지 확인
+    expected = compute_features(close, volume).values
+    assert np.allclose(engine.matrix().values, expected, rtol=1e-9, atol=1e-9, equal_nan=True), "Incremental mismatch"
+    return elapsed
+
+
+def main():
+    print("=" * 84)
+    print(f"{'bars':>8} | {'pandas':>9} | {'numpy':>9} | {'speedup':>7} | "
+          f"{'+1 bar (full)':>13} | {'+1 bar (incr)':>13} | {'speedup':>7}")
+    print("-" * 84)
+    for n in (252, 1_260, 5_000, 23_400):
+        ts, close, volume = make_series(n)
+
+        # 두 경로의 결과가 같은지 먼저 확인
+        expected = pandas_features(close, volume).to_numpy()
+        assert np.allclose(compute_features(close, volume).values, expected, rtol=1e-9, atol=1e-9, equal_nan=True), \
+            "Feature values differ"
+
+        base = timed(pandas_features, close, volume)
+        fast = timed(compute_features, close, volume)
+        incremental = incremental_update(n)
+        print(f"{n:>8} | {base * 1000:>7.2f}ms | {fast * 1000:>7.2f}ms | {base / fast:>6.1f}x | "
+              f"{fast * 1000:>11.3f}ms | {incremental * 1000:>11.3f}ms | {fast / incremental:>6.1f}x")
+    print("=" * 84)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+히스토리 직렬화 벤치마크 - iterrows() 기준선 vs 벡터화 경로
+
+사용법:
+    python scripts/benchmark_history_serialization.py
+"""
+import sys
+import time
+sys.path.insert(0, '.')
+
+import numpy as np
+import pandas as pd
+
+from app.services.history_serializer import serialize_history
+
+
+def make_frame(n: int, freq: str = "1min") -> pd.DataFrame:
+    """yf.download()과 같은 형태의 합성 OHLCV DataFrame 생성"""
+    index = pd.date_range("2020-01-01 09:30", periods=n, freq=freq, tz="America/New_York")
+    close = 100 + np.cumsum(np.random.default_rng(0).normal(0, 0.5, n))
+    volume = np.random.default_rng(1).integers(1_000, 1_000_000, n).astype(np.float64)
+    volume[::97] = np.nan  # NaN 거래량 포함
+    return pd.DataFrame({
+        "Open": close + 0.1,
+        "High": close + 0.5,
+        "Low": close - 0.5,
+        "Close": close,
+        "Volume": volume,
+    }, index=index)
+
+
+def baseline_iterrows(hist: pd.DataFrame) -> list:
+    """기존 구현 (행 단위 iterrows)"""
+    history = []
+    for idx, row in hist.iterrows():
+        history.append({
+            "date": idx.isoformat() if hasattr(idx, 'isoformat') else str(idx),
+            "open": float(row['Open']),
+            "high": float(row['High']),
+            "low": float(row['Low']),
+            "close": float(row['Close']),
+            "volume": int(row['Volume']) if pd.notna(row['Volume']) else 0
+        })
+    return history
+
+
+def timed(fn, *args, repeat: int = 3, **kwargs) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    print("=" * 72)
+    print(f"{'bars':>8} | {'iterrows':>10} | {'rows (vec)':>10} | {'columns':>10} | {'speedup':>8}")
+    print("-" * 72)
+    for n in (10_000, 100_000):
+        hist = make_frame(n)
+
+        # 결과가 동일한지 먼저 확인
+        assert serialize_history(hist) == baseline_iterrows(hist), "Vectorized output differs from baseline"
+
+        base = timed(baseline_iterrows, hist, repeat=1 if n >= 100_000 else 3)
+        rows = timed(serialize_history, hist)
+        columns = timed(serialize_history, hist, layout="columns")
+        print(f"{n:>8} | {base * 1000:>8.1f}ms | {rows * 1000:>8.1f}ms | {columns * 1000:>8.1f}ms | {base / rows:>7.1f}x")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
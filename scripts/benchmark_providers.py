@@ -0,0 +1,77 @@
+"""
+시장 데이터 provider 지연 시간 비교 벤치마크
+
+녹화 (네트워크 필요, yfinance 응답을 MARKET_DATA_RECORDINGS_PATH에 저장):
+    python scripts/benchmark_providers.py --providers record --symbols AAPL MSFT BTC-USD
+
+비교 (replay는 네트워크 없이 실행 가능):
+    python scripts/benchmark_providers.py --providers replay yfinance --repeat 5
+"""
+import argparse
+import sys
+import time
+sys.path.insert(0, '.')
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.market_data_service import MarketDataService
+from app.services.providers import create_provider, set_provider
+
+
+def run(provider_name: str, symbols, period: str, interval: str, repeat: int) -> dict:
+    provider = create_provider(provider_name)
+    set_provider(provider)
+
+    latencies = []
+    failures = 0
+    for _ in range(repeat):
+        for symbol in symbols:
+            start = time.perf_counter()
+            try:
+                # single-flight 공유 없이 매번 provider까지 내려가도록 내부 fetch 직접 호출
+                MarketDataService._fetch_market_data(symbol, period, interval)
+            except ValueError as e:
+                failures += 1
+                print(f"  ⚠️ {provider_name} {symbol}: {e}")
+            latencies.append(time.perf_counter() - start)
+
+    return {
+        "requests": len(latencies),
+        "failures": failures,
+        "p50_ms": float(np.percentile(latencies, 50)) * 1000,
+        "p95_ms": float(np.percentile(latencies, 95)) * 1000,
+        "provider": provider.stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare market data providers on latency")
+    parser.add_argument("--providers", nargs="+", default=["replay"], help="yfinance | record | replay")
+    parser.add_argument("--symbols", nargs="+", default=["AAPL", "MSFT", "BTC-USD"])
+    parser.add_argument("--period", default="1mo")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # bar store가 응답하면 provider를 거치지 않으므로 벤치마크 중에는 끔
+    settings.BAR_STORE_ENABLED = False
+
+    print("=" * 72)
+    print(f"{'provider':>10} | {'requests':>8} | {'failed':>6} | {'p50':>10} | {'p95':>10}")
+    print("-" * 72)
+    results = {}
+    for name in args.providers:
+        results[name] = run(name, args.symbols, args.period, args.interval, args.repeat)
+        r = results[name]
+        print(f"{name:>10} | {r['requests']:>8} | {r['failures']:>6} | {r['p50_ms']:>8.1f}ms | {r['p95_ms']:>8.1f}ms")
+    print("=" * 72)
+
+    for name, r in results.items():
+        print(f"\n[{name}] provider calls")
+        for op, stats in r["provider"].items():
+            print(f"  {op}: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+대시보드 응답 인코딩 벤치마크 - jsonable_encoder + json.dumps 기준선 vs FastJSONResponse,
+그리고 무압축 / gzip / brotli 응답 크기
+
+사용법:
+    python scripts/benchmark_response_encoding.py
+"""
+import gzip
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+sys.path.insert(0, '.')
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+from app.core.compression import brotli, compress
+from app.core.responses import FastJSONResponse, json_backend
+from app.services.history_serializer import serialize_history
+
+
+def make_frame(n: int, freq: str) -> pd.DataFrame:
+    """yf.download()과 같은 형태의 합성 OHLCV DataFrame 생성"""
+    index = pd.date_range("2020-01-01 09:30", periods=n, freq=freq, tz="America/New_York")
+    close = 100 + np.cumsum(np.random.default_rng(0).normal(0, 0.5, n))
+    volume = np.random.default_rng(1).integers(1_000, 1_000_000, n).astype(np.float64)
+    return pd.DataFrame({
+        "Open": close + 0.1,
+        "High": close + 0.5,
+        "Low": close - 0.5,
+        "Close": close,
+        "Volume": volume,
+    }, index=index)
+
+
+def make_dashboard(n: int, freq: str, layout: str = "rows") -> dict:
+    """GET /dashboard/{symbol} 응답과 같은 구조의 payload"""
+    hist = make_frame(n, freq)
+    now = datetime(2024, 1, 2, 16, 0)
+    return {
+        "symbol": "AAPL",
+        "market_data": {
+            "symbol": "AAPL",
+            "current_price": float(hist["Close"].iloc[-1]),
+            "change": 0.42,
+            "change_percent": 0.23,
+            "volume": int(hist["Volume"].iloc[-1]),
+            "timestamp": now.isoformat(),
+            "as_of": hist.index[-1].isoformat(),
+            "stale": False,
+            "history": serialize_history(hist, layout=layout),
+            "info": {"name": "Apple Inc.", "sector": "Technology", "industry": "Consumer Electronics",
+                     "market_cap": 3_000_000_000_000, "pe_ratio": 29.1, "dividend_yield": 0.005},
+        },
+        "predictions": [
+            {"id": i, "model_type": "lstm", "predicted_price": 190.0 + i, "prediction_date": (now + timedelta(days=i)).isoformat(),
+             "confidence_score": 0.8, "created_at": (now - timedelta(hours=i)).isoformat()}
+            for i in range(5)
+        ],
+        "news": [
+            {"title": f"Headline {i} – 애플 실적 발표", "link": f"https://example.com/news/{i}", "summary": "Lorem ipsum " * 20,
+             "published_date": (now - timedelta(hours=i)).isoformat(), "sentiment_score": 0.1 * i,
+             "sentiment_label": "positive", "source": "rss"}
+            for i in range(10)
+        ],
+        "timestamp": now.isoformat(),
+    }
+
+
+def baseline_encode(payload: dict) -> bytes:
+    """FastAPI 기본 경로: jsonable_encoder → JSONResponse.render (json.dumps)"""
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def fast_encode(payload: dict) -> bytes:
+    return FastJSONResponse(payload).body
+
+
+def timed(fn, *args, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    cases = [
+        ("1mo/1d", 22, "1D", "rows"),
+        ("1y/1d", 252, "1D", "rows"),
+        ("5d/1m", 1_950, "1min", "rows"),
+        ("1mo/5m", 1_638, "5min", "columns"),
+        ("60d/1m", 23_400, "1min", "rows"),
+    ]
+
+    print(f"JSON backend: {json_backend()} | brotli: {'yes' if brotli is not None else 'no (pip install brotli)'}")
+    print("=" * 96)
+    print(f"{'payload':>16} | {'bars':>6} | {'baseline':>9} | {'fast':>9} | {'speedup':>7} | "
+          f"{'raw':>9} | {'gzip':>9} | {'br':>9}")
+    print("-" * 96)
+    for name, n, freq, layout in cases:
+        payload = make_dashboard(n, freq, layout)
+
+        # 두 경로의 결과가 같은 JSON인지 먼저 확인
+        assert json.loads(baseline_encode(payload)) == json.loads(fast_encode(payload)), "Encoded payloads differ"
+
+        base = timed(baseline_encode, payload)
+        fast = timed(fast_encode, payload)
+
+        body = fast_encode(payload)
+        gzip_size = len(gzip.compress(body, compresslevel=6, mtime=0))
+        br_size = f"{len(compress(body, 'br')) / 1024:>7.1f}KB" if brotli is not None else f"{'-':>9}"
+        print(f"{name + ' ' + layout:>16} | {n:>6} | {base * 1000:>7.2f}ms | {fast * 1000:>7.2f}ms | "
+              f"{base / fast:>6.1f}x | {len(body) / 1024:>7.1f}KB | {gzip_size / 1024:>7.1f}KB | {br_size}")
+    print("=" * 96)
+
+
+if __name__ == "__main__":
+    main()
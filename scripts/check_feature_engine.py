@@ -0,0 +1,108 @@
+"""
+피처 엔진 증분 계산 회귀 테스트
+FeatureEngine.sync() 결과가 같은 히스토리를 처음부터 계산한 compute_features()와 같은지 확인
+
+사용법:
+    python scripts/check_feature_engine.py
+"""
+import sys
+sys.path.insert(0, '.')
+
+import numpy as np
+
+from app.ml_models.features import FeatureEngine, compute_features
+
+DAY = 86_400 * 10**9
+
+
+def make_series(n: int):
+    """합성 일봉 히스토리 (ts, close, volume)"""
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    volume = rng.integers(1_000, 1_000_000, n).astype(np.float64)
+    ts = np.arange(n, dtype=np.int64) * DAY
+    return ts, close, volume
+
+
+def assert_aligned(engine: FeatureEngine, ts: np.ndarray, close: np.ndarray, volume: np.ndarray) -> None:
+    """sync() 결과가 입력 ts와 정렬되고 전체 재계산과 같은 값인지"""
+    matrix = engine.sync(ts, close, volume)
+    assert np.array_equal(matrix.ts, ts), "rows are not aligned with ts"
+    expected = compute_features(close, volume).values
+    assert np.allclose(matrix.values, expected, rtol=1e-9, atol=1e-9, equal_nan=True), "feature values differ"
+
+
+def test_append():
+    """새 바가 하나씩 추가되면 증분 계산만 수행"""
+    ts, close, volume = make_series(300)
+    engine = FeatureEngine()
+    engine.sync(ts[:250], close[:250], volume[:250])
+    for i in range(250, 300):
+        assert_aligned(engine, ts[:i + 1], close[:i + 1], volume[:i + 1])
+    assert engine.rebuilds == 1, f"expected 1 rebuild, got {engine.rebuilds}"
+
+
+def test_revised_last_bar():
+    """진행 중인 마지막 바의 가격이 바뀌면 그 바만 다시 계산"""
+    ts, close, volume = make_series(300)
+    engine = FeatureEngine()
+    engine.sync(ts, close, volume)
+    revised = close.copy()
+    revised[-1] *= 1.02
+    assert_aligned(engine, ts, revised, volume)
+    assert engine.rebuilds == 1, f"expected 1 rebuild, got {engine.rebuilds}"
+
+
+def test_dropped_bar():
+    """다시 가져온 히스토리에 엔진이 가진 중간 바가 없으면 재계산 (행 정렬 유지)"""
+    ts, close, volume = make_series(300)
+    engine = FeatureEngine()
+    engine.sync(ts, close, volume)
+    keep = np.ones(301, dtype=bool)
+    keep[100] = False
+    ts2, close2, volume2 = make_series(301)
+    assert_aligned(engine, ts2[keep], close2[keep], volume2[keep])
+    assert engine.rebuilds == 2, f"expected a rebuild, got {engine.rebuilds}"
+
+
+def test_adjusted_close():
+    """배당/분할로 과거 종가가 조정되면 재계산"""
+    ts, close, volume = make_series(300)
+    engine = FeatureEngine()
+    engine.sync(ts, close, volume)
+    adjusted = close.copy()
+    adjusted[:200] *= 0.5
+    assert_aligned(engine, ts, adjusted, volume)
+    assert engine.rebuilds == 2, f"expected a rebuild, got {engine.rebuilds}"
+
+
+def test_sliding_window():
+    """기간 고정 조회(1y)로 가장 오래된 바가 빠지고 새 바가 들어와도 증분 계산"""
+    ts, close, volume = make_series(301)
+    engine = FeatureEngine()
+    engine.sync(ts[:300], close[:300], volume[:300])
+    matrix = engine.sync(ts[1:], close[1:], volume[1:])
+    assert np.array_equal(matrix.ts, ts[1:]), "rows are not aligned with ts"
+    # 엔진은 빠진 첫 바까지 포함한 히스토리로 계산 → 전체 히스토리 결과의 꼬리와 같음
+    expected = compute_features(close, volume).values[1:]
+    assert np.allclose(matrix.values, expected, rtol=1e-9, atol=1e-9, equal_nan=True), "feature values differ"
+    assert engine.rebuilds == 1, f"expected 1 rebuild, got {engine.rebuilds}"
+
+
+def main():
+    tests = [test_append, test_revised_last_bar, test_dropped_bar, test_adjusted_close, test_sliding_window]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    print("=" * 50)
+    print(f"{len(tests) - failed}/{len(tests)} passed")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
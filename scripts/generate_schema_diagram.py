@@ -129,6 +129,7 @@ def generate_fallback_mermaid():
     StockData {
         int id PK
         string symbol
+        string interval
         datetime date
         float open
         float high
@@ -138,6 +139,15 @@ def generate_fallback_mermaid():
         datetime created_at
     }
     
+    StockDataCoverage {
+        int id PK
+        string symbol
+        string interval
+        datetime start
+        datetime end
+        string tz
+    }
+    
     Prediction {
         int id PK
         string symbol